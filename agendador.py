@@ -0,0 +1,367 @@
+"""
+Módulo de agendamento - Inicia sessões automaticamente por regras recorrentes
+
+As regras ficam em config.json, na chave 'agendamentos'. Um único processo
+de longa duração (`pomo agendador`) mantém a próxima ocorrência de cada
+regra numa fila de prioridade (heapq) e dorme até a mais próxima, sem
+depender do cron. Ocorrências perdidas (processo parado ou outra sessão
+em andamento) seguem a política de recuperação de cada regra.
+
+Exemplo de regra:
+    {"nome": "manha", "dias": ["seg", "ter", "qua", "qui", "sex"],
+     "hora": "09:00", "tipo": "pomodoro", "ciclos": 4, "recuperar": "uma",
+     "tarefa": "projeto-x"}
+"""
+
+import heapq
+import json
+import math
+import os
+import sys
+from datetime import datetime, time as hora_do_dia, timedelta
+from config import ESQUEMA_CONFIGURACOES, carregar_configuracoes, converter_valor
+from relogio import RELOGIO_PADRAO
+
+
+# Arquivo com a última ocorrência tratada de cada regra
+AGENDADOR_FILE = 'agendador.json'
+
+DIAS_SEMANA = {
+    'seg': 0, 'ter': 1, 'qua': 2, 'qui': 3, 'sex': 4, 'sab': 5, 'sáb': 5, 'dom': 6
+}
+
+TIPOS_AGENDAMENTO = ('pomodoro', 'personalizado')
+
+# pular: só executa ocorrências no horário;
+# uma: executa apenas a mais recente das perdidas;
+# todas: executa todas as perdidas, em ordem
+POLITICAS_RECUPERACAO = ('pular', 'uma', 'todas')
+
+# Atraso até o qual uma ocorrência ainda conta como "no horário", em segundos
+ATRASO_PONTUAL = 60
+
+# Ocorrências perdidas há mais que isso nunca são recuperadas, em minutos
+TOLERANCIA_PADRAO = 30
+
+# Maior intervalo de sono do laço; o relógio de parede é reconsultado a
+# cada volta, então suspensões e ajustes de horário são percebidos
+ESPERA_MAXIMA = 30.0
+
+
+def _numero_positivo(valor, zero=False):
+    """Verifica se o valor é um número finito positivo (ou zero, se aceito), sem bool."""
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor):
+        return False
+    return valor >= 0 if zero else valor > 0
+
+
+def validar_regra(regra):
+    """
+    Valida e normaliza uma regra de agendamento.
+
+    Parâmetros:
+    regra (dict): Regra como escrita no config.json.
+
+    Retorna:
+    dict: Regra normalizada, com 'dias' (conjunto de 0 a 6), 'hora'
+          (datetime.time), 'chave' e 'ajustes' (configurações sobrescritas).
+
+    Lança:
+    ValueError: Se a regra for inválida.
+    """
+    if not isinstance(regra, dict):
+        raise ValueError("regra deve ser um objeto")
+
+    try:
+        hora = hora_do_dia.fromisoformat(str(regra['hora']))
+    except (KeyError, ValueError):
+        raise ValueError("'hora' deve estar no formato HH:MM") from None
+
+    dias_regra = regra.get('dias', list(range(7)))
+    if not isinstance(dias_regra, list):
+        raise ValueError("'dias' deve ser uma lista (ex: [\"seg\", \"qua\"] ou [0, 2])")
+    dias = set()
+    for dia in dias_regra:
+        if isinstance(dia, bool):
+            raise ValueError(f"dia inválido: {dia}")
+        if isinstance(dia, int) and 0 <= dia <= 6:
+            dias.add(dia)
+        elif str(dia).lower()[:3] in DIAS_SEMANA:
+            dias.add(DIAS_SEMANA[str(dia).lower()[:3]])
+        else:
+            raise ValueError(f"dia inválido: {dia}")
+    if not dias:
+        raise ValueError("'dias' não pode ser vazio")
+
+    tipo = regra.get('tipo', 'pomodoro')
+    if tipo not in TIPOS_AGENDAMENTO:
+        raise ValueError(f"'tipo' deve ser um de {', '.join(TIPOS_AGENDAMENTO)}")
+    minutos = regra.get('minutos')
+    if tipo == 'personalizado' and not _numero_positivo(minutos):
+        raise ValueError("timers personalizados precisam de 'minutos' positivo")
+
+    tolerancia_minutos = regra.get('tolerancia_minutos', TOLERANCIA_PADRAO)
+    if not _numero_positivo(tolerancia_minutos, zero=True):
+        raise ValueError("'tolerancia_minutos' deve ser um número maior ou igual a zero")
+    try:
+        tolerancia = timedelta(minutes=tolerancia_minutos)
+    except OverflowError:
+        raise ValueError("'tolerancia_minutos' grande demais") from None
+
+    recuperar = regra.get('recuperar', 'uma')
+    if recuperar not in POLITICAS_RECUPERACAO:
+        raise ValueError(f"'recuperar' deve ser um de {', '.join(POLITICAS_RECUPERACAO)}")
+
+    # Chaves do esquema de configurações sobrescrevem o config.json nesta regra
+    ajustes = {
+        chave: converter_valor(chave, valor)
+        for chave, valor in regra.items() if chave in ESQUEMA_CONFIGURACOES
+    }
+
+    return {
+        'chave': str(regra.get('nome') or f"{tipo} {hora.strftime('%H:%M')} {sorted(dias)}"),
+        'dias': dias,
+        'hora': hora,
+        'tipo': tipo,
+        'minutos': minutos,
+        'recuperar': recuperar,
+        'tolerancia': tolerancia,
+        'tarefa': regra.get('tarefa'),
+        'ajustes': ajustes
+    }
+
+
+def carregar_regras(config=None):
+    """
+    Lê as regras de agendamento das configurações, ignorando as inválidas.
+
+    Parâmetros:
+    config (dict): Configurações. Se None, carrega do arquivo.
+
+    Retorna:
+    list: Regras normalizadas.
+    """
+    if config is None:
+        config = carregar_configuracoes()
+    regras = []
+    for indice, regra in enumerate(config.get('agendamentos', [])):
+        try:
+            regras.append(validar_regra(regra))
+        except ValueError as e:
+            print(f"⚠️  Agendamento {indice + 1} ignorado: {e}")
+    return regras
+
+
+def proxima_ocorrencia(regra, apos):
+    """
+    Calcula a primeira ocorrência de uma regra estritamente depois de `apos`.
+
+    Parâmetros:
+    regra (dict): Regra normalizada.
+    apos (datetime): Instante de referência.
+
+    Retorna:
+    datetime: Próxima ocorrência.
+    """
+    for deslocamento in range(8):
+        dia = apos.date() + timedelta(days=deslocamento)
+        if dia.weekday() not in regra['dias']:
+            continue
+        candidato = datetime.combine(dia, regra['hora'])
+        if candidato > apos:
+            return candidato
+    # Inalcançável com 'dias' não vazio: toda semana tem a ocorrência
+    raise ValueError("regra sem dias")
+
+
+def _ler_estado_agendador(caminho):
+    """Lê a última ocorrência tratada de cada regra."""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return {chave: datetime.fromisoformat(valor) for chave, valor in json.load(f).items()}
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
+
+
+def _salvar_estado_agendador(caminho, estado):
+    """Grava o estado do agendador de forma atômica."""
+    temporario = caminho + '.tmp'
+    try:
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({chave: valor.isoformat() for chave, valor in estado.items()}, f, indent=4)
+        os.replace(temporario, caminho)
+    except OSError as e:
+        print(f"⚠️  Erro ao salvar estado do agendador: {e}")
+
+
+def _resposta_padrao(texto, default):
+    """Sem ninguém no terminal, as confirmações do timer ficam com o padrão."""
+    return default
+
+
+def executar_regra(regra, relogio=None):
+    """
+    Executa a sessão de uma regra, com as configurações ajustadas por ela.
+
+    Parâmetros:
+    regra (dict): Regra normalizada.
+    relogio: Relógio repassado ao timer.
+    """
+    # Importado aqui: o timer traz rich e a interface, desnecessários para
+    # listar ou validar agendamentos
+    from timer import iniciar_sessao_pomodoro, executar_timer_personalizado
+
+    config = dict(carregar_configuracoes(), **regra['ajustes'])
+    if regra['tipo'] == 'pomodoro':
+        # Sem bloquear em "Iniciar descanso?": as ocorrências atrasadas
+        # ('recuperar': 'todas') esperariam uma resposta que não vem
+        iniciar_sessao_pomodoro(config=config, relogio=relogio, perguntar=_resposta_padrao, tarefa=regra['tarefa'])
+    else:
+        executar_timer_personalizado(
+            regra['minutos'],
+            f"⏱️ Timer Agendado ({regra['chave']})",
+            tarefa=regra['tarefa'],
+            config=config,
+            relogio=relogio
+        )
+
+
+class Agendador:
+    """
+    Fila de prioridade com a próxima ocorrência de cada regra.
+
+    Parâmetros:
+    regras (list): Regras normalizadas (ver validar_regra).
+    relogio: Relógio usado para consultar a hora e dormir.
+    executar (function): Função (regra) chamada em cada ocorrência. Se None,
+                         usa executar_regra.
+    caminho_estado (str): Arquivo do estado; None para não persistir.
+    """
+
+    def __init__(self, regras, relogio=None, executar=None, caminho_estado=AGENDADOR_FILE):
+        self.regras = regras
+        self.relogio = relogio or RELOGIO_PADRAO
+        self.executar = executar or (lambda regra: executar_regra(regra, self.relogio))
+        self.caminho_estado = caminho_estado
+        self.estado = _ler_estado_agendador(caminho_estado) if caminho_estado else {}
+        self.fila = []
+
+        agora = self.relogio.agora()
+        for indice, regra in enumerate(regras):
+            # Sem estado, a regra começa agora; com estado, a partir da
+            # última ocorrência tratada, para detectar as perdidas
+            ultima = self.estado.get(regra['chave'], agora)
+            inicio = max(ultima, agora - regra['tolerancia'] - timedelta(seconds=1))
+            heapq.heappush(self.fila, (proxima_ocorrencia(regra, inicio), indice))
+
+    def proximas(self):
+        """
+        Retorna a próxima ocorrência de cada regra, em ordem.
+
+        Retorna:
+        list: Pares (datetime, regra).
+        """
+        return [(instante, self.regras[indice]) for instante, indice in sorted(self.fila)]
+
+    def _selecionar(self, regra, ocorrencias, agora):
+        """Aplica a política de recuperação às ocorrências vencidas de uma regra."""
+        validas = [o for o in ocorrencias if agora - o <= regra['tolerancia']]
+        if regra['recuperar'] == 'todas':
+            return validas
+        if regra['recuperar'] == 'uma':
+            return validas[-1:]
+        return [o for o in validas if (agora - o).total_seconds() <= ATRASO_PONTUAL]
+
+    def processar_vencidas(self):
+        """
+        Executa as ocorrências vencidas até agora, em ordem de horário.
+
+        Retorna:
+        int: Número de sessões executadas.
+        """
+        executadas = 0
+        while self.fila and self.fila[0][0] <= self.relogio.agora():
+            instante, indice = heapq.heappop(self.fila)
+            regra = self.regras[indice]
+            agora = self.relogio.agora()
+
+            # Todas as ocorrências desta regra já vencidas
+            ocorrencias = [instante]
+            seguinte = proxima_ocorrencia(regra, instante)
+            while seguinte <= agora:
+                ocorrencias.append(seguinte)
+                seguinte = proxima_ocorrencia(regra, seguinte)
+
+            for ocorrencia in self._selecionar(regra, ocorrencias, agora):
+                print(f"⏰ Agendamento '{regra['chave']}' ({ocorrencia.strftime('%Y-%m-%d %H:%M')})")
+                self.executar(regra)
+                executadas += 1
+
+            self.estado[regra['chave']] = ocorrencias[-1]
+            if self.caminho_estado:
+                _salvar_estado_agendador(self.caminho_estado, self.estado)
+
+            # A sessão pode ter passado da ocorrência seguinte; ela volta à
+            # fila e, se vencida, é tratada como perdida na próxima volta
+            heapq.heappush(self.fila, (seguinte, indice))
+        return executadas
+
+    def executar_ate(self, limite=None):
+        """
+        Laço principal: dorme até a próxima ocorrência e a executa.
+
+        Parâmetros:
+        limite (datetime): Para quando o relógio passar deste instante.
+                           Se None, roda até Ctrl+C.
+        """
+        while self.fila:
+            self.processar_vencidas()
+            agora = self.relogio.agora()
+            if limite is not None and agora >= limite:
+                return
+            alvo = self.fila[0][0] if limite is None else min(self.fila[0][0], limite)
+            espera = (alvo - agora).total_seconds()
+            self.relogio.dormir(min(max(espera, 0.0), ESPERA_MAXIMA))
+
+
+def listar_agendamentos(agendador):
+    """Imprime a próxima ocorrência de cada regra."""
+    if not agendador.regras:
+        print("📭 Nenhum agendamento em config.json ('agendamentos').")
+        return
+    for instante, regra in agendador.proximas():
+        detalhe = f"{regra['minutos']} min" if regra['tipo'] == 'personalizado' else regra['tipo']
+        print(f"📅 {instante.strftime('%a %Y-%m-%d %H:%M')}  {regra['chave']} ({detalhe}, recuperar: {regra['recuperar']})")
+
+
+def main_agendador(argumentos):
+    """
+    Ponto de entrada de `pomo agendador`.
+
+    Uso:
+    agendador           executa as regras até Ctrl+C
+    agendador listar    mostra a próxima ocorrência de cada regra
+
+    Retorna:
+    int: Código de saída.
+    """
+    comando = argumentos[0] if argumentos else ''
+    if comando not in ('', 'listar'):
+        print(main_agendador.__doc__)
+        return 1
+
+    agendador = Agendador(carregar_regras())
+    listar_agendamentos(agendador)
+    if comando == 'listar' or not agendador.regras:
+        return 0
+
+    print("⏳ Aguardando agendamentos (Ctrl+C para sair)...")
+    try:
+        agendador.executar_ate()
+    except KeyboardInterrupt:
+        print("\n👋 Agendador encerrado.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_agendador(sys.argv[1:]))
@@ -0,0 +1,371 @@
+"""
+Módulo de análise paralela - Estatísticas de históricos grandes em vários processos
+
+Divide os arquivos de histórico (um por usuário ou por período, no formato
+do historico.json ou em NDJSON) em faixas de bytes, agrega cada faixa num
+processo separado e combina os agregados parciais em ordem com
+mesclar_agregados. O resultado é o mesmo de percorrer os arquivos em
+sequência; o benchmark incluído mede o ganho por número de processos.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from historico import (
+    HISTORICO_FILE,
+    DESCANSO_PENDENTE,
+    TAMANHO_BLOCO,
+    _criar_sessao,
+    _iterar_arquivo,
+    _serializar_sessoes,
+    novo_agregado,
+    acumular_sessao,
+    mesclar_agregados,
+    resumir_agregado
+)
+
+
+# Início e fim de uma sessão no historico.json (gravado com indent=4): as
+# chaves de sessões ficam sempre no início da linha, com 4 espaços
+INICIO_SESSAO = b"\n    {"
+FIM_SESSAO = b"\n    }"
+
+# Faixas menores que isto não compensam o custo de um processo
+TAMANHO_MINIMO_FAIXA = 1024 * 1024
+
+# Faixas por processo: sobra trabalho para equilibrar processos mais lentos
+FAIXAS_POR_PROCESSO = 4
+
+
+def _formato(caminho):
+    """
+    Identifica o formato de um arquivo de histórico.
+
+    Retorna:
+    str | None: 'indentado' (historico.json, divisível em faixas), 'ndjson'
+                (uma sessão por linha, divisível), 'json' (outro array JSON,
+                lido inteiro) ou None se não for reconhecido.
+    """
+    try:
+        with open(caminho, 'rb') as f:
+            inicio = f.read(len(INICIO_SESSAO) + 1)
+    except OSError:
+        return None
+    if inicio.startswith(b"[" + INICIO_SESSAO):
+        return 'indentado'
+    if inicio.startswith(b"["):
+        return 'json'
+    if inicio.startswith(b"{"):
+        return 'ndjson'
+    return None
+
+
+def dividir_em_faixas(caminhos, processos):
+    """
+    Divide os arquivos em faixas de bytes de tamanho parecido.
+
+    Parâmetros:
+    caminhos (list): Arquivos de histórico.
+    processos (int): Número de processos que vão agregar as faixas.
+
+    Retorna:
+    list: Tuplas (caminho, formato, inicio, fim), na ordem dos arquivos.
+    """
+    arquivos = []
+    for caminho in caminhos:
+        formato = _formato(caminho)
+        if formato is None:
+            print(f"⚠️  Ignorando {caminho}: formato não reconhecido.")
+            continue
+        arquivos.append((caminho, formato, os.path.getsize(caminho)))
+
+    total = sum(tamanho for _, _, tamanho in arquivos)
+    alvo = max(TAMANHO_MINIMO_FAIXA, total // max(processos * FAIXAS_POR_PROCESSO, 1))
+
+    faixas = []
+    for caminho, formato, tamanho in arquivos:
+        partes = 1 if formato == 'json' else max(1, -(-tamanho // alvo))
+        passo = -(-tamanho // partes)
+        for inicio in range(0, tamanho, passo):
+            faixas.append((caminho, formato, inicio, min(inicio + passo, tamanho)))
+    return faixas
+
+
+def _sessoes_indentadas(f, inicio, fim):
+    """Sessões do historico.json cuja chave de abertura está em [inicio, fim)."""
+    recuo = min(inicio, len(INICIO_SESSAO) - 1)
+    f.seek(inicio - recuo)
+    base = inicio - recuo
+    dados = f.read(fim - base)
+
+    posicao = dados.find(INICIO_SESSAO)
+    while posicao != -1:
+        comeco = posicao + len(INICIO_SESSAO) - 1
+        if base + comeco >= fim:
+            return
+        termino = dados.find(FIM_SESSAO, comeco)
+        while termino == -1:
+            # A última sessão da faixa termina depois dela
+            bloco = f.read(TAMANHO_BLOCO)
+            if not bloco:
+                print("⚠️  Erro ao ler arquivo de histórico: fim inesperado.")
+                return
+            dados += bloco
+            termino = dados.find(FIM_SESSAO, comeco)
+        termino += len(FIM_SESSAO)
+        yield json.loads(dados[comeco:termino])
+        posicao = dados.find(INICIO_SESSAO, termino)
+
+
+def _sessoes_ndjson(f, inicio, fim):
+    """Sessões das linhas que começam em [inicio, fim)."""
+    recuo = 1 if inicio else 0
+    f.seek(inicio - recuo)
+    base = inicio - recuo
+    dados = f.read(fim - base)
+
+    posicao = 0
+    if inicio:
+        posicao = dados.find(b"\n") + 1
+        if not posicao:
+            return
+    while posicao < len(dados) and base + posicao < fim:
+        termino = dados.find(b"\n", posicao)
+        while termino == -1:
+            bloco = f.read(TAMANHO_BLOCO)
+            if not bloco:
+                termino = len(dados)
+                break
+            dados += bloco
+            termino = dados.find(b"\n", posicao)
+        linha = dados[posicao:termino].strip()
+        if linha:
+            try:
+                yield json.loads(linha)
+            except ValueError:
+                pass
+        posicao = termino + 1
+
+
+def _agregar_faixa(faixa):
+    """
+    Agrega as sessões de uma faixa (executada nos processos do pool).
+
+    Parâmetros:
+    faixa (tuple): (caminho, formato, inicio, fim) de dividir_em_faixas.
+
+    Retorna:
+    dict: Agregado parcial, começando com o descanso e o ciclo anteriores pendentes.
+    """
+    caminho, formato, inicio, fim = faixa
+    agregado = novo_agregado()
+    agregado['ultimo_descanso'] = DESCANSO_PENDENTE
+    agregado['ciclo_pendente'] = True
+
+    if formato == 'json':
+        for sessao in _iterar_arquivo(caminho):
+            acumular_sessao(agregado, sessao)
+        return agregado
+
+    leitor = _sessoes_indentadas if formato == 'indentado' else _sessoes_ndjson
+    with open(caminho, 'rb') as f:
+        for sessao in leitor(f, inicio, fim):
+            acumular_sessao(agregado, sessao)
+    return agregado
+
+
+def _finalizar(agregado):
+    """Fecha o agregado de um arquivo: nada vem antes da sua primeira sessão."""
+    agregado['conclusao_apos_descanso'].pop(DESCANSO_PENDENTE, None)
+    if agregado['ultimo_descanso'] == DESCANSO_PENDENTE:
+        agregado['ultimo_descanso'] = None
+    agregado['ciclo_pendente'] = False
+    return agregado
+
+
+def agregar_em_paralelo(caminhos, processos=None):
+    """
+    Agrega vários arquivos de histórico usando um pool de processos.
+
+    Parâmetros:
+    caminhos (list): Arquivos de histórico.
+    processos (int): Processos do pool. Se None, um por núcleo; com 1, tudo
+                     roda no processo atual.
+
+    Retorna:
+    dict: Agregado de todos os arquivos (ver historico.novo_agregado).
+    """
+    processos = processos or os.cpu_count() or 1
+    faixas = dividir_em_faixas(caminhos, processos)
+    if processos == 1 or len(faixas) <= 1:
+        parciais = [_agregar_faixa(faixa) for faixa in faixas]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            parciais = list(pool.map(_agregar_faixa, faixas))
+
+    total = novo_agregado()
+    do_arquivo = None
+    caminho_atual = None
+    for (caminho, _, _, _), parcial in zip(faixas, parciais):
+        if caminho != caminho_atual:
+            if do_arquivo is not None:
+                total = mesclar_agregados(total, _finalizar(do_arquivo))
+            caminho_atual, do_arquivo = caminho, parcial
+        else:
+            do_arquivo = mesclar_agregados(do_arquivo, parcial)
+    if do_arquivo is not None:
+        total = mesclar_agregados(total, _finalizar(do_arquivo))
+    return total
+
+
+def gerar_historicos_sinteticos(diretorio, arquivos=8, sessoes_por_arquivo=50000):
+    """
+    Gera arquivos no formato do historico.json para o benchmark.
+
+    Retorna:
+    list: Caminhos dos arquivos gerados.
+    """
+    caminhos = []
+    tipos = ['trabalho', 'descanso_curto'] * 3 + ['trabalho', 'descanso_longo']
+    for indice in range(arquivos):
+        momento = datetime(2020, 1, 1, 8, 0) + timedelta(minutes=indice)
+        sessoes = []
+        for numero in range(sessoes_por_arquivo):
+            tipo = tipos[numero % len(tipos)]
+            duracao = 25 if tipo == 'trabalho' else 15 if tipo == 'descanso_longo' else 5
+            completa = (numero * 7 + indice) % 10 != 0
+            sessoes.append(_criar_sessao(
+                tipo, duracao, completa=completa, momento=momento,
+                inicio=momento.isoformat(), segundos_ativos=duracao * 60.0 if completa else duracao * 30.0
+            ))
+            momento += timedelta(minutes=duracao + 1)
+            if momento.hour >= 18:
+                momento += timedelta(hours=14)
+        caminho = os.path.join(diretorio, f"historico_{indice}.json")
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write("[\n" + _serializar_sessoes(sessoes) + "\n]")
+        caminhos.append(caminho)
+    return caminhos
+
+
+def executar_benchmark(arquivos=8, sessoes_por_arquivo=50000, processos=None):
+    """
+    Mede o tempo da agregação com 1, 2, 4... processos sobre históricos
+    sintéticos e confere que todos chegam ao mesmo resultado.
+
+    Parâmetros:
+    arquivos (int): Arquivos gerados.
+    sessoes_por_arquivo (int): Sessões em cada arquivo.
+    processos (list): Números de processos medidos. Se None, potências de 2
+                      até o número de núcleos.
+
+    Retorna:
+    list: Dicts com 'processos', 'segundos', 'aceleracao' e 'eficiencia'.
+    """
+    nucleos = os.cpu_count() or 1
+    if processos is None:
+        processos = [1]
+        while processos[-1] * 2 <= nucleos:
+            processos.append(processos[-1] * 2)
+        if processos[-1] != nucleos:
+            processos.append(nucleos)
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminhos = gerar_historicos_sinteticos(diretorio, arquivos, sessoes_por_arquivo)
+        referencia = None
+        for quantidade in processos:
+            inicio = time.perf_counter()
+            agregado = agregar_em_paralelo(caminhos, quantidade)
+            segundos = time.perf_counter() - inicio
+
+            resumo = resumir_agregado(agregado)
+            conferencia = (resumo['total_sessoes'], resumo['tempo_total_minutos'],
+                           round(resumo['tempo_foco_minutos'], 3), agregado['conclusao_apos_descanso'])
+            if referencia is None:
+                referencia = conferencia
+            elif conferencia != referencia:
+                print(f"⚠️  Resultado com {quantidade} processos difere do sequencial.")
+
+            base = resultados[0]['segundos'] if resultados else segundos
+            resultados.append({
+                'processos': quantidade,
+                'segundos': segundos,
+                'aceleracao': base / segundos,
+                'eficiencia': base / segundos / quantidade
+            })
+    return resultados
+
+
+def _inteiro_positivo(texto):
+    """
+    Converte um argumento de linha de comando num inteiro maior que zero.
+
+    Lança:
+    ValueError: Se o argumento não for um inteiro positivo.
+    """
+    valor = int(texto)
+    if valor < 1:
+        raise ValueError(f"esperado um inteiro positivo: {texto}")
+    return valor
+
+
+def main_analise(argumentos):
+    """
+    Ponto de entrada de `pomo analise`.
+
+    Uso:
+    analise [ARQUIVOS...] [--processos N]     estatísticas dos arquivos (padrão: historico.json)
+    analise benchmark [ARQUIVOS] [SESSOES]    mede a aceleração por processos
+
+    Retorna:
+    int: Código de saída.
+    """
+    argumentos = list(argumentos)
+    processos = None
+    if '--processos' in argumentos:
+        posicao = argumentos.index('--processos')
+        try:
+            processos = _inteiro_positivo(argumentos[posicao + 1])
+        except (IndexError, ValueError):
+            print(main_analise.__doc__)
+            return 1
+        del argumentos[posicao:posicao + 2]
+
+    if argumentos[:1] == ['benchmark']:
+        try:
+            arquivos = _inteiro_positivo(argumentos[1]) if len(argumentos) > 1 else 8
+            sessoes = _inteiro_positivo(argumentos[2]) if len(argumentos) > 2 else 50000
+        except ValueError:
+            print(main_analise.__doc__)
+            return 1
+        print(f"🧮 {arquivos} arquivos x {sessoes} sessões, {os.cpu_count()} núcleos\n")
+        for resultado in executar_benchmark(arquivos, sessoes, sorted({1, processos}) if processos else None):
+            print(
+                f"  {resultado['processos']:>3} processo(s): {resultado['segundos']:7.2f} s  "
+                f"aceleração {resultado['aceleracao']:.2f}x  eficiência {resultado['eficiencia']:.0%}"
+            )
+        return 0
+
+    caminhos = argumentos or [HISTORICO_FILE]
+    inicio = time.perf_counter()
+    agregado = agregar_em_paralelo(caminhos, processos)
+    segundos = time.perf_counter() - inicio
+
+    resumo = resumir_agregado(agregado)
+    print(f"📊 {len(caminhos)} arquivo(s) em {segundos:.2f} s\n")
+    print(f"  Sessões:           {resumo['total_sessoes']} ({resumo['sessoes_canceladas']} canceladas)")
+    print(f"  Pomodoros:         {resumo['pomodoros_completos']}")
+    print(f"  Tempo total:       {resumo['tempo_total_minutos'] / 60:.1f} h")
+    print(f"  Tempo de trabalho: {resumo['tempo_trabalho_minutos'] / 60:.1f} h")
+    print(f"  Foco real:         {resumo['tempo_foco_minutos'] / 60:.1f} h")
+    print(f"  Dias com sessões:  {len(agregado['por_data'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_analise(sys.argv[1:]))
@@ -0,0 +1,216 @@
+"""
+Módulo de atividade - Detecta ociosidade para pausar o timer automaticamente
+
+Uma thread em segundo plano observa, em baixa frequência:
+- as teclas digitadas no terminal do timer;
+- no Linux, os contadores de interrupção de teclado e mouse em /proc/interrupts,
+  que mudam com qualquer entrada, mesmo em outras janelas (teclados e mouses
+  USB aparecem apenas na linha do controlador USB, usada na falta de linhas
+  próprias);
+- no Windows, o GetLastInputInfo do sistema.
+Sem nenhum sinal do sistema, só as teclas no terminal contam (ver
+somente_terminal()). O custo de CPU da thread é medido e pode ser
+consultado em sobrecarga().
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from funcoes import ler_tecla
+
+
+# Intervalo entre amostras dos sinais do sistema, em segundos
+INTERVALO_AMOSTRA = 5.0
+
+# Tempo máximo de espera por teclas a cada volta da thread, em segundos
+ESPERA_TECLA = 0.5
+
+# Linhas de /proc/interrupts que correspondem a teclado e mouse
+DISPOSITIVOS_ENTRADA = ('i8042', 'keyboard', 'mouse', 'touchpad', 'i2c_hid')
+
+# Controladores USB: também contam outros dispositivos USB (discos,
+# câmeras), então só são usados quando não há linhas de entrada próprias
+CONTROLADORES_USB = ('xhci', 'ehci', 'ohci', 'uhci', 'usb')
+
+PROC_INTERRUPTS = '/proc/interrupts'
+
+
+def _contar_interrupcoes_entrada():
+    """
+    Soma as interrupções de dispositivos de entrada em /proc/interrupts.
+    Sem linhas de teclado ou mouse, soma as dos controladores USB.
+
+    Retorna:
+    int | None: Total de interrupções, ou None se indisponível ou sem
+                dispositivos de entrada identificáveis.
+    """
+    try:
+        with open(PROC_INTERRUPTS, 'r', encoding='ascii', errors='ignore') as f:
+            entrada = usb = None
+            for linha in f:
+                minuscula = linha.lower()
+                if any(dispositivo in minuscula for dispositivo in DISPOSITIVOS_ENTRADA):
+                    entrada = (entrada or 0) + _somar_contadores(linha)
+                elif any(controlador in minuscula for controlador in CONTROLADORES_USB):
+                    usb = (usb or 0) + _somar_contadores(linha)
+            return entrada if entrada is not None else usb
+    except OSError:
+        return None
+
+
+def _somar_contadores(linha):
+    """Soma os contadores por CPU de uma linha de /proc/interrupts."""
+    return sum(int(campo) for campo in linha.split()[1:] if campo.isdigit())
+
+
+def _ultima_entrada_windows():
+    """
+    Consulta o instante da última entrada do usuário no Windows.
+
+    Retorna:
+    int | None: Tick (ms) da última entrada, ou None se indisponível.
+    """
+    if os.name != 'nt':
+        return None
+    try:
+        import ctypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
+
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(info)
+        if ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return info.dwTime
+    except Exception:
+        pass
+    return None
+
+
+def _assinatura_sistema():
+    """Lê os sinais de atividade do sistema; muda sempre que há entrada."""
+    return (_contar_interrupcoes_entrada(), _ultima_entrada_windows())
+
+
+class MonitorAtividade:
+    """
+    Observa a atividade do usuário e informa quando ele está ocioso.
+
+    Parâmetros:
+    limite_segundos (float): Tempo sem atividade para considerar ocioso.
+    intervalo (float): Intervalo entre amostras dos sinais do sistema.
+    ler_terminal (bool): Se True, também conta teclas digitadas no terminal.
+    """
+
+    def __init__(self, limite_segundos, intervalo=INTERVALO_AMOSTRA, ler_terminal=True):
+        self.limite_segundos = limite_segundos
+        self.intervalo = intervalo
+        self.ler_terminal = ler_terminal and sys.stdin.isatty()
+        self.lacunas = []
+        self._ultima_atividade = time.monotonic()
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        self._amostras = 0
+        self._cpu_segundos = 0.0
+        self._inicio = None
+
+    def disponivel(self):
+        """
+        Informa se há algum sinal de atividade observável neste sistema.
+
+        Retorna:
+        bool: True se o monitor consegue detectar atividade.
+        """
+        return self.ler_terminal or not self.somente_terminal()
+
+    def somente_terminal(self):
+        """
+        Informa se só as teclas do terminal do timer são observáveis, sem
+        sinais do sistema (entradas em outras janelas não são vistas).
+
+        Retorna:
+        bool: True se não há sinal de atividade do sistema.
+        """
+        return all(sinal is None for sinal in _assinatura_sistema())
+
+    def iniciar(self):
+        """Inicia a thread de amostragem."""
+        self._inicio = time.monotonic()
+        self._ultima_atividade = self._inicio
+        self._thread = threading.Thread(target=self._executar, name='pomo-atividade', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        """Encerra a thread e fecha a lacuna ociosa em andamento, se houver."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._registrar_atividade(time.monotonic())
+
+    def segundos_ocioso(self):
+        """
+        Retorna há quanto tempo o usuário está ocioso, se já passou do limite.
+
+        Retorna:
+        float: Segundos sem atividade, ou 0 se o usuário está ativo.
+        """
+        with self._trava:
+            ocioso = time.monotonic() - self._ultima_atividade
+        return ocioso if ocioso >= self.limite_segundos else 0.0
+
+    def sobrecarga(self):
+        """
+        Retorna o custo medido da thread de amostragem.
+
+        Retorna:
+        dict: Amostras feitas, CPU total e por amostra (ms) e fração de
+              CPU em relação ao tempo monitorado.
+        """
+        decorrido = time.monotonic() - self._inicio if self._inicio else 0.0
+        return {
+            'amostras': self._amostras,
+            'cpu_ms_total': self._cpu_segundos * 1000,
+            'cpu_ms_por_amostra': self._cpu_segundos * 1000 / self._amostras if self._amostras else 0.0,
+            'fracao_cpu': self._cpu_segundos / decorrido if decorrido else 0.0
+        }
+
+    def _registrar_atividade(self, instante):
+        """Marca atividade no instante dado, registrando a lacuna ociosa encerrada."""
+        with self._trava:
+            ocioso = instante - self._ultima_atividade
+            if ocioso >= self.limite_segundos:
+                inicio = datetime.now() - timedelta(seconds=time.monotonic() - self._ultima_atividade)
+                self.lacunas.append({
+                    'inicio': inicio.isoformat(timespec='seconds'),
+                    'segundos': round(ocioso, 1)
+                })
+            self._ultima_atividade = instante
+
+    def _executar(self):
+        """Laço da thread: espera teclas e amostra o sistema a cada intervalo."""
+        assinatura = _assinatura_sistema()
+        proxima_amostra = time.monotonic() + self.intervalo
+
+        while not self._parar.is_set():
+            if self.ler_terminal:
+                tecla = ler_tecla(ESPERA_TECLA)
+            else:
+                tecla = None
+                self._parar.wait(min(ESPERA_TECLA, self.intervalo))
+
+            cpu_inicio = time.thread_time()
+            agora = time.monotonic()
+            if tecla is not None:
+                self._registrar_atividade(agora)
+            if agora >= proxima_amostra:
+                nova = _assinatura_sistema()
+                if nova != assinatura:
+                    assinatura = nova
+                    self._registrar_atividade(agora)
+                proxima_amostra = agora + self.intervalo
+                self._amostras += 1
+            self._cpu_segundos += time.thread_time() - cpu_inicio
@@ -0,0 +1,100 @@
+"""
+Módulo de cache de renderização - Telas pré-renderizadas
+
+Menus e painéis fixos são montados e renderizados em segmentos uma única
+vez por largura e modo de cor do terminal; nas exibições seguintes os
+segmentos são apenas reenviados ao console, sem interpretar markup nem
+recalcular o layout. Telas que dependem de dados informam uma versão
+(das configurações ou do histórico) e só são renderizadas de novo quando
+ela muda.
+"""
+
+import io
+import sys
+import time
+from rich.console import Console
+from rich.segment import Segments
+
+
+# Última renderização de cada tela: nome -> (chave, segmentos)
+_telas = {}
+
+
+def _assinatura_console(console):
+    """Características do terminal que mudam a renderização."""
+    return (console.width, console.color_system, console.encoding, console.no_color)
+
+
+def imprimir_cacheado(console, nome, construir, versao=None):
+    """
+    Imprime uma tela, renderizando-a só se o terminal ou a versão dos dados
+    mudou desde a última exibição.
+
+    Parâmetros:
+    console (Console): Console onde imprimir.
+    nome (str): Identificador da tela.
+    construir (callable): Função sem argumentos que monta o renderable.
+    versao: Valor comparável que muda quando os dados da tela mudam
+            (None para telas fixas).
+    """
+    chave = (_assinatura_console(console), versao)
+    entrada = _telas.get(nome)
+    if entrada is None or entrada[0] != chave:
+        linhas = console.render_lines(construir(), console.options, pad=False, new_lines=True)
+        entrada = _telas[nome] = (chave, Segments([segmento for linha in linhas for segmento in linha]))
+    console.print(entrada[1])
+
+
+def invalidar_telas():
+    """Descarta todas as telas renderizadas (ex: após trocar o tema)."""
+    _telas.clear()
+
+
+def executar_benchmark(repeticoes=500, largura=100):
+    """
+    Mede o tempo de exibição das telas do menu com e sem o cache, num
+    console que escreve em memória.
+
+    Parâmetros:
+    repeticoes (int): Exibições de cada tela.
+    largura (int): Largura do terminal simulado.
+
+    Retorna:
+    dict: {tela: (ms sem cache, ms com cache)} por exibição.
+    """
+    import interface
+    import editor_config
+    from config import carregar_configuracoes, obter_versao_configuracoes
+
+    config = carregar_configuracoes()
+    telas = {
+        'menu_principal': (interface._tela_menu_principal, None),
+        'menu_historico': (interface._tela_menu_historico, None),
+        'sobre': (interface._tela_sobre, None),
+        'editar_configuracoes': (lambda: editor_config._tela_editor(config), obter_versao_configuracoes())
+    }
+    console = Console(file=io.StringIO(), width=largura, force_terminal=True, color_system='truecolor')
+
+    resultados = {}
+    for nome, (construir, versao) in telas.items():
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            console.print(construir())
+        sem_cache = (time.perf_counter() - inicio) / repeticoes * 1000
+
+        invalidar_telas()
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            imprimir_cacheado(console, nome, construir, versao)
+        com_cache = (time.perf_counter() - inicio) / repeticoes * 1000
+
+        console.file.seek(0)
+        console.file.truncate()
+        resultados[nome] = (sem_cache, com_cache)
+    return resultados
+
+
+if __name__ == "__main__":
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    for nome, (sem_cache, com_cache) in executar_benchmark(repeticoes).items():
+        print(f"{nome:<22} {sem_cache:6.3f} ms -> {com_cache:6.3f} ms ({sem_cache / com_cache:.1f}x)")
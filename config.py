@@ -2,24 +2,245 @@
 Módulo de gerenciamento de configurações do Pomo CLI
 """
 
+import copy
 import json
+import math
 import os
 
 
 # Arquivo de configuração padrão
 CONFIG_FILE = 'config.json'
 
-# Configurações padrão
-CONFIGURACOES_PADRAO = {
-    'tempo_trabalho': 25,
-    'descanso_curto': 5,
-    'descanso_longo': 15,
-    'ciclos': 4,
-    'som_habilitado': True,
-    'auto_iniciar_descanso': False,
-    'notificacoes_habilitadas': True
+# Gravações feitas por este processo (o mtime pode não mudar entre duas
+# gravações seguidas em sistemas de arquivos de baixa resolução)
+_gravacoes = 0
+
+# Esquema declarativo das configurações: tipo, limites, valor padrão e os
+# textos usados pelo editor. Campos com 'editavel': False não aparecem nos
+# menus, mas também são validados ao carregar.
+ESQUEMA_CONFIGURACOES = {
+    'tempo_trabalho': {
+        'tipo': int, 'minimo': 1, 'maximo': 120, 'padrao': 25,
+        'rotulo': 'Tempo de trabalho', 'unidade': 'minutos', 'icone': '⏱️ ',
+        'pergunta': 'Digite o novo tempo de trabalho (em minutos)'
+    },
+    'descanso_curto': {
+        'tipo': int, 'minimo': 1, 'maximo': 60, 'padrao': 5,
+        'rotulo': 'Descanso curto', 'unidade': 'minutos', 'icone': '⏱️ ',
+        'pergunta': 'Digite o novo tempo de descanso curto (em minutos)'
+    },
+    'descanso_longo': {
+        'tipo': int, 'minimo': 1, 'maximo': 60, 'padrao': 15,
+        'rotulo': 'Descanso longo', 'unidade': 'minutos', 'icone': '⏱️ ',
+        'pergunta': 'Digite o novo tempo de descanso longo (em minutos)'
+    },
+    'ciclos': {
+        'tipo': int, 'minimo': 1, 'maximo': 10, 'padrao': 4,
+        'rotulo': 'Número de ciclos', 'icone': '🔄',
+        'pergunta': 'Digite o novo número de ciclos'
+    },
+    'som_habilitado': {
+        'tipo': bool, 'padrao': True,
+        'rotulo': 'Som habilitado', 'icone': '🔊',
+        'pergunta': 'Habilitar som?'
+    },
+    'auto_iniciar_descanso': {
+        'tipo': bool, 'padrao': False,
+        'rotulo': 'Auto-iniciar descanso', 'icone': '⚡',
+        'pergunta': 'Auto-iniciar descanso automaticamente?'
+    },
+    'notificacoes_habilitadas': {
+        'tipo': bool, 'padrao': True,
+        'rotulo': 'Notificações', 'icone': '🔔',
+        'pergunta': 'Habilitar notificações?'
+    },
+    'recomendacao_automatica': {
+        'tipo': bool, 'padrao': False,
+        'rotulo': 'Tempos pelo histórico', 'icone': '💡',
+        'pergunta': 'Ajustar trabalho e descanso automaticamente pelo histórico?'
+    },
+    'meta_pomodoros_dia': {
+        'tipo': int, 'minimo': 0, 'maximo': 50, 'padrao': 0,
+        'rotulo': 'Meta diária', 'unidade': 'pomodoros (0 = desligada)', 'icone': '🎯',
+        'pergunta': 'Meta de pomodoros por dia? (0 desliga)'
+    },
+    'meta_horas_semana': {
+        'tipo': int, 'minimo': 0, 'maximo': 100, 'padrao': 0,
+        'rotulo': 'Meta semanal', 'unidade': 'horas de foco (0 = desligada)', 'icone': '📅',
+        'pergunta': 'Meta de horas de foco por semana? (0 desliga)'
+    },
+    'registrar_eventos': {
+        'tipo': bool, 'padrao': True,
+        'rotulo': 'Log de eventos', 'icone': '🧾',
+        'pergunta': 'Registrar o log de eventos do timer (para pomo replay)?'
+    },
+    'pausa_ociosidade_minutos': {
+        'tipo': int, 'minimo': 0, 'maximo': 120, 'padrao': 0,
+        'rotulo': 'Pausar após ociosidade', 'unidade': 'minutos (0 = desligado)', 'icone': '💤',
+        'pergunta': 'Pausar o trabalho após quantos minutos ocioso? (0 desliga)'
+    },
+    'hooks': {
+        'tipo': dict, 'padrao': {}, 'editavel': False
+    },
+    'hooks_timeout_segundos': {
+        'tipo': float, 'minimo': 0.1, 'maximo': 300, 'padrao': 5, 'editavel': False
+    },
+    'agendamentos': {
+        'tipo': list, 'padrao': [], 'editavel': False
+    }
 }
 
+# Configurações padrão
+CONFIGURACOES_PADRAO = {chave: campo['padrao'] for chave, campo in ESQUEMA_CONFIGURACOES.items()}
+
+VALORES_VERDADEIROS = {'true', '1', 's', 'sim', 'y', 'yes'}
+VALORES_FALSOS = {'false', '0', 'n', 'nao', 'não', 'no'}
+
+
+def _compilar_campo(chave, campo):
+    """
+    Gera a função de conversão e validação de um campo do esquema.
+    
+    Parâmetros:
+    chave (str): Nome da configuração.
+    campo (dict): Definição do campo no esquema.
+    
+    Retorna:
+    function: Converte um valor bruto no tipo do campo ou lança ValueError.
+    """
+    tipo = campo['tipo']
+    minimo = campo.get('minimo')
+    maximo = campo.get('maximo')
+    
+    # A mensagem cita apenas os limites definidos no esquema
+    if minimo is not None and maximo is not None:
+        faixa = f"use um número entre {minimo} e {maximo}"
+    elif minimo is not None:
+        faixa = f"use um número maior ou igual a {minimo}"
+    else:
+        faixa = f"use um número menor ou igual a {maximo}"
+    
+    def verificar_limites(valor):
+        if (minimo is not None and valor < minimo) or (maximo is not None and valor > maximo):
+            raise ValueError(f"{chave}: {faixa}")
+        return valor
+    
+    if tipo is bool:
+        def converter(valor):
+            if isinstance(valor, bool):
+                return valor
+            texto = str(valor).strip().lower()
+            if texto in VALORES_VERDADEIROS:
+                return True
+            if texto in VALORES_FALSOS:
+                return False
+            raise ValueError(f"{chave}: esperado Sim ou Não")
+    elif tipo in (int, float):
+        def converter(valor):
+            if isinstance(valor, bool):
+                raise ValueError(f"{chave}: esperado um número")
+            try:
+                numero = float(str(valor).strip().replace(',', '.'))
+            except ValueError:
+                raise ValueError(f"{chave}: esperado um número") from None
+            # NaN passaria pelas comparações de limite
+            if not math.isfinite(numero):
+                raise ValueError(f"{chave}: esperado um número finito")
+            if tipo is int:
+                if not numero.is_integer():
+                    raise ValueError(f"{chave}: esperado um número inteiro")
+                numero = int(numero)
+            return verificar_limites(numero)
+    else:
+        def converter(valor):
+            if not isinstance(valor, tipo):
+                raise ValueError(f"{chave}: tipo inválido")
+            return valor
+    
+    return converter
+
+
+def _compilar_esquema(esquema):
+    """Compila todos os campos do esquema em funções de conversão."""
+    return {chave: _compilar_campo(chave, campo) for chave, campo in esquema.items()}
+
+
+# Compilado uma única vez, na importação do módulo
+_CONVERSORES = _compilar_esquema(ESQUEMA_CONFIGURACOES)
+
+
+def campos_editaveis():
+    """
+    Retorna os campos do esquema exibidos nos menus, na ordem do esquema.
+    
+    Retorna:
+    list: Pares (chave, campo).
+    """
+    return [(chave, campo) for chave, campo in ESQUEMA_CONFIGURACOES.items() if campo.get('editavel', True)]
+
+
+def converter_valor(chave, valor):
+    """
+    Converte e valida um valor de configuração de acordo com o esquema.
+    
+    Parâmetros:
+    chave (str): Nome da configuração.
+    valor: Valor bruto (por exemplo, o texto digitado no editor).
+    
+    Retorna:
+    Valor convertido para o tipo do campo.
+    
+    Lança:
+    ValueError: Se o valor for inválido para o campo.
+    """
+    if chave not in _CONVERSORES:
+        raise ValueError(f"Configuração desconhecida: {chave}")
+    return _CONVERSORES[chave](valor)
+
+
+def validar_configuracoes(config):
+    """
+    Valida um dicionário de configurações contra o esquema.
+    Valores ausentes ou inválidos são substituídos pelo padrão; chaves
+    desconhecidas são preservadas.
+    
+    Parâmetros:
+    config (dict): Configurações brutas.
+    
+    Retorna:
+    tuple: (configurações validadas, lista de mensagens de erro).
+    """
+    validada = dict(config)
+    erros = []
+    for chave, converter in _CONVERSORES.items():
+        if chave not in config:
+            validada[chave] = copy.deepcopy(ESQUEMA_CONFIGURACOES[chave]['padrao'])
+            continue
+        try:
+            validada[chave] = converter(config[chave])
+        except ValueError as e:
+            erros.append(str(e))
+            validada[chave] = copy.deepcopy(ESQUEMA_CONFIGURACOES[chave]['padrao'])
+    return validada, erros
+
+
+def formatar_valor(chave, valor):
+    """
+    Formata um valor de configuração para exibição.
+    
+    Parâmetros:
+    chave (str): Nome da configuração.
+    valor: Valor da configuração.
+    
+    Retorna:
+    str: Valor formatado (ex: "25 minutos" ou "Sim").
+    """
+    campo = ESQUEMA_CONFIGURACOES.get(chave, {})
+    if campo.get('tipo') is bool:
+        return "Sim" if valor else "Não"
+    unidade = campo.get('unidade')
+    return f"{valor} {unidade}" if unidade else str(valor)
+
 
 def criar_config_padrao():
     """Cria o arquivo de configuração com valores padrão."""
@@ -43,19 +264,19 @@ def carregar_configuracoes():
         with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
             config = json.load(f)
         
-        # Garante que todas as chaves padrão existam
-        for chave, valor in CONFIGURACOES_PADRAO.items():
-            if chave not in config:
-                config[chave] = valor
+        # Garante que todas as chaves existam e tenham tipo e faixa válidos
+        config, erros = validar_configuracoes(config)
+        for erro in erros:
+            print(f"⚠️  Configuração inválida ({erro}). Usando valor padrão.")
         
         return config
     
     except json.JSONDecodeError:
         print("⚠️  Erro ao ler arquivo de configuração. Usando configurações padrão.")
-        return CONFIGURACOES_PADRAO.copy()
+        return copy.deepcopy(CONFIGURACOES_PADRAO)
     except Exception as e:
         print(f"⚠️  Erro ao carregar configurações: {e}")
-        return CONFIGURACOES_PADRAO.copy()
+        return copy.deepcopy(CONFIGURACOES_PADRAO)
 
 
 def salvar_configuracoes(config):
@@ -68,38 +289,41 @@ def salvar_configuracoes(config):
     Retorna:
     bool: True se salvou com sucesso, False caso contrário.
     """
+    global _gravacoes
+    
     try:
         with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
             json.dump(config, f, indent=4, ensure_ascii=False)
+        _gravacoes += 1
         return True
     except Exception as e:
         print(f"❌ Erro ao salvar configurações: {e}")
         return False
 
 
-def validar_valor(valor, minimo=1, maximo=999):
+def resetar_configuracoes():
     """
-    Valida se um valor está dentro do intervalo permitido.
-    
-    Parâmetros:
-    valor (int): Valor a ser validado.
-    minimo (int): Valor mínimo permitido.
-    maximo (int): Valor máximo permitido.
+    Reseta as configurações para os valores padrão.
     
     Retorna:
-    bool: True se válido, False caso contrário.
+    bool: True se resetou com sucesso, False caso contrário.
     """
-    return minimo <= valor <= maximo
+    return salvar_configuracoes(CONFIGURACOES_PADRAO)
 
 
-def resetar_configuracoes():
+def obter_versao_configuracoes():
     """
-    Reseta as configurações para os valores padrão.
+    Retorna um valor que muda sempre que o arquivo de configuração muda,
+    inclusive por outro processo.
     
     Retorna:
-    bool: True se resetou com sucesso, False caso contrário.
+    tuple: Gravações deste processo, data de modificação e tamanho do arquivo.
     """
-    return salvar_configuracoes(CONFIGURACOES_PADRAO)
+    try:
+        info = os.stat(CONFIG_FILE)
+        return (_gravacoes, info.st_mtime_ns, info.st_size)
+    except OSError:
+        return (_gravacoes, None, None)
 
 
 def obter_caminho_config():
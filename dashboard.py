@@ -0,0 +1,179 @@
+"""
+Módulo de dashboard - Painel em tela cheia com um único loop rich Live
+
+Mostra lado a lado o timer em execução, as sessões e as estatísticas. Os
+dados vêm dos agregados em memória do histórico e do estado publicado pelo
+timer; cada painel só é reconstruído quando seus dados mudam, e a navegação
+por teclado nunca limpa o terminal.
+"""
+
+from datetime import datetime
+from rich.console import Console
+from rich.layout import Layout
+from rich.live import Live
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+from rich import box
+from estado import ler_estado, formatar_estado
+from funcoes import modo_tecla, ler_tecla
+from historico import (
+    obter_agregado,
+    obter_estatisticas,
+    obter_sessoes_por_data,
+    obter_versao_historico,
+    formatar_duracao,
+    traduzir_tipo
+)
+
+console = Console()
+
+# Intervalo entre verificações de teclado e de dados, em segundos
+INTERVALO_ATUALIZACAO = 0.25
+
+ABAS = {
+    '1': 'hoje',
+    '2': 'recentes'
+}
+
+
+def _painel_timer(estado):
+    """Monta o painel do timer em execução."""
+    if estado is None:
+        conteudo = Text("Nenhum timer rodando", style="dim", justify="center")
+        return Panel(conteudo, title="⏱️  Timer", border_style="red", box=box.ROUNDED)
+
+    linhas = Text(justify="center")
+    linhas.append(formatar_estado(estado, '{icone} {restante}') + "\n", style="bold red")
+    linhas.append(estado.get('descricao') or estado['fase'], style="cyan")
+    if estado.get('pausado'):
+        linhas.append("\n⏸  Pausado", style="yellow")
+    return Panel(linhas, title="⏱️  Timer", border_style="red", box=box.ROUNDED)
+
+
+def _painel_sessoes(aba):
+    """Monta o painel com as sessões de hoje ou as mais recentes."""
+    agregado = obter_agregado()
+    recentes = list(agregado['recentes'])
+    if aba == 'hoje':
+        hoje = datetime.now().strftime('%Y-%m-%d')
+        sessoes = [s for s in recentes if s.get('data') == hoje]
+        # As recentes têm um limite: num dia cheio (ou após importar
+        # sessões) só o histórico tem todas as de hoje
+        total_hoje = agregado['por_data'].get(hoje, {}).get('sessoes', 0)
+        if len(sessoes) < total_hoje:
+            sessoes = sorted(obter_sessoes_por_data(hoje), key=lambda s: s.get('timestamp') or '')
+        titulo = "📅 Sessões de Hoje"
+    else:
+        sessoes = list(reversed(recentes))
+        titulo = "📜 Sessões Recentes"
+
+    table = Table(box=box.SIMPLE, expand=True)
+    table.add_column("Status", justify="center", width=6)
+    table.add_column("Tipo", style="cyan")
+    table.add_column("Duração", style="yellow", justify="right")
+    table.add_column("Hora", style="magenta", justify="right")
+
+    for sessao in sessoes:
+        status = "[green]✅[/]" if sessao.get('completa', True) else "[red]❌[/]"
+        table.add_row(
+            status,
+            traduzir_tipo(sessao.get('tipo', 'desconhecido')),
+            formatar_duracao(sessao.get('duracao_minutos', 0)),
+            sessao.get('hora', 'N/A')[:5]
+        )
+
+    if not sessoes:
+        return Panel(Text("📭 Nenhuma sessão registrada.", style="yellow"), title=titulo, border_style="blue", box=box.ROUNDED)
+    return Panel(table, title=titulo, border_style="blue", box=box.ROUNDED)
+
+
+def _painel_estatisticas():
+    """Monta o painel de estatísticas a partir dos agregados em memória."""
+    stats = obter_estatisticas()
+
+    table = Table(box=box.SIMPLE, expand=True, show_header=False)
+    table.add_column("Métrica", style="yellow")
+    table.add_column("Valor", style="green", justify="right")
+    table.add_row("Total de sessões", str(stats['total_sessoes']))
+    table.add_row("✅ Completas", str(stats['sessoes_completas']))
+    table.add_row("❌ Canceladas", str(stats['sessoes_canceladas']))
+    table.add_row("🍅 Pomodoros", str(stats['pomodoros_completos']))
+    table.add_row("Tempo de trabalho", formatar_duracao(stats['tempo_trabalho_minutos']))
+    table.add_row("Foco real", formatar_duracao(stats['tempo_foco_minutos']))
+    table.add_row("Sessões hoje", str(stats['sessoes_hoje']))
+    table.add_row("Tempo hoje", formatar_duracao(stats['tempo_hoje_minutos']))
+    table.add_row("Foco real hoje", formatar_duracao(stats['tempo_foco_hoje_minutos']))
+
+    return Panel(table, title="📊 Estatísticas", border_style="magenta", box=box.ROUNDED)
+
+
+def _rodape(aba):
+    """Monta a linha de atalhos de teclado."""
+    texto = Text(justify="center")
+    for tecla, nome in ABAS.items():
+        estilo = "bold reverse cyan" if nome == aba else "cyan"
+        texto.append(f" [{tecla}] {nome.capitalize()} ", style=estilo)
+    texto.append("  [q] Sair", style="dim")
+    return texto
+
+
+def _criar_layout():
+    """Cria a estrutura fixa do dashboard."""
+    layout = Layout()
+    layout.split_column(
+        Layout(Text("🍅 POMO CLI - Dashboard", style="bold red", justify="center"), name="cabecalho", size=1),
+        Layout(name="corpo"),
+        Layout(name="rodape", size=1)
+    )
+    layout["corpo"].split_row(
+        Layout(name="timer", ratio=1),
+        Layout(name="sessoes", ratio=2),
+        Layout(name="estatisticas", ratio=1)
+    )
+    return layout
+
+
+def exibir_dashboard():
+    """Exibe o dashboard em tela cheia até o usuário pressionar 'q'."""
+    layout = _criar_layout()
+    aba = 'hoje'
+    # Último conjunto de dados desenhado em cada painel
+    desenhado = {}
+
+    with modo_tecla(), Live(layout, console=console, screen=True, auto_refresh=False) as live:
+        while True:
+            estado = ler_estado()
+            versao = obter_versao_historico()
+            dados = {
+                'timer': None if estado is None else (formatar_estado(estado), estado.get('descricao'), estado.get('pausado')),
+                'sessoes': (versao, aba, datetime.now().strftime('%Y-%m-%d')),
+                'estatisticas': (versao, datetime.now().strftime('%Y-%m-%d')),
+                'rodape': aba
+            }
+
+            mudou = False
+            for nome, valor in dados.items():
+                if nome in desenhado and desenhado[nome] == valor:
+                    continue
+                desenhado[nome] = valor
+                mudou = True
+                if nome == 'timer':
+                    layout["timer"].update(_painel_timer(estado))
+                elif nome == 'sessoes':
+                    layout["sessoes"].update(_painel_sessoes(aba))
+                elif nome == 'estatisticas':
+                    layout["estatisticas"].update(_painel_estatisticas())
+                else:
+                    layout["rodape"].update(_rodape(aba))
+
+            if mudou:
+                live.refresh()
+
+            tecla = ler_tecla(INTERVALO_ATUALIZACAO)
+            if tecla is None:
+                continue
+            if tecla.lower() in ('q', '0', '\x1b'):
+                break
+            if tecla in ABAS:
+                aba = ABAS[tecla]
@@ -0,0 +1,191 @@
+"""
+Módulo de estado do timer - Publica o timer em execução para barras de status
+
+O timer grava um arquivo pequeno apenas nas transições (início, pausa e fim
+de fase), com o instante final em vez do tempo restante, então o leitor
+calcula o restante sozinho. O leitor (`pomo status`) usa só a biblioteca
+padrão e não importa rich, para iniciar em poucos milissegundos.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def _diretorio_estado():
+    """
+    Diretório do arquivo de estado, fixo por usuário para que `pomo status`
+    encontre o timer qualquer que seja o diretório atual: o XDG_RUNTIME_DIR
+    quando existe; senão, o diretório de estado do usuário.
+    """
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, 'pomo')
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(base, 'pomo')
+
+
+# Arquivo de estado do timer em execução
+ESTADO_FILE = os.path.join(_diretorio_estado(), 'estado.json')
+
+# Ícones por fase usados no formato padrão
+ICONES_FASE = {
+    'trabalho': '🍅',
+    'descanso_curto': '☕',
+    'descanso_longo': '🌴',
+    'personalizado': '⏱️'
+}
+
+FORMATO_PADRAO = '{icone} {restante}{ciclo_texto}'
+
+# Campos aceitos em --formato
+CAMPOS_FORMATO = ('icone', 'fase', 'restante', 'segundos', 'ciclo', 'ciclos', 'ciclo_texto')
+
+
+def publicar_estado(fase, restante_segundos, ciclo=None, ciclos=None, pausado=False, descricao=None):
+    """
+    Publica o estado do timer com escrita atômica.
+
+    Parâmetros:
+    fase (str): Tipo da sessão em andamento.
+    restante_segundos (float): Segundos restantes no momento da transição.
+    ciclo (int): Ciclo atual, se for uma sessão Pomodoro.
+    ciclos (int): Total de ciclos da sessão.
+    pausado (bool): Se o timer está pausado.
+    descricao (str): Descrição da sessão.
+
+    Retorna:
+    bool: True se publicou com sucesso, False caso contrário.
+    """
+    estado = {
+        'fase': fase,
+        'descricao': descricao,
+        'ciclo': ciclo,
+        'ciclos': ciclos,
+        'pausado': pausado,
+        'restante': restante_segundos,
+        'fim': time.time() + restante_segundos,
+        'pid': os.getpid()
+    }
+    temporario = f"{ESTADO_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(ESTADO_FILE), mode=0o700, exist_ok=True)
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, ensure_ascii=False)
+        os.replace(temporario, ESTADO_FILE)
+        return True
+    except OSError:
+        return False
+
+
+def limpar_estado():
+    """Remove o estado publicado quando nenhum timer está rodando."""
+    try:
+        os.remove(ESTADO_FILE)
+    except OSError:
+        pass
+
+
+def _processo_ativo(pid):
+    """Verifica se o processo que publicou o estado ainda existe."""
+    if not pid or os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def ler_estado():
+    """
+    Lê o estado publicado e calcula o tempo restante atual.
+
+    Retorna:
+    dict | None: Estado com 'restante' atualizado, ou None se não houver
+                 timer rodando.
+    """
+    try:
+        with open(ESTADO_FILE, 'r', encoding='utf-8') as f:
+            estado = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not _processo_ativo(estado.get('pid')):
+        return None
+
+    if not estado.get('pausado'):
+        estado['restante'] = max(estado['fim'] - time.time(), 0.0)
+    return estado
+
+
+def formatar_estado(estado, formato=FORMATO_PADRAO):
+    """
+    Formata o estado para exibição numa linha de status.
+
+    Parâmetros:
+    estado (dict): Estado retornado por ler_estado.
+    formato (str): Formato com os campos {icone}, {fase}, {restante},
+                   {segundos}, {ciclo}, {ciclos} e {ciclo_texto}.
+
+    Retorna:
+    str: Linha formatada.
+    """
+    mins, secs = divmod(int(-(-estado['restante'] // 1)), 60)
+    ciclo = estado.get('ciclo')
+    ciclos = estado.get('ciclos')
+    return formato.format(
+        icone='⏸' if estado.get('pausado') else ICONES_FASE.get(estado['fase'], '⏱️'),
+        fase=estado['fase'],
+        restante=f"{mins:02d}:{secs:02d}",
+        segundos=int(estado['restante']),
+        ciclo=ciclo or '',
+        ciclos=ciclos or '',
+        ciclo_texto=f" [{ciclo}/{ciclos}]" if ciclo and ciclos else ''
+    )
+
+
+def main_status(argumentos):
+    """
+    Ponto de entrada de `pomo status`.
+
+    Parâmetros:
+    argumentos (list): Argumentos após 'status' ('--json' ou '--formato FORMATO').
+
+    Retorna:
+    int: Código de saída (0 com timer rodando, 1 sem timer ou com formato
+         inválido).
+    """
+    estado = ler_estado()
+    if estado is None:
+        return 1
+
+    if '--json' in argumentos:
+        sys.stdout.write(json.dumps(estado, ensure_ascii=False) + '\n')
+        return 0
+
+    formato = FORMATO_PADRAO
+    if '--formato' in argumentos:
+        indice = argumentos.index('--formato') + 1
+        if indice < len(argumentos):
+            formato = argumentos[indice]
+
+    try:
+        linha = formatar_estado(estado, formato)
+    except (KeyError, IndexError, ValueError, AttributeError) as e:
+        campos = ', '.join(f"{{{campo}}}" for campo in CAMPOS_FORMATO)
+        sys.stderr.write(f"❌ Formato inválido ({e!r}). Campos disponíveis: {campos}\n")
+        return 1
+
+    sys.stdout.write(linha + '\n')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_status(sys.argv[1:]))
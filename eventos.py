@@ -0,0 +1,198 @@
+"""
+Módulo de eventos - Log estruturado das transições do timer
+
+Cada transição (início e fim de fases, respostas, pausas), amostra de
+desvio dos ticks, resultado de notificação e tempo de gravação vira uma
+linha JSON em eventos.ndjson. O registro só acrescenta o evento a um
+buffer em memória; uma thread grava o buffer periodicamente, então o log
+nunca atrasa o timer. O arquivo é rotacionado ao atingir TAMANHO_MAXIMO.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+
+# Arquivo do log de eventos (os rotacionados ganham sufixo .1, .2, ...)
+EVENTOS_FILE = 'eventos.ndjson'
+
+# Tamanho máximo do arquivo antes da rotação, em bytes
+TAMANHO_MAXIMO = 1024 * 1024
+
+# Arquivos rotacionados mantidos
+ARQUIVOS_MANTIDOS = 3
+
+# Intervalo entre gravações do buffer, em segundos
+INTERVALO_DESCARGA = 2.0
+
+_buffer = []
+_trava_buffer = threading.Lock()
+_trava_arquivo = threading.Lock()
+_descarregador = None
+_habilitado = True
+# Sessão e relógio correntes, e captura ativa (simulação), por thread
+_contexto = threading.local()
+
+
+def configurar_eventos(config):
+    """
+    Liga ou desliga o log conforme as configurações.
+
+    Parâmetros:
+    config (dict): Configurações carregadas (chave 'registrar_eventos').
+    """
+    global _habilitado
+    _habilitado = bool(config.get('registrar_eventos', True))
+
+
+def nova_sessao_id():
+    """Gera um identificador curto para uma sessão."""
+    return uuid.uuid4().hex[:8]
+
+
+@contextmanager
+def contexto_sessao(sessao, relogio=None):
+    """
+    Associa os eventos registrados nesta thread a uma sessão e a um relógio.
+    Se já houver uma sessão ativa, ela é mantida.
+
+    Parâmetros:
+    sessao (str): Identificador da sessão.
+    relogio: Relógio cujo monotonico() marca os eventos.
+
+    Retorna:
+    str: Identificador da sessão ativa.
+    """
+    if getattr(_contexto, 'sessao', None) is not None:
+        yield _contexto.sessao
+        return
+    _contexto.sessao = sessao
+    _contexto.relogio = relogio
+    try:
+        yield sessao
+    finally:
+        _contexto.sessao = None
+        _contexto.relogio = None
+
+
+@contextmanager
+def capturar_eventos():
+    """
+    Desvia os eventos desta thread para uma lista em vez do arquivo.
+
+    Retorna:
+    list: Lista (preenchida durante o bloco) com os eventos registrados.
+    """
+    anterior = getattr(_contexto, 'captura', None)
+    _contexto.captura = []
+    try:
+        yield _contexto.captura
+    finally:
+        _contexto.captura = anterior
+
+
+def registrar_evento(evento, **dados):
+    """
+    Registra um evento. Apenas acrescenta ao buffer: nenhum I/O acontece
+    na thread que chama.
+
+    Parâmetros:
+    evento (str): Nome do evento (ex: 'timer_inicio', 'tick').
+    **dados: Campos do evento.
+    """
+    relogio = getattr(_contexto, 'relogio', None)
+    registro = {'t': round(relogio.monotonico() if relogio else time.monotonic(), 6), 'evento': evento}
+    sessao = getattr(_contexto, 'sessao', None)
+    if sessao is not None:
+        registro['sessao'] = sessao
+    registro.update(dados)
+
+    captura = getattr(_contexto, 'captura', None)
+    if captura is not None:
+        captura.append(registro)
+        return
+    if not _habilitado:
+        return
+
+    with _trava_buffer:
+        _buffer.append(registro)
+    _iniciar_descarregador()
+
+
+def _iniciar_descarregador():
+    """Inicia a thread que grava o buffer, se ainda não estiver rodando."""
+    global _descarregador
+    if _descarregador is not None:
+        return
+    with _trava_buffer:
+        if _descarregador is None:
+            _descarregador = threading.Thread(target=_executar_descarga, name='pomo-eventos', daemon=True)
+            _descarregador.start()
+
+
+def _executar_descarga():
+    """Laço da thread: grava o buffer a cada INTERVALO_DESCARGA segundos."""
+    while True:
+        time.sleep(INTERVALO_DESCARGA)
+        descarregar_eventos()
+
+
+def _rotacionar(caminho):
+    """Renomeia caminho -> caminho.1 -> caminho.2 ..., descartando o mais antigo."""
+    for indice in range(ARQUIVOS_MANTIDOS, 0, -1):
+        origem = caminho if indice == 1 else f"{caminho}.{indice - 1}"
+        if os.path.exists(origem):
+            os.replace(origem, f"{caminho}.{indice}")
+
+
+def descarregar_eventos():
+    """
+    Grava os eventos do buffer no arquivo, rotacionando se necessário.
+    Registrada com atexit para não perder os últimos eventos.
+    """
+    with _trava_buffer:
+        if not _buffer:
+            return
+        pendentes = _buffer[:]
+        _buffer.clear()
+
+    linhas = "".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in pendentes).encode('utf-8')
+    with _trava_arquivo:
+        try:
+            if os.path.exists(EVENTOS_FILE) and os.path.getsize(EVENTOS_FILE) + len(linhas) > TAMANHO_MAXIMO:
+                _rotacionar(EVENTOS_FILE)
+            with open(EVENTOS_FILE, 'ab') as f:
+                f.write(linhas)
+        except OSError as e:
+            print(f"⚠️  Erro ao gravar log de eventos: {e}")
+
+
+atexit.register(descarregar_eventos)
+
+
+def ler_eventos(caminho=EVENTOS_FILE):
+    """
+    Percorre o log de eventos, dos arquivos rotacionados mais antigos ao atual.
+
+    Parâmetros:
+    caminho (str): Arquivo do log.
+
+    Retorna:
+    generator: Eventos (dicts), em ordem de gravação.
+    """
+    descarregar_eventos()
+    arquivos = [f"{caminho}.{indice}" for indice in range(ARQUIVOS_MANTIDOS, 0, -1)] + [caminho]
+    for arquivo in arquivos:
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                for linha in f:
+                    try:
+                        yield json.loads(linha)
+                    except ValueError:
+                        continue
+        except OSError:
+            continue
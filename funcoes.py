@@ -1,20 +1,176 @@
+import math
+import re
+import sys
 import time
 import os
 import platform
+from contextlib import contextmanager
 
-def contar_tempo(minutos):
+# Margem final da espera, em segundos, resolvida com espera ativa
+MARGEM_ESPERA_ATIVA = 0.002
+
+
+def aguardar_ate(prazo):
+    """
+    Espera até o instante monotônico informado com alta resolução.
+    Dorme até perto do prazo e resolve os últimos milissegundos com
+    espera ativa, evitando o atraso de granularidade do time.sleep.
+
+    Parâmetros:
+    prazo (float): Instante de time.monotonic() a aguardar.
+    """
+    while True:
+        restante = prazo - time.monotonic()
+        if restante <= 0:
+            return
+        if restante > MARGEM_ESPERA_ATIVA:
+            time.sleep(restante - MARGEM_ESPERA_ATIVA)
+
+
+def contar_tempo(minutos, intervalo=1.0, relogio=None, ocioso=None, medicao=None):
     """
     Conta o tempo decrescente a partir do número de minutos fornecido.
+    O prazo final é fixado no relógio monotônico, então atrasos na
+    exibição nunca acumulam; as atualizações ficam alinhadas a múltiplos
+    de `intervalo` segundos restantes e a última acontece exatamente no prazo.
 
     Parâmetros:
-    minutos (int): Número de minutos para contar.
+    minutos (float): Número de minutos para contar (aceita frações).
+    intervalo (float): Intervalo entre atualizações, em segundos.
+    relogio: Relógio com monotonico() e aguardar_ate() (ver relogio.py).
+             Se None, usa o relógio do sistema.
+    ocioso: Função que retorna há quantos segundos o usuário está ocioso
+            (0 se ativo). Enquanto ocioso, a contagem fica congelada; ao
+            retomar, o prazo é adiado por todo o período ocioso.
+    medicao (dict): Se informado, recebe em 'segundos_pausados' o tempo
+                    total congelado por ociosidade, mesmo se a contagem
+                    for interrompida durante uma pausa.
+
+    Retorna:
+    generator: Segundos restantes (float) a cada atualização, terminando em 0.
     """
+    monotonico = relogio.monotonico if relogio else time.monotonic
+    esperar = relogio.aguardar_ate if relogio else aguardar_ate
+    
+    medicao = {} if medicao is None else medicao
+    medicao['segundos_pausados'] = 0.0
+    
     total_segundos = minutos * 60
-    while total_segundos >= 0:
-        mins, secs = divmod(total_segundos, 60)
-        yield mins, secs
-        time.sleep(1)
-        total_segundos -= 1
+    prazo = monotonico() + total_segundos
+    restante = total_segundos
+    while restante > 0:
+        yield restante
+        segundos_ocioso = ocioso() if ocioso else 0
+        if segundos_ocioso:
+            inicio_ocioso = monotonico() - segundos_ocioso
+            pausados = medicao['segundos_pausados']
+            try:
+                while ocioso():
+                    esperar(monotonico() + intervalo)
+                    yield restante
+            finally:
+                medicao['segundos_pausados'] = pausados + monotonico() - inicio_ocioso
+            prazo += monotonico() - inicio_ocioso
+            restante = max(prazo - monotonico(), 0.0)
+            continue
+        proxima_marca = (math.ceil(restante / intervalo - 1e-9) - 1) * intervalo
+        esperar(prazo - max(proxima_marca, 0))
+        restante = max(prazo - monotonico(), 0.0)
+    yield 0.0
+
+
+def converter_duracao(texto):
+    """
+    Converte uma duração digitada pelo usuário em minutos.
+    Aceita minutos fracionários ("1.5" ou "1,5") e sufixos de horas,
+    minutos e segundos ("90s", "2m", "1m30s", "1h").
+
+    Parâmetros:
+    texto (str): Duração digitada.
+
+    Retorna:
+    float: Duração em minutos.
+
+    Lança:
+    ValueError: Se o texto não for uma duração válida ou finita.
+    """
+    texto = texto.strip().lower().replace(',', '.')
+    partes = re.fullmatch(r'(?:(\d+(?:\.\d+)?)h)?\s*(?:(\d+(?:\.\d+)?)m(?:in)?)?\s*(?:(\d+(?:\.\d+)?)s)?', texto)
+    if partes and any(partes.groups()):
+        horas, mins, segs = (float(p) if p else 0.0 for p in partes.groups())
+        minutos = horas * 60 + mins + segs / 60
+    else:
+        minutos = float(texto)
+    # "nan", "inf" e valores enormes passam pelo float(), mas não são
+    # durações que o timer consiga contar
+    if not math.isfinite(minutos) or not math.isfinite(minutos * 60):
+        raise ValueError(f"Duração inválida: {texto}")
+    return minutos
+
+
+def formatar_restante(segundos):
+    """
+    Formata os segundos restantes como MM:SS, arredondando para cima
+    para que o display só mostre 00:00 na conclusão.
+
+    Parâmetros:
+    segundos (float): Segundos restantes.
+
+    Retorna:
+    str: Tempo restante formatado.
+    """
+    mins, secs = divmod(math.ceil(segundos - 1e-9), 60)
+    return f"{mins:02d}:{secs:02d}"
+
+@contextmanager
+def modo_tecla():
+    """Coloca o terminal em modo de leitura tecla a tecla, sem eco."""
+    if os.name == 'nt' or not sys.stdin.isatty():
+        yield
+        return
+
+    import termios
+    import tty
+
+    descritor = sys.stdin.fileno()
+    original = termios.tcgetattr(descritor)
+    try:
+        tty.setcbreak(descritor)
+        yield
+    finally:
+        termios.tcsetattr(descritor, termios.TCSADRAIN, original)
+
+
+def ler_tecla(timeout):
+    """
+    Lê uma tecla sem bloquear por mais que `timeout` segundos.
+
+    Parâmetros:
+    timeout (float): Tempo máximo de espera.
+
+    Retorna:
+    str | None: Tecla pressionada, ou None se nenhuma.
+    """
+    if os.name == 'nt':
+        import msvcrt
+
+        limite = time.monotonic() + timeout
+        while time.monotonic() < limite:
+            if msvcrt.kbhit():
+                return msvcrt.getwch()
+            time.sleep(0.02)
+        return None
+
+    import select
+
+    if not sys.stdin.isatty():
+        time.sleep(timeout)
+        return None
+    prontos, _, _ = select.select([sys.stdin], [], [], timeout)
+    if prontos:
+        return sys.stdin.read(1)
+    return None
+
 
 def tocar_som():
     """
@@ -2,23 +2,84 @@
 Módulo de gerenciamento de histórico de sessões do Pomo CLI
 """
 
+import atexit
+import bisect
 import json
 import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
+from eventos import registrar_evento
 
 
 # Arquivo de histórico
 HISTORICO_FILE = 'historico.json'
 
+# Agregado persistido (rollups), para não percorrer o histórico a cada
+# processo; vale enquanto a assinatura do historico.json não mudar
+ROLLUPS_FILE = 'rollups.json'
+VERSAO_ROLLUPS = 5
+
+# Tamanho dos blocos lidos e copiados ao percorrer o arquivo em streaming
+TAMANHO_BLOCO = 64 * 1024
+
+# Índice de tarefas: nomes internados (id -> nome), posições das sessões de
+# cada tarefa no histórico e totais por mês, mantidos a cada lote gravado
+TAREFAS_FILE = 'tarefas.json'
+VERSAO_INDICE_TAREFAS = 2
+
+# Trava entre processos: vários `pomo` abertos no mesmo diretório gravam o
+# histórico, os rollups e o índice de tarefas um de cada vez
+TRAVA_FILE = 'historico.lock'
+
+# Gravação em segundo plano (write-behind): o timer apenas enfileira as
+# sessões e uma thread dedicada as grava em lote no arquivo.
+_fila_gravacao = queue.Queue()
+_gravador = None
+_trava_gravador = threading.Lock()
+_trava_arquivo = threading.Lock()
+# Lotes que falharam desde a última vez que aguardar_gravacoes informou
+# o resultado: um lote gravado depois não apaga a falha de um anterior
+_falhas_gravacao = 0
+_trava_falhas = threading.Lock()
+_FIM_GRAVADOR = object()
+# Capturas ativas por thread (simulação)
+_captura = threading.local()
+# Funções avisadas de cada sessão registrada ou importada (ver observar_sessoes)
+_observadores = []
+
+# Estatísticas mantidas em memória: semeadas uma vez a partir do arquivo e
+# atualizadas a cada lote gravado, sem reler o histórico
+TOTAL_SESSOES_RECENTES = 50
+# Descanso ainda desconhecido no início de um trecho agregado em separado
+# (ver mesclar_agregados)
+DESCANSO_PENDENTE = '?'
+_agregado = None
+_assinatura_arquivo = None
+_versao = 0
+_trava_agregado = threading.Lock()
+_indice_tarefas = None
+
 
 def carregar_historico():
     """
     Carrega o histórico de sessões do arquivo JSON.
     Se o arquivo não existir, retorna uma lista vazia.
+    Aguarda antes as gravações pendentes, para que sessões recém
+    registradas já apareçam no resultado.
     
     Retorna:
     list: Lista de sessões registradas.
     """
+    aguardar_gravacoes()
+    return _ler_historico()
+
+
+def _ler_historico():
+    """Lê o arquivo de histórico sem aguardar a fila de gravação."""
     if not os.path.exists(HISTORICO_FILE):
         return []
     
@@ -33,6 +94,90 @@ def carregar_historico():
         return []
 
 
+def _iterar_arquivo(caminho):
+    """
+    Percorre um arquivo no formato do histórico (array JSON) devolvendo uma
+    sessão por vez, lendo em blocos: a memória usada independe do tamanho
+    do arquivo. Se o arquivo estiver corrompido, devolve as sessões válidas
+    até o ponto do erro.
+    
+    Parâmetros:
+    caminho (str): Arquivo a ler.
+    
+    Retorna:
+    generator: Sessões, em ordem.
+    """
+    decodificador = json.JSONDecoder()
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            buffer = ''
+            posicao = 0
+            fim_arquivo = False
+            aberto = False
+            
+            while True:
+                # Pula espaços e separadores até o próximo valor
+                while posicao < len(buffer) and buffer[posicao] in ' \t\r\n,':
+                    posicao += 1
+                
+                if posicao >= len(buffer) or not aberto or buffer[posicao] == '{':
+                    if posicao >= len(buffer) and fim_arquivo:
+                        if aberto:
+                            print("⚠️  Erro ao ler arquivo de histórico: fim inesperado.")
+                        return
+                    if posicao >= len(buffer):
+                        bloco = f.read(TAMANHO_BLOCO)
+                        fim_arquivo = not bloco
+                        buffer, posicao = buffer[posicao:] + bloco, 0
+                        continue
+                
+                if not aberto:
+                    if buffer[posicao] != '[':
+                        print("⚠️  Erro ao ler arquivo de histórico: formato inválido.")
+                        return
+                    aberto = True
+                    posicao += 1
+                    continue
+                
+                if buffer[posicao] == ']':
+                    return
+                
+                try:
+                    sessao, fim = decodificador.raw_decode(buffer, posicao)
+                except json.JSONDecodeError:
+                    if fim_arquivo:
+                        print("⚠️  Erro ao ler arquivo de histórico: sessão inválida.")
+                        return
+                    # Sessão incompleta no buffer: lê mais um bloco
+                    bloco = f.read(TAMANHO_BLOCO)
+                    fim_arquivo = not bloco
+                    buffer, posicao = buffer[posicao:] + bloco, 0
+                    continue
+                
+                yield sessao
+                posicao = fim
+                if posicao > TAMANHO_BLOCO:
+                    buffer, posicao = buffer[posicao:], 0
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        print(f"⚠️  Erro ao carregar histórico: {e}")
+
+
+def iterar_historico():
+    """
+    Percorre o histórico uma sessão por vez, com memória constante.
+    Aguarda antes as gravações pendentes, como carregar_historico.
+    
+    Retorna:
+    generator: Sessões, em ordem cronológica de registro.
+    """
+    aguardar_gravacoes()
+    # O arquivo é trocado de forma atômica pelo gravador; um arquivo já
+    # aberto continua sendo lido por inteiro na versão anterior
+    return _iterar_arquivo(HISTORICO_FILE)
+
+
 def salvar_historico(historico):
     """
     Salva o histórico de sessões no arquivo JSON.
@@ -43,95 +188,1008 @@ def salvar_historico(historico):
     Retorna:
     bool: True se salvou com sucesso, False caso contrário.
     """
+    temporario = HISTORICO_FILE + '.tmp'
     try:
-        with open(HISTORICO_FILE, 'w', encoding='utf-8') as f:
+        # Grava num arquivo temporário e troca de forma atômica, para que
+        # uma falha no meio da escrita nunca corrompa o histórico existente
+        with open(temporario, 'w', encoding='utf-8') as f:
             json.dump(historico, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, HISTORICO_FILE)
         return True
     except Exception as e:
         print(f"❌ Erro ao salvar histórico: {e}")
         return False
 
 
-def adicionar_sessao(tipo, duracao_minutos, completa=True):
+def normalizar_tarefa(tarefa):
+    """
+    Normaliza o nome de uma tarefa (espaços extras removidos).
+    
+    Retorna:
+    str | None: Nome normalizado, ou None se vazio.
+    """
+    if tarefa is None:
+        return None
+    return " ".join(str(tarefa).split()) or None
+
+
+def _criar_sessao(tipo, duracao_minutos, completa=True, momento=None, tarefa=None, **extras):
     """
-    Adiciona uma nova sessão ao histórico.
+    Monta o registro de uma sessão.
     
     Parâmetros:
-    tipo (str): Tipo da sessão ('trabalho', 'descanso_curto', 'descanso_longo', 'personalizado', 'pomodoro_completo').
+    tipo (str): Tipo da sessão.
     duracao_minutos (int): Duração da sessão em minutos.
     completa (bool): Se a sessão foi completada ou cancelada.
+    momento (datetime): Data e hora do registro. Se None, usa o momento atual.
+    tarefa (str): Tarefa ou projeto ao qual a sessão é atribuída (opcional).
+    **extras: Campos adicionais gravados na sessão (ex: 'pausas_ociosidade').
     
     Retorna:
-    bool: True se adicionou com sucesso, False caso contrário.
+    dict: Registro da sessão.
     """
-    historico = carregar_historico()
-    
+    agora = momento or datetime.now()
     sessao = {
         'tipo': tipo,
         'duracao_minutos': duracao_minutos,
         'completa': completa,
-        'data': datetime.now().strftime('%Y-%m-%d'),
-        'hora': datetime.now().strftime('%H:%M:%S'),
-        'timestamp': datetime.now().isoformat()
+        'data': agora.strftime('%Y-%m-%d'),
+        'hora': agora.strftime('%H:%M:%S'),
+        'timestamp': agora.isoformat()
     }
+    tarefa = normalizar_tarefa(tarefa)
+    if tarefa:
+        sessao['tarefa'] = tarefa
+    sessao.update(extras)
+    return sessao
+
+
+def _abrir_trava():
+    """
+    Abre e trava o arquivo de trava entre processos, esperando se outro
+    processo estiver gravando.
+    
+    Retorna:
+    int | None: Descritor travado, ou None se não foi possível travar.
+    """
+    try:
+        descritor = os.open(TRAVA_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        return None
+    try:
+        try:
+            import fcntl
+        except ImportError:
+            import msvcrt
+            # LK_LOCK desiste após ~10 s; tenta de novo até conseguir
+            while True:
+                try:
+                    msvcrt.locking(descritor, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            fcntl.flock(descritor, fcntl.LOCK_EX)
+        return descritor
+    except OSError as e:
+        print(f"⚠️  Erro ao travar histórico: {e}")
+        os.close(descritor)
+        return None
+
+
+def _liberar_trava(descritor):
+    """Destrava e fecha o arquivo de trava."""
+    try:
+        import msvcrt
+        os.lseek(descritor, 0, os.SEEK_SET)
+        msvcrt.locking(descritor, msvcrt.LK_UNLCK, 1)
+    except (ImportError, OSError):
+        pass
+    # No POSIX, fechar o descritor libera o flock
+    os.close(descritor)
+
+
+@contextmanager
+def _travar_arquivo():
+    """
+    Garante acesso exclusivo aos arquivos do histórico, entre as threads
+    deste processo e entre processos.
+    """
+    with _trava_arquivo:
+        descritor = _abrir_trava()
+        try:
+            yield
+        finally:
+            if descritor is not None:
+                _liberar_trava(descritor)
+
+
+def _serializar_sessoes(sessoes):
+    """Serializa sessões no mesmo formato de json.dump(indent=4) do histórico."""
+    return ",\n".join(
+        "    " + json.dumps(sessao, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+        for sessao in sessoes
+    )
+
+
+def _localizar_fim_historico():
+    """
+    Encontra onde terminam as sessões no arquivo, lendo só o final dele.
+    
+    Retorna:
+    tuple | None: (bytes a copiar, se o array está vazio), ou None se o
+                  arquivo não existe ou não termina num array JSON.
+    """
+    try:
+        with open(HISTORICO_FILE, 'rb') as f:
+            tamanho = f.seek(0, os.SEEK_END)
+            inicio = max(tamanho - 4096, 0)
+            f.seek(inicio)
+            final = f.read()
+    except OSError:
+        return None
     
-    historico.append(sessao)
-    return salvar_historico(historico)
+    corpo = final.rstrip()
+    if not corpo.endswith(b']'):
+        return None
+    antes = corpo[:-1].rstrip()
+    if inicio == 0 and antes.lstrip() == b'[':
+        return (len(antes), True)
+    if not antes.endswith(b'}'):
+        return None
+    return (inicio + len(antes), False)
 
 
-def obter_estatisticas():
+def _anexar_ao_historico(sessoes):
     """
-    Calcula estatísticas gerais do histórico.
+    Acrescenta sessões ao histórico sem carregá-lo: o conteúdo existente é
+    copiado em blocos para um arquivo temporário, as novas sessões são
+    escritas no fim e o arquivo é trocado de forma atômica.
+    
+    Parâmetros:
+    sessoes (list): Sessões a acrescentar.
+    
+    Retorna:
+    bool: True se gravou com sucesso, False caso contrário.
+    """
+    fim = _localizar_fim_historico()
+    if fim is None:
+        # Arquivo ausente ou corrompido: regrava as sessões legíveis
+        return salvar_historico(list(_iterar_arquivo(HISTORICO_FILE)) + list(sessoes))
+    
+    temporario = HISTORICO_FILE + '.tmp'
+    copiar, vazio = fim
+    try:
+        with open(HISTORICO_FILE, 'rb') as origem, open(temporario, 'wb') as destino:
+            while copiar > 0:
+                bloco = origem.read(min(TAMANHO_BLOCO, copiar))
+                if not bloco:
+                    break
+                destino.write(bloco)
+                copiar -= len(bloco)
+            destino.write(b"\n" if vazio else b",\n")
+            destino.write(_serializar_sessoes(sessoes).encode('utf-8'))
+            destino.write(b"\n]")
+            destino.flush()
+            os.fsync(destino.fileno())
+        os.replace(temporario, HISTORICO_FILE)
+        return True
+    except Exception as e:
+        print(f"❌ Erro ao salvar histórico: {e}")
+        return False
+
+
+def _executar_gravador():
+    """
+    Laço da thread de gravação: espera por sessões na fila, junta todas
+    as que estiverem disponíveis num único lote e grava o lote de uma vez.
+    """
+    global _falhas_gravacao
+    
+    encerrar = False
+    while not encerrar:
+        lote = [_fila_gravacao.get()]
+        while True:
+            try:
+                lote.append(_fila_gravacao.get_nowait())
+            except queue.Empty:
+                break
+        
+        sessoes = [item for item in lote if item is not _FIM_GRAVADOR]
+        encerrar = len(sessoes) != len(lote)
+        
+        gravado = True
+        try:
+            if sessoes:
+                with _travar_arquivo():
+                    inicio = time.perf_counter()
+                    assinatura_anterior = _assinatura_historico()
+                    gravado = _anexar_ao_historico(sessoes)
+                    anexado = time.perf_counter()
+                    if gravado:
+                        _atualizar_agregado(sessoes, assinatura_anterior)
+                        _atualizar_indice_tarefas(sessoes, assinatura_anterior)
+                    registrar_evento(
+                        'gravacao',
+                        sessoes=len(sessoes),
+                        ok=gravado,
+                        ms_anexar=round((anexado - inicio) * 1000, 3),
+                        ms_indices=round((time.perf_counter() - anexado) * 1000, 3)
+                    )
+        except Exception as e:
+            print(f"❌ Erro ao gravar histórico: {e}")
+            gravado = False
+        finally:
+            # Contada antes de liberar a fila, para aguardar_gravacoes vê-la
+            if not gravado:
+                with _trava_falhas:
+                    _falhas_gravacao += 1
+            for _ in lote:
+                _fila_gravacao.task_done()
+
+
+def _iniciar_gravador():
+    """Inicia a thread de gravação, se ainda não estiver rodando."""
+    global _gravador
+    
+    with _trava_gravador:
+        if _gravador is None or not _gravador.is_alive():
+            _gravador = threading.Thread(
+                target=_executar_gravador,
+                name='pomo-gravador-historico',
+                daemon=True
+            )
+            _gravador.start()
+
+
+def registrar_sessao(tipo, duracao_minutos, completa=True, momento=None, tarefa=None, **extras):
+    """
+    Enfileira uma nova sessão para gravação em segundo plano.
+    Retorna imediatamente, sem esperar pelo disco, para que as
+    transições de fase do timer nunca aguardem I/O.
+    
+    Parâmetros:
+    tipo (str): Tipo da sessão ('trabalho', 'descanso_curto', 'descanso_longo', 'personalizado', 'pomodoro_completo').
+    duracao_minutos (int): Duração da sessão em minutos.
+    completa (bool): Se a sessão foi completada ou cancelada.
+    momento (datetime): Data e hora do registro. Se None, usa o momento atual.
+    tarefa (str): Tarefa ou projeto ao qual a sessão é atribuída (opcional).
+    **extras: Campos adicionais gravados na sessão.
+    """
+    sessao = _criar_sessao(tipo, duracao_minutos, completa, momento, tarefa, **extras)
+    
+    captura = getattr(_captura, 'lista', None)
+    if captura is not None:
+        captura.append(sessao)
+        return
+    
+    _iniciar_gravador()
+    _fila_gravacao.put(sessao)
+    _avisar_observadores(sessao)
+
+
+def observar_sessoes(funcao):
+    """
+    Registra uma função chamada com cada sessão registrada ou importada,
+    logo após entrar na fila de gravação. Sessões capturadas pela
+    simulação não são repassadas.
+    
+    Parâmetros:
+    funcao (callable): Recebe a sessão (dict); não deve modificá-la.
+    """
+    _observadores.append(funcao)
+
+
+def _avisar_observadores(sessao):
+    """Repassa a sessão aos observadores, sem deixar um erro interromper o timer."""
+    for funcao in _observadores:
+        try:
+            funcao(sessao)
+        except Exception as e:
+            print(f"⚠️  Erro ao processar sessão registrada: {e}")
+
+
+@contextmanager
+def capturar_sessoes():
+    """
+    Desvia as sessões registradas para uma lista em vez do arquivo.
+    Usado pela simulação para obter os registros sem tocar no histórico.
+    
+    Retorna:
+    list: Lista (preenchida durante o bloco) com as sessões registradas.
+    """
+    anterior = getattr(_captura, 'lista', None)
+    _captura.lista = []
+    try:
+        yield _captura.lista
+    finally:
+        _captura.lista = anterior
+
+
+def aguardar_gravacoes():
+    """
+    Bloqueia até que todas as sessões enfileiradas tenham sido gravadas.
+    
+    Retorna:
+    bool: True se todas as gravações desde a chamada anterior tiveram
+          sucesso, False se alguma falhou (a falha é informada uma vez).
+    """
+    global _falhas_gravacao
+    
+    if _gravador is not None:
+        _fila_gravacao.join()
+    with _trava_falhas:
+        falhas, _falhas_gravacao = _falhas_gravacao, 0
+    return not falhas
+
+
+def encerrar_gravador():
+    """
+    Grava as sessões pendentes e encerra a thread de gravação.
+    Registrada com atexit para garantir durabilidade no encerramento.
+    """
+    global _gravador
+    
+    with _trava_gravador:
+        gravador = _gravador
+        _gravador = None
+    
+    if gravador is not None and gravador.is_alive():
+        _fila_gravacao.put(_FIM_GRAVADOR)
+        gravador.join()
+
+
+atexit.register(encerrar_gravador)
+
+
+def importar_sessoes(sessoes):
+    """
+    Acrescenta ao histórico sessões já montadas (ex: vindas de outro
+    dispositivo) e aguarda a gravação. Passam pela mesma fila das sessões
+    registradas, então os agregados e o índice de tarefas são atualizados
+    de forma incremental. Ficam no fim do arquivo, mesmo se mais antigas:
+    as sessões recentes são mantidas em ordem cronológica, e as que trazem
+    'dispositivo' não entram na sequência de descansos e ciclos deste
+    dispositivo.
+    
+    Parâmetros:
+    sessoes (list): Sessões, na ordem em que devem ser acrescentadas.
+    
+    Retorna:
+    bool: True se gravou com sucesso, False caso contrário.
+    """
+    if not sessoes:
+        return True
+    _iniciar_gravador()
+    for sessao in sessoes:
+        _fila_gravacao.put(sessao)
+        _avisar_observadores(sessao)
+    return aguardar_gravacoes()
+
+
+def adicionar_sessao(tipo, duracao_minutos, completa=True):
+    """
+    Adiciona uma nova sessão ao histórico e aguarda a gravação.
+    
+    Parâmetros:
+    tipo (str): Tipo da sessão ('trabalho', 'descanso_curto', 'descanso_longo', 'personalizado', 'pomodoro_completo').
+    duracao_minutos (int): Duração da sessão em minutos.
+    completa (bool): Se a sessão foi completada ou cancelada.
+    
+    Retorna:
+    bool: True se adicionou com sucesso, False caso contrário.
+    """
+    registrar_sessao(tipo, duracao_minutos, completa)
+    return aguardar_gravacoes()
+
+
+# Tipos de sessão que contam como tempo de foco
+TIPOS_FOCO = ('trabalho', 'personalizado')
+
+
+def obter_segundos_ativos(sessao):
+    """
+    Retorna o tempo efetivamente cronometrado de uma sessão, sem pausas.
+    Sessões antigas, sem a medição, contam a duração configurada se
+    completas e zero se canceladas.
+    
+    Parâmetros:
+    sessao (dict): Sessão do histórico.
+    
+    Retorna:
+    float: Segundos ativos.
+    """
+    segundos = sessao.get('segundos_ativos')
+    if segundos is not None:
+        return segundos
+    return sessao.get('duracao_minutos', 0) * 60 if sessao.get('completa', True) else 0
+
+
+def novo_agregado():
+    """Cria um agregado de estatísticas vazio."""
+    return {
+        'total_sessoes': 0,
+        'sessoes_completas': 0,
+        'tempo_total_minutos': 0,
+        'tempo_trabalho_minutos': 0,
+        'pomodoros_completos': 0,
+        'segundos_foco': 0.0,
+        'por_data': {},
+        # Sessões de trabalho [completas, total] por duração e hora de início
+        'conclusao_trabalho': {},
+        # Sessões de trabalho [completas, total] pela duração do descanso curto anterior
+        'conclusao_apos_descanso': {},
+        'ultimo_descanso': None,
+        # Ciclo do último trabalho concluído no conjunto de pomodoros em
+        # andamento (0 após um descanso longo). Com ciclo_pendente, o trecho
+        # ainda não viu um ciclo conhecido e o valor é relativo ao trecho
+        # anterior (ver mesclar_agregados)
+        'ciclo_atual': 0,
+        'ciclo_pendente': False,
+        'recentes': deque(maxlen=TOTAL_SESSOES_RECENTES)
+    }
+
+
+def _novo_dia():
+    """Totais vazios de um dia: sessões, minutos completos, trabalhos completos e foco real."""
+    return {'sessoes': 0, 'minutos': 0, 'trabalhos': 0, 'segundos_foco': 0.0}
+
+
+def _hora_inicio(sessao):
+    """Hora do dia (0-23) em que a sessão começou, ou None se desconhecida."""
+    for campo in ('inicio', 'timestamp'):
+        valor = sessao.get(campo)
+        if isinstance(valor, str) and len(valor) >= 13 and valor[11:13].isdigit():
+            return int(valor[11:13])
+    hora = str(sessao.get('hora', ''))
+    return int(hora[:2]) if hora[:2].isdigit() else None
+
+
+def _sessao_importada(sessao):
+    """Sessões importadas de outro dispositivo trazem o campo 'dispositivo'."""
+    return 'dispositivo' in sessao
+
+
+def _momento_sessao(sessao):
+    """Chave cronológica de uma sessão (o timestamp ISO; vazio se ausente)."""
+    return str(sessao.get('timestamp') or '')
+
+
+def _inserir_recente(recentes, sessao):
+    """
+    Insere a sessão nas recentes em ordem cronológica, mantendo as mais
+    novas. Sessões com o mesmo instante ficam na ordem de chegada, então o
+    resultado não depende de como o histórico foi dividido (ver
+    mesclar_agregados).
+    """
+    momento = _momento_sessao(sessao)
+    if not recentes or momento >= _momento_sessao(recentes[-1]):
+        recentes.append(sessao)
+        return
+    if len(recentes) == recentes.maxlen:
+        if momento < _momento_sessao(recentes[0]):
+            return
+        recentes.popleft()
+    posicao = bisect.bisect_right([_momento_sessao(recente) for recente in recentes], momento)
+    recentes.insert(posicao, sessao)
+
+
+def _acumular_conclusao(agregado, sessao, tipo, duracao, completa):
+    """Atualiza os contadores de conclusão usados pelo recomendador."""
+    if tipo == 'trabalho':
+        hora = _hora_inicio(sessao)
+        if hora is not None and hora < 24:
+            horas = agregado['conclusao_trabalho'].setdefault(format(duracao, 'g'), [[0, 0] for _ in range(24)])
+            horas[hora][0] += completa
+            horas[hora][1] += 1
+    
+    # A sequência descanso -> trabalho é a deste dispositivo; sessões
+    # importadas chegam fora de ordem e não fazem parte dela
+    if _sessao_importada(sessao):
+        return
+    if tipo == 'trabalho':
+        descanso = agregado['ultimo_descanso']
+        if descanso is not None:
+            par = agregado['conclusao_apos_descanso'].setdefault(descanso, [0, 0])
+            par[0] += completa
+            par[1] += 1
+        agregado['ultimo_descanso'] = None
+    elif tipo == 'descanso_curto':
+        agregado['ultimo_descanso'] = format(duracao, 'g') if completa else None
+    elif tipo == 'descanso_longo':
+        agregado['ultimo_descanso'] = None
+
+
+def _acumular_ciclo(agregado, sessao, tipo, completa):
+    """Atualiza o ciclo do conjunto de pomodoros em andamento."""
+    # Os ciclos de outro dispositivo não avançam o conjunto deste
+    if _sessao_importada(sessao):
+        return
+    if tipo == 'trabalho' and completa:
+        ciclo = sessao.get('ciclo')
+        if isinstance(ciclo, int) and not isinstance(ciclo, bool) and ciclo > 0:
+            agregado['ciclo_atual'] = ciclo
+            agregado['ciclo_pendente'] = False
+        else:
+            # Sessões antigas, sem o ciclo gravado: conta a partir do anterior
+            agregado['ciclo_atual'] += 1
+    elif tipo == 'descanso_longo':
+        agregado['ciclo_atual'] = 0
+        agregado['ciclo_pendente'] = False
+
+
+def mesclar_agregados(anterior, posterior):
+    """
+    Combina os agregados de dois trechos consecutivos do histórico num novo
+    agregado. A operação é associativa, então trechos podem ser agregados
+    em paralelo e combinados em ordem. Um trecho agregado a partir de
+    ultimo_descanso=DESCANSO_PENDENTE guarda o seu primeiro trabalho em
+    conclusao_apos_descanso[DESCANSO_PENDENTE], até saber o descanso com
+    que o trecho anterior terminou; da mesma forma, com ciclo_pendente o
+    seu ciclo_atual é somado ao do trecho anterior.
+    
+    Parâmetros:
+    anterior (dict): Agregado do trecho anterior.
+    posterior (dict): Agregado do trecho seguinte.
+    
+    Retorna:
+    dict: Agregado dos dois trechos.
+    """
+    resultado = novo_agregado()
+    for campo in ('total_sessoes', 'sessoes_completas', 'tempo_total_minutos',
+                  'tempo_trabalho_minutos', 'pomodoros_completos', 'segundos_foco'):
+        resultado[campo] = anterior[campo] + posterior[campo]
+    
+    for agregado in (anterior, posterior):
+        for data, dia in agregado['por_data'].items():
+            destino = resultado['por_data'].setdefault(data, _novo_dia())
+            for chave in destino:
+                destino[chave] += dia.get(chave, 0)
+        for duracao, horas in agregado['conclusao_trabalho'].items():
+            destino = resultado['conclusao_trabalho'].setdefault(duracao, [[0, 0] for _ in range(24)])
+            for hora, (completas, total) in enumerate(horas):
+                destino[hora][0] += completas
+                destino[hora][1] += total
+    
+    resultado['recentes'].extend(anterior['recentes'])
+    for sessao in posterior['recentes']:
+        _inserir_recente(resultado['recentes'], sessao)
+    
+    conclusao = {descanso: list(par) for descanso, par in anterior['conclusao_apos_descanso'].items()}
+    for descanso, (completas, total) in posterior['conclusao_apos_descanso'].items():
+        if descanso == DESCANSO_PENDENTE:
+            descanso = anterior['ultimo_descanso']
+            if descanso is None:
+                continue
+        par = conclusao.setdefault(descanso, [0, 0])
+        par[0] += completas
+        par[1] += total
+    resultado['conclusao_apos_descanso'] = conclusao
+    
+    if posterior['ultimo_descanso'] == DESCANSO_PENDENTE:
+        resultado['ultimo_descanso'] = anterior['ultimo_descanso']
+    else:
+        resultado['ultimo_descanso'] = posterior['ultimo_descanso']
+    
+    if posterior['ciclo_pendente']:
+        resultado['ciclo_atual'] = anterior['ciclo_atual'] + posterior['ciclo_atual']
+        resultado['ciclo_pendente'] = anterior['ciclo_pendente']
+    else:
+        resultado['ciclo_atual'] = posterior['ciclo_atual']
+    return resultado
+
+
+def serializar_agregado(agregado):
+    """Converte um agregado em dados JSON."""
+    dados = dict(agregado)
+    dados['recentes'] = list(agregado['recentes'])
+    return dados
+
+
+def desserializar_agregado(dados):
+    """Reconstrói um agregado a partir dos dados JSON."""
+    agregado = novo_agregado()
+    agregado.update(dados)
+    agregado['recentes'] = deque(dados.get('recentes', []), maxlen=TOTAL_SESSOES_RECENTES)
+    return agregado
+
+
+def acumular_sessao(agregado, sessao):
+    """
+    Soma uma sessão ao agregado de estatísticas.
+    
+    Parâmetros:
+    agregado (dict): Agregado criado por novo_agregado.
+    sessao (dict): Sessão do histórico.
+    """
+    completa = sessao.get('completa', True)
+    duracao = sessao.get('duracao_minutos', 0)
+    tipo = sessao.get('tipo')
+    
+    agregado['total_sessoes'] += 1
+    if completa:
+        agregado['sessoes_completas'] += 1
+        agregado['tempo_total_minutos'] += duracao
+        if tipo in TIPOS_FOCO:
+            agregado['tempo_trabalho_minutos'] += duracao
+        if tipo == 'pomodoro_completo':
+            agregado['pomodoros_completos'] += 1
+    
+    dia = agregado['por_data'].setdefault(sessao.get('data'), _novo_dia())
+    dia['sessoes'] += 1
+    if completa:
+        dia['minutos'] += duracao
+        if tipo == 'trabalho':
+            dia['trabalhos'] += 1
+    
+    # Tempo real de foco, inclusive de sessões interrompidas
+    if tipo in TIPOS_FOCO:
+        segundos = obter_segundos_ativos(sessao)
+        agregado['segundos_foco'] += segundos
+        dia['segundos_foco'] += segundos
+    
+    _acumular_conclusao(agregado, sessao, tipo, duracao, bool(completa))
+    _acumular_ciclo(agregado, sessao, tipo, completa)
+    _inserir_recente(agregado['recentes'], sessao)
+
+
+def _assinatura_historico():
+    """Identifica a versão do arquivo em disco pelo tamanho e data de modificação."""
+    try:
+        info = os.stat(HISTORICO_FILE)
+        return (info.st_size, info.st_mtime_ns)
+    except OSError:
+        return None
+
+
+def _ler_rollups(assinatura):
+    """
+    Lê o agregado persistido, se corresponde à versão do histórico em disco.
+    
+    Retorna:
+    dict | None: Agregado, ou None se ausente, antigo ou inválido.
+    """
+    if assinatura is None:
+        return None
+    try:
+        with open(ROLLUPS_FILE, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        if dados.get('versao') != VERSAO_ROLLUPS or tuple(dados.get('assinatura') or ()) != assinatura:
+            return None
+        return desserializar_agregado(dados['agregado'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _salvar_rollups(agregado, assinatura):
+    """Grava o agregado com a assinatura do histórico, de forma atômica."""
+    temporario = ROLLUPS_FILE + '.tmp'
+    try:
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({
+                'versao': VERSAO_ROLLUPS,
+                'assinatura': assinatura,
+                'agregado': serializar_agregado(agregado)
+            }, f, ensure_ascii=False)
+        os.replace(temporario, ROLLUPS_FILE)
+    except OSError as e:
+        print(f"⚠️  Erro ao salvar agregados: {e}")
+
+
+def _atualizar_agregado(sessoes, assinatura_anterior):
+    """
+    Soma sessões recém-gravadas ao agregado e persiste os rollups.
+    Chamada pelo gravador com o arquivo travado. Se o agregado ainda não
+    foi semeado neste processo, ou se outro processo gravou desde então,
+    parte dos rollups em disco.
+    """
+    global _agregado, _assinatura_arquivo, _versao
+    
+    with _trava_agregado:
+        if _agregado is None or _assinatura_arquivo != assinatura_anterior:
+            # Sem rollups atualizados, o agregado será semeado de novo
+            _agregado = _ler_rollups(assinatura_anterior)
+            _assinatura_arquivo = assinatura_anterior
+        
+        if _agregado is not None:
+            for sessao in sessoes:
+                acumular_sessao(_agregado, sessao)
+            _assinatura_arquivo = _assinatura_historico()
+            _salvar_rollups(_agregado, _assinatura_arquivo)
+        _versao += 1
+
+
+def _invalidar_agregado():
+    """Descarta o agregado em memória; será semeado de novo na próxima leitura."""
+    global _agregado, _versao
+    
+    with _trava_agregado:
+        _agregado = None
+        _versao += 1
+
+
+def obter_agregado():
+    """
+    Retorna o agregado de estatísticas em memória.
+    Na primeira chamada, ou quando o arquivo foi alterado por outro
+    processo, parte dos rollups persistidos; só percorre o histórico se
+    eles não correspondem ao arquivo em disco.
+    
+    Retorna:
+    dict: Agregado de estatísticas (não deve ser modificado).
+    """
+    global _agregado, _assinatura_arquivo, _versao
+    
+    aguardar_gravacoes()
+    # Mesma ordem de travas do gravador (arquivo, depois agregado)
+    with _travar_arquivo(), _trava_agregado:
+        assinatura = _assinatura_historico()
+        if _agregado is None or assinatura != _assinatura_arquivo:
+            agregado = _ler_rollups(assinatura)
+            if agregado is None:
+                agregado = novo_agregado()
+                for sessao in _iterar_arquivo(HISTORICO_FILE):
+                    acumular_sessao(agregado, sessao)
+                if assinatura is not None:
+                    _salvar_rollups(agregado, assinatura)
+            if _agregado is not None:
+                _versao += 1
+            _agregado = agregado
+            _assinatura_arquivo = assinatura
+        return _agregado
+
+
+def obter_versao_historico():
+    """
+    Retorna um contador que muda sempre que o histórico muda.
+    Permite que telas só sejam redesenhadas quando há dados novos.
+    
+    Retorna:
+    int: Versão atual do histórico.
+    """
+    obter_agregado()
+    return _versao
+
+
+def resumir_agregado(agregado, hoje=None):
+    """
+    Converte um agregado no dicionário de estatísticas exibido ao usuário.
+    
+    Parâmetros:
+    agregado (dict): Agregado criado por novo_agregado.
+    hoje (str): Data 'YYYY-MM-DD' usada nas estatísticas do dia. Se None, usa a data atual.
     
     Retorna:
     dict: Dicionário com estatísticas do histórico.
     """
-    historico = carregar_historico()
-    
-    if not historico:
-        return {
-            'total_sessoes': 0,
-            'sessoes_completas': 0,
-            'sessoes_canceladas': 0,
-            'tempo_total_minutos': 0,
-            'tempo_trabalho_minutos': 0,
-            'pomodoros_completos': 0,
-            'sessoes_hoje': 0,
-            'tempo_hoje_minutos': 0
-        }
-    
-    hoje = datetime.now().strftime('%Y-%m-%d')
-    
-    total_sessoes = len(historico)
-    sessoes_completas = sum(1 for s in historico if s.get('completa', True))
-    sessoes_canceladas = total_sessoes - sessoes_completas
-    tempo_total_minutos = sum(s.get('duracao_minutos', 0) for s in historico if s.get('completa', True))
-    tempo_trabalho_minutos = sum(
-        s.get('duracao_minutos', 0) 
-        for s in historico 
-        if s.get('completa', True) and s.get('tipo') in ['trabalho', 'personalizado']
-    )
-    pomodoros_completos = sum(1 for s in historico if s.get('tipo') == 'pomodoro_completo' and s.get('completa', True))
+    hoje = hoje or datetime.now().strftime('%Y-%m-%d')
+    dia = agregado['por_data'].get(hoje, _novo_dia())
     
-    sessoes_hoje = sum(1 for s in historico if s.get('data') == hoje)
-    tempo_hoje_minutos = sum(
-        s.get('duracao_minutos', 0) 
-        for s in historico 
-        if s.get('data') == hoje and s.get('completa', True)
-    )
+    return {
+        'total_sessoes': agregado['total_sessoes'],
+        'sessoes_completas': agregado['sessoes_completas'],
+        'sessoes_canceladas': agregado['total_sessoes'] - agregado['sessoes_completas'],
+        'tempo_total_minutos': agregado['tempo_total_minutos'],
+        'tempo_trabalho_minutos': agregado['tempo_trabalho_minutos'],
+        'pomodoros_completos': agregado['pomodoros_completos'],
+        'tempo_foco_minutos': agregado['segundos_foco'] / 60,
+        'sessoes_hoje': dia['sessoes'],
+        'tempo_hoje_minutos': dia['minutos'],
+        'tempo_foco_hoje_minutos': dia['segundos_foco'] / 60
+    }
+
+
+def obter_proximo_ciclo(ciclos):
+    """
+    Retorna o ciclo do próximo trabalho no conjunto de pomodoros, que
+    continua entre execuções, reinícios e dias até um descanso longo.
+    Só lê o contador do agregado em memória, sem percorrer o histórico.
+    
+    Parâmetros:
+    ciclos (int): Trabalhos por conjunto (configuração 'ciclos').
+    
+    Retorna:
+    int: Ciclo de 1 a `ciclos`; ao completar o conjunto, recomeça do 1.
+    """
+    ultimo = obter_agregado()['ciclo_atual']
+    return ultimo + 1 if ultimo < ciclos else 1
+
+
+def obter_estatisticas():
+    """
+    Calcula estatísticas gerais do histórico.
     
+    Retorna:
+    dict: Dicionário com estatísticas do histórico.
+    """
+    return resumir_agregado(obter_agregado())
+
+
+def _novo_indice_tarefas():
+    """Cria um índice de tarefas vazio."""
     return {
-        'total_sessoes': total_sessoes,
-        'sessoes_completas': sessoes_completas,
-        'sessoes_canceladas': sessoes_canceladas,
-        'tempo_total_minutos': tempo_total_minutos,
-        'tempo_trabalho_minutos': tempo_trabalho_minutos,
-        'pomodoros_completos': pomodoros_completos,
-        'sessoes_hoje': sessoes_hoje,
-        'tempo_hoje_minutos': tempo_hoje_minutos
+        'versao': VERSAO_INDICE_TAREFAS, 'assinatura': None, 'total_sessoes': 0,
+        'nomes': [], 'sessoes': [], 'meses': [], 'ids': {}
     }
 
 
+def _indexar_sessao(indice, sessao, posicao):
+    """Soma uma sessão ao índice de tarefas, se ela tiver tarefa."""
+    tarefa = sessao.get('tarefa')
+    if not tarefa:
+        return
+    
+    # Cada nome é guardado uma única vez; as sessões apontam para o id
+    id_tarefa = indice['ids'].get(tarefa)
+    if id_tarefa is None:
+        id_tarefa = len(indice['nomes'])
+        indice['ids'][tarefa] = id_tarefa
+        indice['nomes'].append(tarefa)
+        indice['sessoes'].append([])
+        indice['meses'].append({})
+    
+    indice['sessoes'][id_tarefa].append(posicao)
+    mes = indice['meses'][id_tarefa].setdefault(str(sessao.get('data', ''))[:7], {'sessoes': 0, 'minutos': 0})
+    mes['sessoes'] += 1
+    mes['minutos'] = round(mes['minutos'] + obter_segundos_ativos(sessao) / 60, 3)
+
+
+def _reconstruir_indice_tarefas(sessoes, assinatura):
+    """Monta o índice de tarefas percorrendo as sessões uma vez."""
+    indice = _novo_indice_tarefas()
+    for sessao in sessoes:
+        _indexar_sessao(indice, sessao, indice['total_sessoes'])
+        indice['total_sessoes'] += 1
+    indice['assinatura'] = assinatura
+    return indice
+
+
+def _ler_indice_tarefas():
+    """Lê o índice de tarefas do disco, ou None se ausente ou inválido."""
+    try:
+        with open(TAREFAS_FILE, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        if dados.get('versao') != VERSAO_INDICE_TAREFAS:
+            return None
+        indice = _novo_indice_tarefas()
+        indice.update(
+            assinatura=tuple(dados['assinatura']) if dados.get('assinatura') else None,
+            total_sessoes=dados['total_sessoes'],
+            nomes=dados['nomes'],
+            sessoes=dados['sessoes'],
+            meses=dados['meses']
+        )
+        indice['ids'] = {nome: id_tarefa for id_tarefa, nome in enumerate(indice['nomes'])}
+        return indice
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _salvar_indice_tarefas(indice):
+    """Grava o índice de tarefas de forma atômica (sem o mapa nome -> id)."""
+    temporario = TAREFAS_FILE + '.tmp'
+    try:
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({chave: valor for chave, valor in indice.items() if chave != 'ids'}, f, ensure_ascii=False)
+        os.replace(temporario, TAREFAS_FILE)
+    except OSError as e:
+        print(f"⚠️  Erro ao salvar índice de tarefas: {e}")
+
+
+def _atualizar_indice_tarefas(sessoes, assinatura_anterior):
+    """
+    Soma ao índice as sessões recém-gravadas no fim do histórico.
+    Chamada pelo gravador com o arquivo travado; se nem o índice em memória
+    nem o do disco correspondem ao arquivo anterior à gravação, é
+    reconstruído percorrendo o histórico.
+    """
+    global _indice_tarefas
+    
+    indice = _indice_tarefas
+    if indice is None or indice['assinatura'] != assinatura_anterior:
+        indice = _ler_indice_tarefas()
+    assinatura = _assinatura_historico()
+    if indice is None or indice['assinatura'] != assinatura_anterior:
+        indice = _reconstruir_indice_tarefas(_iterar_arquivo(HISTORICO_FILE), assinatura)
+    else:
+        for sessao in sessoes:
+            _indexar_sessao(indice, sessao, indice['total_sessoes'])
+            indice['total_sessoes'] += 1
+        indice['assinatura'] = assinatura
+    
+    _indice_tarefas = indice
+    _salvar_indice_tarefas(indice)
+
+
+def obter_indice_tarefas():
+    """
+    Retorna o índice de tarefas, reconstruindo-o apenas se o histórico foi
+    alterado fora deste processo.
+    
+    Retorna:
+    dict: Índice com 'nomes', 'sessoes' (posições por id) e 'meses'
+          ({'YYYY-MM': {'sessoes', 'minutos'}} por id). Não deve ser modificado.
+    """
+    global _indice_tarefas
+    
+    aguardar_gravacoes()
+    with _travar_arquivo():
+        assinatura = _assinatura_historico()
+        indice = _indice_tarefas
+        if indice is None or indice['assinatura'] != assinatura:
+            indice = _ler_indice_tarefas()
+        if indice is None or indice['assinatura'] != assinatura:
+            indice = _reconstruir_indice_tarefas(_iterar_arquivo(HISTORICO_FILE), assinatura)
+            _salvar_indice_tarefas(indice)
+        _indice_tarefas = indice
+        return indice
+
+
+def obter_tempo_tarefa(tarefa, mes=None):
+    """
+    Retorna o tempo dedicado a uma tarefa num mês, sem percorrer o histórico.
+    
+    Parâmetros:
+    tarefa (str): Nome da tarefa.
+    mes (str): Mês no formato 'YYYY-MM'. Se None, usa o mês atual.
+    
+    Retorna:
+    dict: {'sessoes': int, 'minutos': float}.
+    """
+    mes = mes or datetime.now().strftime('%Y-%m')
+    indice = obter_indice_tarefas()
+    id_tarefa = indice['ids'].get(normalizar_tarefa(tarefa))
+    if id_tarefa is None:
+        return {'sessoes': 0, 'minutos': 0}
+    return dict(indice['meses'][id_tarefa].get(mes, {'sessoes': 0, 'minutos': 0}))
+
+
+def obter_tempo_por_tarefa(mes=None):
+    """
+    Retorna o tempo de todas as tarefas num mês, da maior para a menor.
+    
+    Parâmetros:
+    mes (str): Mês no formato 'YYYY-MM'. Se None, usa o mês atual.
+    
+    Retorna:
+    list: Pares (tarefa, {'sessoes', 'minutos'}).
+    """
+    mes = mes or datetime.now().strftime('%Y-%m')
+    indice = obter_indice_tarefas()
+    tempos = [
+        (nome, dict(meses[mes]))
+        for nome, meses in zip(indice['nomes'], indice['meses']) if mes in meses
+    ]
+    return sorted(tempos, key=lambda item: item[1]['minutos'], reverse=True)
+
+
+def obter_sessoes_tarefa(tarefa):
+    """
+    Retorna as sessões de uma tarefa, pelas posições guardadas no índice.
+    
+    Parâmetros:
+    tarefa (str): Nome da tarefa.
+    
+    Retorna:
+    list: Sessões da tarefa, em ordem cronológica.
+    """
+    indice = obter_indice_tarefas()
+    id_tarefa = indice['ids'].get(normalizar_tarefa(tarefa))
+    if id_tarefa is None:
+        return []
+    posicoes = set(indice['sessoes'][id_tarefa])
+    ultima = max(posicoes, default=-1)
+    sessoes = []
+    for posicao, sessao in enumerate(iterar_historico()):
+        if posicao > ultima:
+            break
+        if posicao in posicoes:
+            sessoes.append(sessao)
+    return sessoes
+
+
 def obter_sessoes_recentes(limite=10):
     """
     Retorna as sessões mais recentes do histórico.
@@ -140,10 +1198,15 @@ def obter_sessoes_recentes(limite=10):
     limite (int): Número máximo de sessões a retornar.
     
     Retorna:
-    list: Lista com as sessões mais recentes.
+    list: Lista com as sessões mais recentes, em ordem cronológica.
     """
-    historico = carregar_historico()
-    return historico[-limite:] if historico else []
+    if limite <= TOTAL_SESSOES_RECENTES:
+        return list(obter_agregado()['recentes'])[-limite:]
+    
+    recentes = deque(maxlen=limite)
+    for sessao in iterar_historico():
+        _inserir_recente(recentes, sessao)
+    return list(recentes)
 
 
 def obter_sessoes_por_data(data=None):
@@ -159,8 +1222,7 @@ def obter_sessoes_por_data(data=None):
     if data is None:
         data = datetime.now().strftime('%Y-%m-%d')
     
-    historico = carregar_historico()
-    return [s for s in historico if s.get('data') == data]
+    return [s for s in iterar_historico() if s.get('data') == data]
 
 
 def limpar_historico():
@@ -170,9 +1232,16 @@ def limpar_historico():
     Retorna:
     bool: True se limpou com sucesso, False caso contrário.
     """
+    global _indice_tarefas
+    
+    aguardar_gravacoes()
     try:
-        if os.path.exists(HISTORICO_FILE):
-            os.remove(HISTORICO_FILE)
+        with _travar_arquivo():
+            for arquivo in (HISTORICO_FILE, TAREFAS_FILE, ROLLUPS_FILE):
+                if os.path.exists(arquivo):
+                    os.remove(arquivo)
+            _indice_tarefas = None
+        _invalidar_agregado()
         return True
     except Exception as e:
         print(f"❌ Erro ao limpar histórico: {e}")
@@ -184,21 +1253,23 @@ def formatar_duracao(minutos):
     Formata a duração em minutos para uma string legível.
     
     Parâmetros:
-    minutos (int): Duração em minutos.
+    minutos (float): Duração em minutos (aceita frações).
     
     Retorna:
-    str: Duração formatada (ex: "2h 30min" ou "45min").
+    str: Duração formatada (ex: "2h 30min", "45min" ou "1min 30s").
     """
-    if minutos < 60:
-        return f"{minutos}min"
-    
-    horas = minutos // 60
-    mins = minutos % 60
+    horas, segundos = divmod(round(minutos * 60), 3600)
+    mins, segs = divmod(segundos, 60)
     
-    if mins == 0:
-        return f"{horas}h"
+    partes = []
+    if horas:
+        partes.append(f"{horas}h")
+    if mins or (not horas and not segs):
+        partes.append(f"{mins}min")
+    if segs:
+        partes.append(f"{segs}s")
     
-    return f"{horas}h {mins}min"
+    return " ".join(partes)
 
 
 def traduzir_tipo(tipo):
@@ -0,0 +1,331 @@
+"""
+Módulo de hooks - Executa scripts e funções do usuário nos eventos do timer
+
+Eventos disponíveis: on_start, on_tick, on_complete e on_cancel.
+Os hooks rodam num pool de threads próprio, com timeout por hook e
+isolamento de falhas, para que nenhuma integração lenta bloqueie o timer.
+Scripts que passam do timeout são encerrados junto com os processos que
+iniciaram; funções Python não podem ser interrompidas, então cada chamada
+roda numa thread própria que o pool abandona ao estourar o timeout.
+"""
+
+import importlib
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+
+
+# Eventos do ciclo de vida de um timer
+EVENTOS = ('on_start', 'on_tick', 'on_complete', 'on_cancel')
+
+# Eventos que encerram um timer: nunca são descartados, mesmo com o hook
+# ainda rodando
+EVENTOS_FINAIS = ('on_complete', 'on_cancel')
+
+# Timeout padrão de cada hook, em segundos
+TIMEOUT_PADRAO = 5
+
+# Número de threads do pool de execução
+TOTAL_TRABALHADORES = 4
+
+_hooks_registrados = {evento: [] for evento in EVENTOS}
+_hooks_config = {evento: [] for evento in EVENTOS}
+_assinatura_config = None
+
+_fila = queue.Queue()
+_trabalhadores = []
+# Execuções pendentes ou em andamento de cada hook (id -> quantidade)
+_em_execucao = {}
+_latencias = {}
+_trava = threading.Lock()
+
+
+def _criar_hook(alvo, timeout=None, nome=None):
+    """
+    Monta a descrição de um hook.
+
+    Parâmetros:
+    alvo (callable | str): Função Python ou comando de shell.
+    timeout (float): Tempo máximo de execução em segundos.
+    nome (str): Nome usado nas métricas de latência.
+
+    Retorna:
+    dict: Descrição do hook.
+    """
+    if nome is None:
+        nome = getattr(alvo, '__name__', None) if callable(alvo) else str(alvo)
+    return {
+        'nome': nome,
+        'alvo': alvo,
+        'timeout': timeout if timeout is not None else TIMEOUT_PADRAO
+    }
+
+
+def _resolver_alvo(alvo):
+    """
+    Converte entradas de configuração no formato 'python:modulo:funcao'
+    na função correspondente. Outras strings são tratadas como comandos.
+    """
+    if isinstance(alvo, str) and alvo.startswith('python:'):
+        modulo, _, funcao = alvo[len('python:'):].partition(':')
+        return getattr(importlib.import_module(modulo), funcao)
+    return alvo
+
+
+def registrar_hook(evento, alvo, timeout=None, nome=None):
+    """
+    Registra um hook para um evento do timer.
+
+    Parâmetros:
+    evento (str): Um dos EVENTOS.
+    alvo (callable | str): Função chamada com (evento, dados) ou comando de shell.
+    timeout (float): Tempo máximo de execução em segundos.
+    nome (str): Nome usado nas métricas de latência.
+    """
+    if evento not in EVENTOS:
+        raise ValueError(f"Evento desconhecido: {evento}")
+    with _trava:
+        _hooks_registrados[evento].append(_criar_hook(alvo, timeout, nome))
+
+
+def remover_hooks(evento=None):
+    """
+    Remove os hooks registrados programaticamente.
+
+    Parâmetros:
+    evento (str): Evento a limpar. Se None, limpa todos.
+    """
+    with _trava:
+        for chave in (EVENTOS if evento is None else (evento,)):
+            _hooks_registrados[chave] = []
+
+
+def configurar_hooks(config):
+    """
+    Carrega os hooks definidos na chave 'hooks' da configuração.
+    Só recarrega quando a configuração de hooks muda.
+
+    Parâmetros:
+    config (dict): Configurações carregadas.
+    """
+    global _assinatura_config
+
+    hooks = config.get('hooks') or {}
+    timeout = config.get('hooks_timeout_segundos', TIMEOUT_PADRAO)
+    assinatura = repr((hooks, timeout))
+    if assinatura == _assinatura_config:
+        return
+
+    novos = {evento: [] for evento in EVENTOS}
+    for evento, alvos in hooks.items():
+        if evento not in EVENTOS:
+            print(f"⚠️  Evento de hook desconhecido: {evento}")
+            continue
+        if isinstance(alvos, str):
+            alvos = [alvos]
+        for alvo in alvos:
+            try:
+                novos[evento].append(_criar_hook(_resolver_alvo(alvo), timeout, nome=str(alvo)))
+            except Exception as e:
+                print(f"⚠️  Erro ao carregar hook {alvo}: {e}")
+
+    with _trava:
+        _hooks_config.update(novos)
+        _assinatura_config = assinatura
+
+
+def _variaveis_ambiente(evento, dados):
+    """Monta as variáveis de ambiente passadas aos scripts."""
+    env = os.environ.copy()
+    env['POMO_EVENTO'] = evento
+    for chave, valor in dados.items():
+        env[f"POMO_{chave.upper()}"] = '' if valor is None else str(valor)
+    return env
+
+
+def _registrar_latencia(nome, segundos, resultado):
+    """Atualiza as métricas de latência de um hook."""
+    with _trava:
+        metricas = _latencias.setdefault(nome, {
+            'execucoes': 0,
+            'falhas': 0,
+            'timeouts': 0,
+            'ignorados': 0,
+            'ultima_ms': 0.0,
+            'max_ms': 0.0,
+            'total_ms': 0.0
+        })
+        if resultado == 'ignorado':
+            metricas['ignorados'] += 1
+            return
+        ms = segundos * 1000
+        metricas['execucoes'] += 1
+        metricas['ultima_ms'] = ms
+        metricas['max_ms'] = max(metricas['max_ms'], ms)
+        metricas['total_ms'] += ms
+        if resultado == 'falha':
+            metricas['falhas'] += 1
+        elif resultado == 'timeout':
+            metricas['timeouts'] += 1
+
+
+def _liberar_hook(hook):
+    """Marca o fim de uma execução do hook."""
+    with _trava:
+        restantes = _em_execucao.get(id(hook), 0) - 1
+        if restantes > 0:
+            _em_execucao[id(hook)] = restantes
+        else:
+            _em_execucao.pop(id(hook), None)
+
+
+def _chamar_funcao(hook, evento, dados):
+    """
+    Chama um hook Python numa thread própria e espera até o timeout. Se a
+    função não terminar a tempo, a thread é abandonada (continua marcada
+    como em execução até terminar) e o trabalhador do pool fica livre.
+
+    Retorna:
+    str: 'ok', 'falha' ou 'timeout'.
+    """
+    terminou = threading.Event()
+    erros = []
+
+    def executar():
+        try:
+            hook['alvo'](evento, dados)
+        except Exception as e:
+            erros.append(e)
+        finally:
+            terminou.set()
+            _liberar_hook(hook)
+
+    threading.Thread(target=executar, name=f"pomo-hook-{hook['nome']}", daemon=True).start()
+    if not terminou.wait(hook['timeout']):
+        return 'timeout'
+    return 'falha' if erros else 'ok'
+
+
+def _executar_script(hook, evento, dados):
+    """
+    Executa um hook de script num grupo de processos próprio. No timeout o
+    grupo inteiro é encerrado: matar só o shell deixaria rodando os
+    processos que o script iniciou.
+
+    Retorna:
+    str: 'ok', 'falha' ou 'timeout'.
+    """
+    posix = os.name == 'posix'
+    processo = subprocess.Popen(
+        hook['alvo'],
+        shell=True,
+        env=_variaveis_ambiente(evento, dados),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=posix
+    )
+    try:
+        codigo = processo.wait(timeout=hook['timeout'])
+    except subprocess.TimeoutExpired:
+        if posix:
+            try:
+                os.killpg(processo.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        else:
+            processo.kill()
+        processo.wait()
+        return 'timeout'
+    return 'ok' if codigo == 0 else 'falha'
+
+
+def _executar_hook(hook, evento, dados):
+    """Executa um hook, isolando falhas e medindo a latência."""
+    inicio = time.perf_counter()
+    resultado = 'ok'
+    funcao = callable(hook['alvo'])
+    try:
+        if funcao:
+            resultado = _chamar_funcao(hook, evento, dados)
+        else:
+            resultado = _executar_script(hook, evento, dados)
+    except Exception:
+        resultado = 'falha'
+    finally:
+        # A thread de uma função libera o hook quando ela termina de fato
+        if not funcao:
+            _liberar_hook(hook)
+    _registrar_latencia(hook['nome'], time.perf_counter() - inicio, resultado)
+
+
+def _laco_trabalhador():
+    """Laço de uma thread do pool de hooks."""
+    while True:
+        hook, evento, dados = _fila.get()
+        _executar_hook(hook, evento, dados)
+
+
+def _iniciar_trabalhadores():
+    """Inicia o pool de threads, se ainda não estiver rodando."""
+    if _trabalhadores:
+        return
+    for i in range(TOTAL_TRABALHADORES):
+        trabalhador = threading.Thread(
+            target=_laco_trabalhador,
+            name=f'pomo-hook-{i}',
+            daemon=True
+        )
+        trabalhador.start()
+        _trabalhadores.append(trabalhador)
+
+
+def disparar_evento(evento, **dados):
+    """
+    Dispara um evento para os hooks registrados sem esperar por eles.
+    Um hook que ainda está rodando não é enfileirado de novo para on_start
+    e on_tick, para que hooks lentos não se acumulem; os eventos finais
+    (EVENTOS_FINAIS) são sempre entregues.
+
+    Parâmetros:
+    evento (str): Um dos EVENTOS.
+    **dados: Informações do evento (tipo, duração, tempo restante...).
+    """
+    with _trava:
+        hooks = _hooks_registrados[evento] + _hooks_config[evento]
+        if not hooks:
+            return
+        pendentes = []
+        for hook in hooks:
+            if id(hook) in _em_execucao and evento not in EVENTOS_FINAIS:
+                pendentes.append((hook, False))
+            else:
+                _em_execucao[id(hook)] = _em_execucao.get(id(hook), 0) + 1
+                pendentes.append((hook, True))
+        _iniciar_trabalhadores()
+
+    for hook, enfileirar in pendentes:
+        if enfileirar:
+            _fila.put((hook, evento, dict(dados)))
+        else:
+            _registrar_latencia(hook['nome'], 0, 'ignorado')
+
+
+def obter_latencias():
+    """
+    Retorna as métricas de latência de cada hook executado.
+
+    Retorna:
+    dict: Métricas por nome de hook (execuções, falhas, timeouts,
+          ignorados, última, máxima e média em milissegundos).
+    """
+    with _trava:
+        resultado = {}
+        for nome, metricas in _latencias.items():
+            copia = dict(metricas)
+            total = copia.pop('total_ms')
+            copia['media_ms'] = total / copia['execucoes'] if copia['execucoes'] else 0.0
+            resultado[nome] = copia
+        return resultado
@@ -2,14 +2,32 @@
 Módulo de interface de usuário - Menus e exibições
 """
 
+from datetime import datetime
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt, Confirm
 from rich import box
 from rich.text import Text
-from config import carregar_configuracoes, obter_caminho_config
-from historico import obter_estatisticas, obter_sessoes_recentes, obter_sessoes_por_data, formatar_duracao, traduzir_tipo
+from config import (
+    carregar_configuracoes,
+    obter_caminho_config,
+    obter_versao_configuracoes,
+    campos_editaveis,
+    formatar_valor
+)
+from cache_render import imprimir_cacheado
+from hooks import obter_latencias
+from metas import configurar_metas, metas_ativas, obter_progresso
+from historico import (
+    obter_estatisticas,
+    obter_versao_historico,
+    obter_sessoes_recentes,
+    obter_sessoes_por_data,
+    obter_tempo_por_tarefa,
+    formatar_duracao,
+    traduzir_tipo
+)
 
 console = Console()
 
@@ -19,10 +37,8 @@ def limpar_tela():
     console.clear()
 
 
-def exibir_menu_principal():
-    """Exibe o menu principal da aplicação."""
-    limpar_tela()
-    
+def _tela_menu_principal():
+    """Monta o painel do menu principal."""
     title = Text("🍅 POMO CLI - Timer Pomodoro", style="bold red")
     
     menu_text = """[bold cyan][1][/] Iniciar sessão Pomodoro
@@ -33,47 +49,76 @@ def exibir_menu_principal():
 [bold cyan][6][/] Ver estatísticas
 [bold cyan][7][/] Ver histórico
 [bold cyan][8][/] Sobre
+[bold cyan][9][/] Dashboard
 [bold cyan][0][/] Sair"""
     
-    panel = Panel(
+    return Panel(
         menu_text,
         title=title,
         border_style="red",
         box=box.ROUNDED,
         padding=(1, 2)
     )
-    
-    console.print(panel)
-    console.print()
 
 
-def exibir_configuracoes():
-    """Exibe as configurações atuais do timer."""
+def exibir_menu_principal():
+    """Exibe o menu principal da aplicação."""
     limpar_tela()
+    imprimir_cacheado(console, 'menu_principal', _tela_menu_principal)
+    console.print()
+
+
+def _tela_configuracoes():
+    """Monta a tabela com as configurações atuais."""
     config = carregar_configuracoes()
     
     table = Table(title="⚙️  Configurações", box=box.ROUNDED, border_style="cyan")
     table.add_column("Configuração", style="cyan")
     table.add_column("Valor", style="green", justify="right")
     
-    table.add_row("Tempo de trabalho", f"{config['tempo_trabalho']} minutos")
-    table.add_row("Descanso curto", f"{config['descanso_curto']} minutos")
-    table.add_row("Descanso longo", f"{config['descanso_longo']} minutos")
-    table.add_row("Ciclos", str(config['ciclos']))
-    table.add_row("Som habilitado", "Sim" if config.get('som_habilitado', True) else "Não")
-    table.add_row("Auto-iniciar descanso", "Sim" if config.get('auto_iniciar_descanso', False) else "Não")
-    table.add_row("Notificações", "Sim" if config.get('notificacoes_habilitadas', True) else "Não")
+    for chave, campo in campos_editaveis():
+        table.add_row(campo['rotulo'], formatar_valor(chave, config[chave]))
     table.add_row("Arquivo", obter_caminho_config())
-    
-    console.print(table)
+    return table
+
+
+def _tabela_hooks(latencias):
+    """Monta a tabela com as métricas dos hooks executados."""
+    table = Table(title="🪝 Hooks nesta execução", box=box.ROUNDED, border_style="cyan")
+    table.add_column("Hook", style="cyan")
+    table.add_column("Execuções", justify="right")
+    table.add_column("Falhas", justify="right", style="red")
+    table.add_column("Timeouts", justify="right", style="yellow")
+    table.add_column("Ignorados", justify="right", style="dim")
+    table.add_column("Média / máx.", justify="right", style="green")
+
+    for nome, metricas in sorted(latencias.items()):
+        table.add_row(
+            nome,
+            str(metricas['execucoes']),
+            str(metricas['falhas']),
+            str(metricas['timeouts']),
+            str(metricas['ignorados']),
+            f"{metricas['media_ms']:.0f} / {metricas['max_ms']:.0f} ms"
+        )
+    return table
+
+
+def exibir_configuracoes():
+    """Exibe as configurações atuais do timer e as métricas dos hooks."""
+    limpar_tela()
+    imprimir_cacheado(console, 'configuracoes', _tela_configuracoes, obter_versao_configuracoes())
     console.print()
+    # As métricas mudam a cada evento, então a tabela não entra no cache
+    latencias = obter_latencias()
+    if latencias:
+        console.print(_tabela_hooks(latencias))
+        console.print()
     Prompt.ask("[dim]Pressione ENTER para voltar[/dim]", default="")
 
 
-def exibir_sobre():
-    """Exibe informações sobre a aplicação."""
-    limpar_tela()
-    
+def _tela_sobre():
+    """Monta o painel com informações sobre a aplicação."""
     sobre_text = """[bold red]🍅 Pomo CLI - Timer Pomodoro[/]
 [cyan]Versão: 1.0.0[/]
 
@@ -85,22 +130,25 @@ intervalos de descanso.
 [yellow]📝 Desenvolvido por:[/] rafastos
 [yellow]📅 Data:[/] 12 de novembro de 2025"""
     
-    panel = Panel(
+    return Panel(
         sobre_text,
         title="Sobre",
         border_style="blue",
         box=box.DOUBLE,
         padding=(1, 2)
     )
-    
-    console.print(panel)
+
+
+def exibir_sobre():
+    """Exibe informações sobre a aplicação."""
+    limpar_tela()
+    imprimir_cacheado(console, 'sobre', _tela_sobre)
     console.print()
     Prompt.ask("[dim]Pressione ENTER para voltar[/dim]", default="")
 
 
-def exibir_estatisticas():
-    """Exibe estatísticas gerais do histórico."""
-    limpar_tela()
+def _tela_estatisticas():
+    """Monta a tabela de estatísticas gerais do histórico."""
     stats = obter_estatisticas()
     
     table = Table(title="📊 Estatísticas", box=box.ROUNDED, border_style="magenta")
@@ -117,39 +165,67 @@ def exibir_estatisticas():
     # Tempo
     table.add_row("TEMPO", "Total geral", formatar_duracao(stats['tempo_total_minutos']))
     table.add_row("", "Tempo de trabalho", formatar_duracao(stats['tempo_trabalho_minutos']))
+    table.add_row("", "⏱️  Foco real", formatar_duracao(stats['tempo_foco_minutos']))
     
     # Hoje
     table.add_row("HOJE", "Sessões", str(stats['sessoes_hoje']))
     table.add_row("", "Tempo", formatar_duracao(stats['tempo_hoje_minutos']))
+    table.add_row("", "⏱️  Foco real", formatar_duracao(stats['tempo_foco_hoje_minutos']))
+    
+    # Metas
+    config = carregar_configuracoes()
+    if metas_ativas(config):
+        configurar_metas(config)
+        progresso = obter_progresso()
+        if progresso['meta_pomodoros_dia']:
+            table.add_row("METAS", "🎯 Pomodoros hoje", f"{progresso['pomodoros_dia']}/{progresso['meta_pomodoros_dia']}")
+        if progresso['meta_horas_semana']:
+            table.add_row(
+                "" if progresso['meta_pomodoros_dia'] else "METAS",
+                "📅 Foco na semana",
+                f"{progresso['horas_semana']:.1f}/{progresso['meta_horas_semana']}h"
+            )
     
     # Média
     if stats['sessoes_completas'] > 0:
         media = stats['tempo_trabalho_minutos'] / stats['sessoes_completas']
         table.add_row("MÉDIA", "Tempo por sessão", formatar_duracao(int(media)))
     
-    console.print(table)
+    return table
+
+
+def exibir_estatisticas():
+    """Exibe estatísticas gerais do histórico."""
+    limpar_tela()
+    # As estatísticas de hoje mudam com a data mesmo sem sessões novas
+    versao = (obter_versao_historico(), obter_versao_configuracoes(), datetime.now().strftime('%Y-%m-%d'))
+    imprimir_cacheado(console, 'estatisticas', _tela_estatisticas, versao)
     console.print()
     Prompt.ask("[dim]Pressione ENTER para voltar[/dim]", default="")
 
 
-def exibir_menu_historico():
-    """Exibe o menu de histórico com opções."""
-    limpar_tela()
-    
+def _tela_menu_historico():
+    """Monta o painel do menu de histórico."""
     menu_text = """[bold cyan][1][/] Ver sessões recentes
 [bold cyan][2][/] Ver sessões de hoje
 [bold cyan][3][/] Limpar histórico
+[bold cyan][4][/] Relatório de foco
+[bold cyan][5][/] Tempo por tarefa
 [bold cyan][0][/] Voltar ao menu principal"""
     
-    panel = Panel(
+    return Panel(
         menu_text,
         title="📜 Histórico",
         border_style="magenta",
         box=box.ROUNDED,
         padding=(1, 2)
     )
-    
-    console.print(panel)
+
+
+def exibir_menu_historico():
+    """Exibe o menu de histórico com opções."""
+    limpar_tela()
+    imprimir_cacheado(console, 'menu_historico', _tela_menu_historico)
     console.print()
 
 
@@ -237,3 +313,43 @@ def exibir_sessoes_hoje():
     
     console.print()
     Prompt.ask("[dim]Pressione ENTER para voltar[/dim]", default="")
+
+
+def exibir_tempo_por_tarefa(mes=None):
+    """
+    Exibe o tempo dedicado a cada tarefa no mês, a partir do índice de tarefas.
+    
+    Parâmetros:
+    mes (str): Mês no formato 'YYYY-MM'. Se None, usa o mês atual.
+    """
+    limpar_tela()
+    
+    mes = mes or datetime.now().strftime('%Y-%m')
+    tempos = obter_tempo_por_tarefa(mes)
+    
+    if not tempos:
+        panel = Panel(
+            f"[yellow]📭 Nenhuma sessão com tarefa em {mes}.[/]",
+            title="🏷️  Tempo por Tarefa",
+            border_style="blue",
+            box=box.ROUNDED
+        )
+        console.print(panel)
+    else:
+        table = Table(
+            title=f"🏷️  Tempo por Tarefa ({mes})",
+            box=box.ROUNDED,
+            border_style="blue"
+        )
+        
+        table.add_column("Tarefa", style="cyan")
+        table.add_column("Sessões", style="magenta", justify="right")
+        table.add_column("Tempo", style="yellow", justify="right")
+        
+        for tarefa, tempo in tempos:
+            table.add_row(tarefa, str(tempo['sessoes']), formatar_duracao(tempo['minutos']))
+        
+        console.print(table)
+    
+    console.print()
+    Prompt.ask("[dim]Pressione ENTER para voltar[/dim]", default="")
@@ -0,0 +1,165 @@
+"""
+Módulo de metas - Metas diária e semanal de foco
+
+O progresso vem de contadores em memória, semeados uma única vez pelo
+agregado do histórico (rollups) e incrementados a cada sessão registrada.
+Consultar o progresso a cada tick do timer é O(1) e nunca relê o histórico.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from historico import TIPOS_FOCO, obter_agregado, obter_segundos_ativos, observar_sessoes
+from notificacoes import notificar_meta_atingida
+
+
+_contadores = None
+_config = {}
+_trava = threading.Lock()
+
+
+def configurar_metas(config):
+    """
+    Define as metas e se a conclusão deve ser notificada.
+
+    Parâmetros:
+    config (dict): Configurações carregadas.
+    """
+    global _config
+    _config = {
+        'meta_pomodoros_dia': config.get('meta_pomodoros_dia', 0),
+        'meta_horas_semana': config.get('meta_horas_semana', 0),
+        'notificacoes_habilitadas': config.get('notificacoes_habilitadas', True)
+    }
+
+
+def metas_ativas(config):
+    """Indica se alguma meta está configurada."""
+    return bool(config.get('meta_pomodoros_dia') or config.get('meta_horas_semana'))
+
+
+def _periodo(data):
+    """Data (str) e início da semana (segunda-feira, str) de um dia."""
+    return data.strftime('%Y-%m-%d'), (data - timedelta(days=data.weekday())).strftime('%Y-%m-%d')
+
+
+def _semear(agora):
+    """Cria os contadores a partir do agregado do histórico."""
+    dia, semana = _periodo(agora.date())
+    por_data = obter_agregado()['por_data']
+    segunda = datetime.strptime(semana, '%Y-%m-%d')
+    segundos = sum(
+        por_data.get((segunda + timedelta(days=deslocamento)).strftime('%Y-%m-%d'), {}).get('segundos_foco', 0.0)
+        for deslocamento in range(7)
+    )
+    contadores = {
+        'dia': dia,
+        'semana': semana,
+        'pomodoros_dia': por_data.get(dia, {}).get('trabalhos', 0),
+        'segundos_semana': segundos,
+        'notificadas': set()
+    }
+    # Metas já atingidas antes deste processo não são notificadas de novo
+    _verificar_conclusao(contadores, notificar=False)
+    return contadores
+
+
+def _virar_periodo(contadores, dia, semana):
+    """Zera os contadores quando o dia ou a semana mudam."""
+    if dia > contadores['dia']:
+        contadores['dia'] = dia
+        contadores['pomodoros_dia'] = 0
+    if semana > contadores['semana']:
+        contadores['semana'] = semana
+        contadores['segundos_semana'] = 0.0
+
+
+def _verificar_conclusao(contadores, notificar=True):
+    """Notifica, uma vez por período, as metas que acabaram de ser atingidas."""
+    meta_dia = _config.get('meta_pomodoros_dia', 0)
+    meta_semana = _config.get('meta_horas_semana', 0)
+    atingidas = []
+    if meta_dia and contadores['pomodoros_dia'] >= meta_dia:
+        atingidas.append((('dia', contadores['dia']), f"diária de {meta_dia} pomodoros"))
+    if meta_semana and contadores['segundos_semana'] >= meta_semana * 3600:
+        atingidas.append((('semana', contadores['semana']), f"semanal de {meta_semana}h de foco"))
+
+    for chave, descricao in atingidas:
+        if chave in contadores['notificadas']:
+            continue
+        contadores['notificadas'].add(chave)
+        if notificar and _config.get('notificacoes_habilitadas', True):
+            notificar_meta_atingida(descricao)
+
+
+def _ao_registrar(sessao):
+    """Soma uma sessão registrada aos contadores (observador do histórico)."""
+    if not _config:
+        return
+    with _trava:
+        # Ainda não semeados: o agregado já incluirá a sessão
+        if _contadores is None:
+            return
+        data = sessao.get('data')
+        if not isinstance(data, str):
+            return
+        try:
+            dia, semana = _periodo(datetime.strptime(data, '%Y-%m-%d').date())
+        except ValueError:
+            return
+        _virar_periodo(_contadores, dia, semana)
+
+        tipo = sessao.get('tipo')
+        if dia == _contadores['dia'] and tipo == 'trabalho' and sessao.get('completa', True):
+            _contadores['pomodoros_dia'] += 1
+        if semana == _contadores['semana'] and tipo in TIPOS_FOCO:
+            _contadores['segundos_semana'] += obter_segundos_ativos(sessao)
+        _verificar_conclusao(_contadores)
+
+
+observar_sessoes(_ao_registrar)
+
+
+def obter_progresso(agora=None, segundos_em_andamento=0.0):
+    """
+    Retorna o progresso das metas. Na primeira chamada semeia os contadores
+    pelo agregado do histórico; nas seguintes só lê os contadores.
+
+    Parâmetros:
+    agora (datetime): Momento da consulta. Se None, usa o atual.
+    segundos_em_andamento (float): Foco da fase em andamento, ainda não registrada.
+
+    Retorna:
+    dict: 'pomodoros_dia', 'meta_pomodoros_dia', 'horas_semana' e 'meta_horas_semana'.
+    """
+    global _contadores
+
+    agora = agora or datetime.now()
+    with _trava:
+        if _contadores is None:
+            _contadores = _semear(agora)
+        else:
+            _virar_periodo(_contadores, *_periodo(agora.date()))
+        return {
+            'pomodoros_dia': _contadores['pomodoros_dia'],
+            'meta_pomodoros_dia': _config.get('meta_pomodoros_dia', 0),
+            'horas_semana': (_contadores['segundos_semana'] + segundos_em_andamento) / 3600,
+            'meta_horas_semana': _config.get('meta_horas_semana', 0)
+        }
+
+
+def formatar_progresso(progresso):
+    """
+    Formata o progresso das metas ativas para a linha do timer.
+
+    Parâmetros:
+    progresso (dict): Resultado de obter_progresso.
+
+    Retorna:
+    str: Ex: "🎯 3/8 hoje · 📅 12.5/20h na semana" (vazio sem metas).
+    """
+    partes = []
+    if progresso['meta_pomodoros_dia']:
+        partes.append(f"🎯 {progresso['pomodoros_dia']}/{progresso['meta_pomodoros_dia']} hoje")
+    if progresso['meta_horas_semana']:
+        partes.append(f"📅 {progresso['horas_semana']:.1f}/{progresso['meta_horas_semana']}h na semana")
+    return " · ".join(partes)
@@ -2,12 +2,59 @@
 Módulo de gerenciamento de notificações desktop do Pomo CLI
 """
 
+import importlib.util
+import json
 import platform
+import shutil
 import subprocess
 import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from config import obter_caminho_config
+from eventos import registrar_evento
 
-# Detecta se notificações estão disponíveis
-NOTIFICACOES_DISPONIVEIS = True
+# Sistema operacional, consultado uma única vez
+SISTEMA = platform.system()
+
+# Cache das sondagens de backends, por máquina, ao lado do config.json
+CACHE_BACKENDS_FILE = 'notificacoes_cache.json'
+
+# Validade do cache de sondagem
+VALIDADE_CACHE = timedelta(days=7)
+
+# Backend escolhido nesta execução (None = ainda não sondado)
+_backends_disponiveis = None
+# Backends que falharam nesta execução: pulados até a próxima sondagem
+# forçada, mas não gravados no cache (a falha pode ser passageira)
+_backends_falhos = set()
+_trava_backends = threading.Lock()
+
+# Conexão D-Bus persistente e ids das notificações substituíveis, por chave
+DBUS_NOTIFICACOES = '/org/freedesktop/Notifications'
+_conexao_dbus = None
+_ids_notificacao = {}
+_trava_dbus = threading.Lock()
+
+# Quando definida na thread, recebe as notificações em vez do sistema (simulação)
+_captura = threading.local()
+
+
+@contextmanager
+def capturar_notificacoes():
+    """
+    Desvia as notificações para uma lista em vez do desktop.
+    
+    Retorna:
+    list: Lista (preenchida durante o bloco) de pares (titulo, mensagem).
+    """
+    anterior = getattr(_captura, 'lista', None)
+    _captura.lista = []
+    try:
+        yield _captura.lista
+    finally:
+        _captura.lista = anterior
 
 
 def enviar_notificacao_macos(titulo, mensagem):
@@ -65,9 +112,90 @@ def enviar_notificacao_linux(titulo, mensagem):
         return False
 
 
+def _abrir_conexao_dbus():
+    """
+    Abre (uma única vez) a conexão com o barramento de sessão D-Bus
+    (DBUS_SESSION_BUS_ADDRESS).
+    
+    Retorna:
+    DBusConnection: Conexão jeepney persistente.
+    """
+    global _conexao_dbus
+    if _conexao_dbus is None:
+        from jeepney.io.blocking import open_dbus_connection
+        _conexao_dbus = open_dbus_connection(bus='SESSION')
+    return _conexao_dbus
+
+
+def fechar_conexao_dbus():
+    """Fecha a conexão D-Bus, se aberta, e esquece os ids das notificações."""
+    global _conexao_dbus
+    with _trava_dbus:
+        if _conexao_dbus is not None:
+            try:
+                _conexao_dbus.close()
+            except Exception:
+                pass
+            _conexao_dbus = None
+        _ids_notificacao.clear()
+
+
+def enviar_notificacao_dbus(titulo, mensagem, timeout=10, chave=None):
+    """
+    Envia notificação direto para org.freedesktop.Notifications pela
+    conexão D-Bus persistente, sem criar processos.
+    
+    Parâmetros:
+    titulo (str): Título da notificação.
+    mensagem (str): Mensagem da notificação.
+    timeout (int): Tempo em segundos que a notificação ficará visível.
+    chave (str): Se informada, substitui a última notificação enviada com
+                 a mesma chave em vez de empilhar uma nova.
+    
+    Retorna:
+    bool: True se enviou com sucesso, False caso contrário.
+    """
+    global _conexao_dbus
+    with _trava_dbus:
+        # Uma conexão persistente pode ter caído (ex.: o barramento reiniciou);
+        # nesse caso ela é descartada e o envio é tentado com uma nova
+        for tentativa in range(2):
+            reaproveitada = _conexao_dbus is not None
+            try:
+                from jeepney import DBusAddress, new_method_call
+                
+                destino = DBusAddress(
+                    DBUS_NOTIFICACOES,
+                    bus_name='org.freedesktop.Notifications',
+                    interface='org.freedesktop.Notifications'
+                )
+                mensagem_dbus = new_method_call(destino, 'Notify', 'susssasa{sv}i', (
+                    'Pomo CLI', _ids_notificacao.get(chave, 0), '', titulo, mensagem,
+                    [], {}, int(timeout * 1000)
+                ))
+                resposta = _abrir_conexao_dbus().send_and_get_reply(mensagem_dbus, timeout=2)
+                if resposta.header.message_type.name == 'error':
+                    raise RuntimeError(resposta.body[0] if resposta.body else 'erro D-Bus')
+                
+                if chave is not None:
+                    _ids_notificacao[chave] = resposta.body[0]
+                return True
+            except Exception as e:
+                if _conexao_dbus is not None:
+                    try:
+                        _conexao_dbus.close()
+                    except Exception:
+                        pass
+                    _conexao_dbus = None
+                if not reaproveitada:
+                    print(f"⚠️  Erro ao enviar notificação via D-Bus: {e}")
+                    return False
+        return False
+
+
 def enviar_notificacao_windows(titulo, mensagem):
     """
-    Envia notificação usando PowerShell no Windows.
+    Envia notificação usando plyer (Windows e demais sistemas).
     
     Parâmetros:
     titulo (str): Título da notificação.
@@ -91,33 +219,183 @@ def enviar_notificacao_windows(titulo, mensagem):
         return False
 
 
-def enviar_notificacao(titulo, mensagem, timeout=10, icone_app=""):
+def _sessao_dbus_disponivel():
+    """Verifica se há um barramento de sessão D-Bus para notify-send."""
+    if os.environ.get('DBUS_SESSION_BUS_ADDRESS'):
+        return True
+    if hasattr(os, 'getuid'):
+        return os.path.exists(f"/run/user/{os.getuid()}/bus")
+    return False
+
+
+def _sondar_osascript():
+    """Sonda o backend do macOS."""
+    return SISTEMA == "Darwin" and shutil.which('osascript') is not None
+
+
+def _sondar_notify_send():
+    """Sonda o backend notify-send (binário no PATH e sessão D-Bus)."""
+    return shutil.which('notify-send') is not None and _sessao_dbus_disponivel()
+
+
+def _sondar_dbus():
+    """Sonda o backend D-Bus nativo (jeepney instalado e sessão D-Bus)."""
+    return SISTEMA == "Linux" and importlib.util.find_spec('jeepney') is not None and _sessao_dbus_disponivel()
+
+
+def _sondar_plyer():
+    """Sonda o backend plyer (biblioteca importável)."""
+    return importlib.util.find_spec('plyer') is not None
+
+
+# Backends registrados, do mais rápido para o mais lento;
+# 'substitui' indica se o backend aceita `chave` para atualizar notificações
+BACKENDS = {
+    'osascript': {'sondar': _sondar_osascript, 'enviar': enviar_notificacao_macos},
+    'dbus': {'sondar': _sondar_dbus, 'enviar': enviar_notificacao_dbus, 'substitui': True},
+    'notify-send': {'sondar': _sondar_notify_send, 'enviar': enviar_notificacao_linux},
+    'plyer': {'sondar': _sondar_plyer, 'enviar': enviar_notificacao_windows},
+}
+
+
+def _caminho_cache_backends():
+    """Retorna o caminho do cache de sondagem, no diretório do config.json."""
+    return os.path.join(os.path.dirname(obter_caminho_config()), CACHE_BACKENDS_FILE)
+
+
+def _ler_cache_backends():
+    """Lê o cache de sondagem de todas as máquinas."""
+    try:
+        with open(_caminho_cache_backends(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _salvar_cache_backends(disponiveis):
+    """Grava os backends disponíveis desta máquina no cache."""
+    cache = _ler_cache_backends()
+    cache[platform.node()] = {
+        'sistema': SISTEMA,
+        'backends': disponiveis,
+        'sondado_em': datetime.now().isoformat()
+    }
+    caminho = _caminho_cache_backends()
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=4, ensure_ascii=False)
+        os.replace(temporario, caminho)
+    except OSError:
+        pass
+
+
+def sondar_backends(forcar=False):
     """
-    Envia uma notificação desktop de forma multiplataforma.
+    Descobre os backends de notificação que funcionam nesta máquina.
+    A sondagem roda uma vez e fica em cache por máquina; só é refeita
+    quando o cache expira ou com `forcar`, que também volta a tentar os
+    backends que falharam nesta execução.
+    
+    Parâmetros:
+    forcar (bool): Ignora o cache e sonda de novo.
+    
+    Retorna:
+    list: Nomes dos backends disponíveis, do mais rápido para o mais lento.
+    """
+    global _backends_disponiveis
+    
+    with _trava_backends:
+        if _backends_disponiveis is not None and not forcar:
+            return list(_backends_disponiveis)
+        
+        if forcar:
+            _backends_falhos.clear()
+        entrada = None if forcar else _ler_cache_backends().get(platform.node())
+        if entrada and entrada.get('sistema') == SISTEMA:
+            try:
+                sondado_em = datetime.fromisoformat(entrada['sondado_em'])
+            except (KeyError, ValueError):
+                sondado_em = datetime.min
+            if datetime.now() - sondado_em < VALIDADE_CACHE:
+                _backends_disponiveis = [nome for nome in entrada.get('backends', []) if nome in BACKENDS]
+                return list(_backends_disponiveis)
+        
+        disponiveis = []
+        for nome, backend in BACKENDS.items():
+            try:
+                if backend['sondar']():
+                    disponiveis.append(nome)
+            except Exception:
+                pass
+        
+        _backends_disponiveis = disponiveis
+        _salvar_cache_backends(disponiveis)
+        return list(disponiveis)
+
+
+def _desativar_backend(nome):
+    """Pula um backend que falhou pelo resto desta execução."""
+    with _trava_backends:
+        _backends_falhos.add(nome)
+
+
+def _backends_utilizaveis():
+    """Backends disponíveis que não falharam nesta execução, em ordem."""
+    disponiveis = sondar_backends()
+    with _trava_backends:
+        return [nome for nome in disponiveis if nome not in _backends_falhos]
+
+
+def backend_atual():
+    """
+    Retorna o backend que será usado nas próximas notificações.
+    
+    Retorna:
+    str | None: Nome do backend, ou None se nenhum funciona.
+    """
+    utilizaveis = _backends_utilizaveis()
+    return utilizaveis[0] if utilizaveis else None
+
+
+def enviar_notificacao(titulo, mensagem, timeout=10, icone_app="", chave=None):
+    """
+    Envia uma notificação desktop de forma multiplataforma, pelo backend
+    mais rápido disponível. Backends que falham são pulados pelo resto da
+    execução, até uma nova sondagem (ver testar_notificacoes).
     
     Parâmetros:
     titulo (str): Título da notificação.
     mensagem (str): Mensagem da notificação.
     timeout (int): Tempo em segundos que a notificação ficará visível (não usado em macOS).
     icone_app (str): Caminho para o ícone da aplicação (opcional).
+    chave (str): Identifica uma notificação que deve ser atualizada em vez
+                 de empilhada, nos backends que suportam (opcional).
     
     Retorna:
     bool: True se enviou com sucesso, False caso contrário.
     """
-    if not NOTIFICACOES_DISPONIVEIS:
-        return False
+    captura = getattr(_captura, 'lista', None)
+    if captura is not None:
+        captura.append((titulo, mensagem))
+        registrar_evento('notificacao', titulo=titulo, backend='captura', enviada=True, ms=0.0)
+        return True
     
-    sistema = platform.system()
+    for nome in _backends_utilizaveis():
+        backend = BACKENDS[nome]
+        inicio = time.perf_counter()
+        if backend.get('substitui'):
+            enviado = backend['enviar'](titulo, mensagem, timeout=timeout, chave=chave)
+        else:
+            enviado = backend['enviar'](titulo, mensagem)
+        ms = round((time.perf_counter() - inicio) * 1000, 3)
+        registrar_evento('notificacao', titulo=titulo, backend=nome, enviada=enviado, ms=ms)
+        if enviado:
+            return True
+        _desativar_backend(nome)
     
-    if sistema == "Darwin":  # macOS
-        return enviar_notificacao_macos(titulo, mensagem)
-    elif sistema == "Linux":
-        return enviar_notificacao_linux(titulo, mensagem)
-    elif sistema == "Windows":
-        return enviar_notificacao_windows(titulo, mensagem)
-    else:
-        print(f"⚠️  Sistema operacional não suportado: {sistema}")
-        return False
+    registrar_evento('notificacao', titulo=titulo, backend=None, enviada=False, ms=0.0)
+    return False
 
 def notificar_trabalho_iniciado(duracao_minutos):
     """
@@ -129,7 +407,8 @@ def notificar_trabalho_iniciado(duracao_minutos):
     enviar_notificacao(
         titulo="🍅 Pomodoro - Trabalho Iniciado",
         mensagem=f"Foco! Trabalhe por {duracao_minutos} minutos.",
-        timeout=5
+        timeout=5,
+        chave="timer"
     )
 
 def notificar_trabalho_concluido():
@@ -137,7 +416,8 @@ def notificar_trabalho_concluido():
     enviar_notificacao(
         titulo="🎉 Pomodoro - Trabalho Concluído!",
         mensagem="Parabéns! Você completou uma sessão de trabalho.",
-        timeout=10
+        timeout=10,
+        chave="timer"
     )
 
 def notificar_descanso_concluido():
@@ -145,7 +425,8 @@ def notificar_descanso_concluido():
     enviar_notificacao(
         titulo="⏰ Pomodoro - Descanso Concluído",
         mensagem="Hora de voltar ao trabalho!",
-        timeout=10
+        timeout=10,
+        chave="timer"
     )
 
 def notificar_pomodoro_completo(ciclos):
@@ -161,27 +442,48 @@ def notificar_pomodoro_completo(ciclos):
         timeout=15
     )
 
+def notificar_meta_atingida(descricao):
+    """
+    Notifica que uma meta de foco foi atingida.
+    
+    Parâmetros:
+    descricao (str): Meta atingida (ex: "diária de 8 pomodoros").
+    """
+    enviar_notificacao(
+        titulo="🏆 Pomodoro - Meta Atingida!",
+        mensagem=f"Parabéns! Você atingiu a meta {descricao}.",
+        timeout=15
+    )
+
 def notificar_timer_personalizado_concluido(minutos):
     """
     Notifica a conclusão de um timer personalizado.
     
     Parâmetros:
-    minutos (int): Duração do timer em minutos.
+    minutos (float): Duração do timer em minutos.
     """
+    if float(minutos).is_integer():
+        duracao = f"{int(minutos)} minutos"
+    else:
+        duracao = f"{minutos * 60:g} segundos"
+    
     enviar_notificacao(
         titulo="⏱️ Timer Concluído",
-        mensagem=f"Seu timer de {minutos} minutos terminou!",
-        timeout=10
+        mensagem=f"Seu timer de {duracao} terminou!",
+        timeout=10,
+        chave="timer"
     )
 
 def testar_notificacoes():
     """
-    Testa se as notificações estão funcionando.
+    Testa se as notificações estão funcionando. Sonda os backends de novo,
+    ignorando o cache e as falhas anteriores desta execução.
     
     Retorna:
     bool: True se funcionou, False caso contrário.
     """
-    if not NOTIFICACOES_DISPONIVEIS:
+    sondar_backends(forcar=True)
+    if not notificacoes_habilitadas():
         print("❌ Notificações não disponíveis.")
         return False
     
@@ -200,9 +502,9 @@ def testar_notificacoes():
 
 def notificacoes_habilitadas():
     """
-    Verifica se as notificações estão disponíveis.
+    Verifica se algum backend de notificação funciona nesta máquina.
     
     Retorna:
     bool: True se disponível, False caso contrário.
     """
-    return NOTIFICACOES_DISPONIVEIS
+    return backend_atual() is not None
@@ -5,13 +5,20 @@ Arquivo principal que coordena todos os módulos
 """
 
 import sys
+
+# `pomo status` é consultado por barras de status a cada segundo, então
+# é atendido antes de importar rich e os demais módulos da interface
+if __name__ == "__main__" and sys.argv[1:2] == ['status']:
+    from estado import main_status
+    sys.exit(main_status(sys.argv[2:]))
+
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.panel import Panel
 from rich import box
 from config import resetar_configuracoes
 from historico import limpar_historico
-from notificacoes import testar_notificacoes, notificacoes_habilitadas
+from notificacoes import testar_notificacoes, notificacoes_habilitadas, sondar_backends
 from interface import (
     limpar_tela,
     exibir_menu_principal,
@@ -20,20 +27,36 @@ from interface import (
     exibir_estatisticas,
     exibir_menu_historico,
     exibir_sessoes_recentes,
-    exibir_sessoes_hoje
+    exibir_sessoes_hoje,
+    exibir_tempo_por_tarefa
 )
-from timer import iniciar_sessao_pomodoro, executar_timer
+from timer import iniciar_sessao_pomodoro, executar_timer_personalizado
+from funcoes import converter_duracao
 from editor_config import editar_configuracoes
+from dashboard import exibir_dashboard
+from relatorio import gerar_relatorio, exibir_relatorio, exportar_relatorio
 
 console = Console()
 
 
+def perguntar_tarefa():
+    """
+    Pergunta a tarefa à qual a sessão será atribuída.
+    
+    Retorna:
+    str | None: Nome da tarefa, ou None se o usuário pular.
+    """
+    tarefa = Prompt.ask("[dim]Tarefa ou projeto (ENTER para pular)[/dim]", default="")
+    return tarefa.strip() or None
+
+
 def iniciar_timer_personalizado():
     """Inicia um timer com duração personalizada."""
     limpar_tela()
     
     panel = Panel(
-        "Digite quantos minutos deseja trabalhar",
+        "Digite quantos minutos deseja trabalhar\n"
+        "[dim]Aceita frações e sufixos: 1.5, 90s, 1m30s[/dim]",
         title="⏱️ Timer Personalizado",
         border_style="yellow",
         box=box.ROUNDED,
@@ -44,13 +67,13 @@ def iniciar_timer_personalizado():
     console.print()
     
     try:
-        minutos = int(Prompt.ask("Quantos minutos?"))
+        minutos = converter_duracao(Prompt.ask("Quantos minutos?"))
         if minutos <= 0:
             console.print("[red]❌ Por favor, insira um valor positivo.[/]")
             Prompt.ask("[dim]Pressione ENTER para continuar[/dim]", default="")
             return
         
-        executar_timer(minutos, "⏱️ Timer Personalizado", "yellow", tipo_sessao='personalizado')
+        executar_timer_personalizado(minutos, tarefa=perguntar_tarefa())
         
     except ValueError:
         console.print("[red]❌ Por favor, insira um número válido.[/]")
@@ -103,11 +126,30 @@ def exibir_historico():
             exibir_sessoes_hoje()
         elif opcao == '3':
             limpar_historico_menu()
+        elif opcao == '4':
+            relatorio_menu()
+        elif opcao == '5':
+            exibir_tempo_por_tarefa()
         else:
             console.print("\n[red]❌ Opção inválida![/]")
             Prompt.ask("[dim]Pressione ENTER para continuar[/dim]", default="")
 
 
+def relatorio_menu():
+    """Exibe o relatório de foco e oferece a exportação em HTML/SVG."""
+    limpar_tela()
+    
+    relatorio = gerar_relatorio()
+    exibir_relatorio(relatorio)
+    console.print()
+    
+    caminho = Prompt.ask("[dim]Exportar para (.html/.svg, ENTER para pular)[/dim]", default="")
+    if caminho:
+        if exportar_relatorio(caminho, relatorio):
+            console.print(f"\n[green]✅ Relatório exportado para {caminho}[/]")
+        Prompt.ask("[dim]Pressione ENTER para continuar[/dim]", default="")
+
+
 def limpar_historico_menu():
     """Menu para limpar o histórico."""
     limpar_tela()
@@ -145,6 +187,8 @@ def testar_notificacoes_menu():
     """Menu para testar notificações."""
     limpar_tela()
     
+    # Sonda de novo: um backend pode ter voltado desde a última falha
+    sondar_backends(forcar=True)
     if not notificacoes_habilitadas():
         console.print("\n[red]❌ Notificações não disponíveis.[/]")
     else:
@@ -163,7 +207,7 @@ def main():
             opcao = Prompt.ask("Escolha uma opção", default="0")
             
             if opcao == '1':
-                iniciar_sessao_pomodoro()
+                iniciar_sessao_pomodoro(tarefa=perguntar_tarefa())
             elif opcao == '2':
                 iniciar_timer_personalizado()
             elif opcao == '3':
@@ -178,6 +222,8 @@ def main():
                 exibir_historico()
             elif opcao == '8':
                 exibir_sobre()
+            elif opcao == '9':
+                exibir_dashboard()
             elif opcao == '0':
                 limpar_tela()
                 console.print("\n[bold green]👋 Até logo! Continue produtivo! 🍅[/]\n")
@@ -195,5 +241,40 @@ def main():
             Prompt.ask("[dim]Pressione ENTER para continuar[/dim]", default="")
 
 
+def executar_comando(argumentos):
+    """
+    Executa um subcomando de linha de comando.
+    
+    Parâmetros:
+    argumentos (list): Argumentos após o nome do programa.
+    
+    Retorna:
+    int | None: Código de saída, ou None se não for um subcomando.
+    """
+    comando = argumentos[0] if argumentos else None
+    
+    if comando == 'equipe':
+        from servidor_equipe import main_equipe
+        return main_equipe(argumentos[1:])
+    if comando == 'agendador':
+        from agendador import main_agendador
+        return main_agendador(argumentos[1:])
+    if comando == 'analise':
+        from analise_paralela import main_analise
+        return main_analise(argumentos[1:])
+    if comando == 'sincronizar':
+        from sincronizacao import main_sincronizar
+        return main_sincronizar(argumentos[1:])
+    if comando == 'replay':
+        from replay import main_replay
+        return main_replay(argumentos[1:])
+    if comando == 'notificacoes':
+        return 0 if testar_notificacoes() else 1
+    return None
+
+
 if __name__ == "__main__":
+    codigo = executar_comando(sys.argv[1:])
+    if codigo is not None:
+        sys.exit(codigo)
     main()
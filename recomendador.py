@@ -0,0 +1,151 @@
+"""
+Módulo de recomendação - Sugere durações de trabalho e descanso pelo histórico
+
+Usa apenas os contadores de conclusão mantidos no agregado do histórico
+(por duração e hora de início, e pela duração do descanso anterior), então
+uma recomendação custa poucos microssegundos mesmo com históricos grandes
+e pode ser calculada no início de toda sessão.
+"""
+
+from datetime import datetime
+from config import ESQUEMA_CONFIGURACOES, carregar_configuracoes
+from historico import obter_agregado
+
+
+# Taxa de conclusão mínima para uma duração ser considerada sustentável
+META_CONCLUSAO = 0.8
+
+# Sessões necessárias para uma duração entrar na comparação
+MINIMO_AMOSTRAS = 5
+
+# Pseudo-sessões da suavização: puxam taxas com poucas amostras para a média
+PESO_PRIORI = 3
+
+# Horas vizinhas somadas à hora atual (±)
+JANELA_HORAS = 1
+
+# Acima desta taxa, a maior duração sustentável é esticada em PASSO_AUMENTO
+TAXA_ESTICAR = 0.95
+PASSO_AUMENTO = 5
+
+
+def _taxa_suavizada(completas, total, priori):
+    """Taxa de conclusão suavizada em direção à taxa geral `priori`."""
+    return (completas + PESO_PRIORI * priori) / (total + PESO_PRIORI)
+
+
+def _candidatos(contagens, chave_config):
+    """
+    Calcula a taxa suavizada de cada duração com amostras suficientes e
+    dentro dos limites do esquema.
+
+    Parâmetros:
+    contagens (dict): {duração (str): [completas, total]}.
+    chave_config (str): Campo do esquema que limita as durações.
+
+    Retorna:
+    dict: {duração (int): (taxa suavizada, total de amostras)}.
+    """
+    campo = ESQUEMA_CONFIGURACOES[chave_config]
+    total_completas = sum(c for c, _ in contagens.values())
+    total_sessoes = sum(n for _, n in contagens.values())
+    priori = total_completas / total_sessoes if total_sessoes else META_CONCLUSAO
+
+    candidatos = {}
+    for chave, (completas, total) in contagens.items():
+        try:
+            duracao = float(chave)
+        except ValueError:
+            continue
+        if total < MINIMO_AMOSTRAS or not duracao.is_integer():
+            continue
+        if not campo['minimo'] <= duracao <= campo['maximo']:
+            continue
+        candidatos[int(duracao)] = (_taxa_suavizada(completas, total, priori), total)
+    return candidatos
+
+
+def _recomendar_trabalho(agregado, hora, atual):
+    """Escolhe a duração de trabalho para a hora do dia informada."""
+    horas = [(hora + deslocamento) % 24 for deslocamento in range(-JANELA_HORAS, JANELA_HORAS + 1)]
+    contagens = {}
+    for chave, por_hora in agregado.get('conclusao_trabalho', {}).items():
+        completas = sum(por_hora[h][0] for h in horas)
+        total = sum(por_hora[h][1] for h in horas)
+        if total:
+            contagens[chave] = (completas, total)
+
+    candidatos = _candidatos(contagens, 'tempo_trabalho')
+    if not candidatos:
+        return atual, None, "histórico insuficiente neste horário"
+
+    sustentaveis = [d for d, (taxa, _) in candidatos.items() if taxa >= META_CONCLUSAO]
+    if sustentaveis:
+        # A maior duração que você costuma concluir neste horário
+        duracao = max(sustentaveis)
+        taxa, amostras = candidatos[duracao]
+        maximo = ESQUEMA_CONFIGURACOES['tempo_trabalho']['maximo']
+        if taxa >= TAXA_ESTICAR and duracao + PASSO_AUMENTO <= maximo and duracao + PASSO_AUMENTO not in candidatos:
+            return duracao + PASSO_AUMENTO, taxa, f"{taxa:.0%} de conclusão com {duracao} min: vale tentar mais"
+        return duracao, taxa, f"{taxa:.0%} de conclusão em {amostras} sessões neste horário"
+
+    # Nenhuma sustentável: a de maior taxa, preferindo a mais curta no empate
+    duracao = max(candidatos, key=lambda d: (candidatos[d][0], -d))
+    taxa, amostras = candidatos[duracao]
+    return duracao, taxa, f"melhor taxa neste horário ({taxa:.0%} em {amostras} sessões)"
+
+
+def _recomendar_descanso(agregado, atual):
+    """Escolhe o descanso curto após o qual o trabalho seguinte costuma ser concluído."""
+    candidatos = _candidatos(agregado.get('conclusao_apos_descanso', {}), 'descanso_curto')
+    if not candidatos:
+        return atual
+    sustentaveis = [d for d, (taxa, _) in candidatos.items() if taxa >= META_CONCLUSAO]
+    if sustentaveis:
+        return min(sustentaveis)
+    return max(candidatos, key=lambda d: (candidatos[d][0], -d))
+
+
+def recomendar(config=None, agora=None, agregado=None):
+    """
+    Recomenda as durações da próxima sessão a partir do histórico.
+
+    Parâmetros:
+    config (dict): Configurações atuais. Se None, carrega do arquivo.
+    agora (datetime): Momento de início da sessão. Se None, usa o atual.
+    agregado (dict): Agregado do histórico. Se None, usa o em memória.
+
+    Retorna:
+    dict: 'tempo_trabalho', 'descanso_curto', 'taxa_conclusao' estimada
+          (None sem dados) e 'motivo'.
+    """
+    if config is None:
+        config = carregar_configuracoes()
+    agora = agora or datetime.now()
+    agregado = agregado if agregado is not None else obter_agregado()
+
+    tempo, taxa, motivo = _recomendar_trabalho(agregado, agora.hour, config['tempo_trabalho'])
+    return {
+        'tempo_trabalho': tempo,
+        'descanso_curto': _recomendar_descanso(agregado, config['descanso_curto']),
+        'taxa_conclusao': taxa,
+        'motivo': motivo
+    }
+
+
+def aplicar_recomendacao(config, recomendacao):
+    """
+    Retorna uma cópia das configurações com as durações recomendadas.
+
+    Parâmetros:
+    config (dict): Configurações atuais.
+    recomendacao (dict): Resultado de recomendar.
+
+    Retorna:
+    dict: Configurações ajustadas (o config.json não é alterado).
+    """
+    return dict(
+        config,
+        tempo_trabalho=recomendacao['tempo_trabalho'],
+        descanso_curto=recomendacao['descanso_curto']
+    )
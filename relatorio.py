@@ -0,0 +1,276 @@
+"""
+Módulo de relatórios - Mapa de calor de foco e tendências
+
+Percorre o histórico uma única vez acumulando apenas contadores de tamanho
+fixo (7 x 24 do mapa de calor, um por duração e um por dia), e gera a
+exibição no terminal e a exportação em HTML/SVG.
+"""
+
+import html
+from datetime import date, datetime, timedelta
+from rich.console import Console
+from rich.table import Table
+from rich.text import Text
+from rich import box
+from historico import TIPOS_FOCO, iterar_historico, obter_segundos_ativos, formatar_duracao
+
+
+console = Console()
+
+DIAS_SEMANA = ['Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb', 'Dom']
+BLOCOS = ' ░▒▓█'
+
+
+def _momento_sessao(sessao):
+    """
+    Obtém a data e hora de uma sessão: o início medido, se gravado, ou
+    o momento do registro.
+
+    Retorna:
+    datetime | None: Momento da sessão, ou None se não for possível ler.
+    """
+    for campo in ('inicio', 'timestamp'):
+        try:
+            return datetime.fromisoformat(sessao[campo])
+        except (KeyError, TypeError, ValueError):
+            pass
+    try:
+        return datetime.strptime(f"{sessao['data']} {sessao.get('hora', '00:00:00')}", '%Y-%m-%d %H:%M:%S')
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def gerar_relatorio(sessoes=None, hoje=None):
+    """
+    Gera o relatório de foco numa única passada pelo histórico.
+
+    Parâmetros:
+    sessoes (iterable): Sessões a analisar. Se None, percorre o histórico
+                        em streaming.
+    hoje (date): Último dia das tendências. Se None, usa a data atual.
+
+    Retorna:
+    dict: 'mapa_calor' (7 x 24 minutos de foco real por dia da semana e
+          hora, inclusive de sessões interrompidas),
+          'conclusao_por_duracao' ({duração: [completas, total]}),
+          'tendencia' (lista de dicts por dia dos últimos 30 dias) e
+          'total_minutos'.
+    """
+    if sessoes is None:
+        sessoes = iterar_historico()
+    hoje = hoje or date.today()
+
+    mapa_calor = [[0] * 24 for _ in range(7)]
+    conclusao = {}
+    minutos_por_dia = {}
+    total_minutos = 0
+    inicio_janela = hoje - timedelta(days=59)
+
+    for sessao in sessoes:
+        if sessao.get('tipo') not in TIPOS_FOCO:
+            continue
+
+        duracao = sessao.get('duracao_minutos', 0)
+        contagem = conclusao.setdefault(duracao, [0, 0])
+        contagem[1] += 1
+        if sessao.get('completa', True):
+            contagem[0] += 1
+
+        minutos = obter_segundos_ativos(sessao) / 60
+        momento = _momento_sessao(sessao)
+        if momento is None or not minutos:
+            continue
+        mapa_calor[momento.weekday()][momento.hour] += minutos
+        total_minutos += minutos
+
+        # Só os dias da janela das médias móveis ficam em memória
+        dia = momento.date()
+        if inicio_janela <= dia <= hoje:
+            minutos_por_dia[dia] = minutos_por_dia.get(dia, 0) + minutos
+
+    return {
+        'mapa_calor': mapa_calor,
+        'conclusao_por_duracao': dict(sorted(conclusao.items())),
+        'tendencia': _calcular_tendencia(minutos_por_dia, hoje),
+        'total_minutos': total_minutos
+    }
+
+
+def _calcular_tendencia(minutos_por_dia, hoje, dias=30):
+    """Calcula as médias móveis de 7 e 30 dias para os últimos `dias` dias."""
+    tendencia = []
+    for deslocamento in range(dias - 1, -1, -1):
+        dia = hoje - timedelta(days=deslocamento)
+        media_7 = sum(minutos_por_dia.get(dia - timedelta(days=i), 0) for i in range(7)) / 7
+        media_30 = sum(minutos_por_dia.get(dia - timedelta(days=i), 0) for i in range(30)) / 30
+        tendencia.append({
+            'data': dia.isoformat(),
+            'minutos': minutos_por_dia.get(dia, 0),
+            'media_7': media_7,
+            'media_30': media_30
+        })
+    return tendencia
+
+
+def _bloco(valor, maximo):
+    """Escolhe o caractere de intensidade do mapa de calor."""
+    if not valor or not maximo:
+        return BLOCOS[0]
+    return BLOCOS[1 + min(int(valor / maximo * (len(BLOCOS) - 1)), len(BLOCOS) - 2)]
+
+
+def exibir_relatorio(relatorio=None):
+    """
+    Exibe o relatório no terminal.
+
+    Parâmetros:
+    relatorio (dict): Relatório gerado. Se None, gera a partir do histórico.
+    """
+    relatorio = relatorio or gerar_relatorio()
+    mapa = relatorio['mapa_calor']
+    maximo = max(max(linha) for linha in mapa)
+
+    table = Table(title="🔥 Foco por dia da semana e hora", box=box.ROUNDED, border_style="red")
+    table.add_column("", style="cyan")
+    table.add_column("".join(f"{h:<3}" for h in range(0, 24, 3)), style="red")
+    for indice, linha in enumerate(mapa):
+        table.add_row(DIAS_SEMANA[indice], "".join(_bloco(valor, maximo) for valor in linha))
+    console.print(table)
+
+    table = Table(title="✅ Conclusão por duração", box=box.ROUNDED, border_style="green")
+    table.add_column("Duração", style="yellow", justify="right")
+    table.add_column("Completas", style="green", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Taxa", style="cyan", justify="right")
+    for duracao, (completas, total) in relatorio['conclusao_por_duracao'].items():
+        table.add_row(formatar_duracao(duracao), str(completas), str(total), f"{completas / total:.0%}")
+    console.print(table)
+
+    table = Table(title="📈 Tendência (últimos 30 dias)", box=box.ROUNDED, border_style="blue")
+    table.add_column("Data", style="green")
+    table.add_column("Foco", style="yellow", justify="right")
+    table.add_column("Média 7d", justify="right")
+    table.add_column("Média 30d", justify="right")
+    maximo_dia = max((dia['minutos'] for dia in relatorio['tendencia']), default=0)
+    table.add_column("", style="red")
+    for dia in relatorio['tendencia']:
+        barra = "█" * round(dia['minutos'] / maximo_dia * 20) if maximo_dia else ""
+        table.add_row(
+            dia['data'],
+            formatar_duracao(dia['minutos']),
+            formatar_duracao(round(dia['media_7'])),
+            formatar_duracao(round(dia['media_30'])),
+            barra
+        )
+    console.print(table)
+    console.print(Text(f"Tempo total de foco: {formatar_duracao(relatorio['total_minutos'])}", style="bold"))
+
+
+def gerar_svg_mapa_calor(relatorio, celula=18):
+    """
+    Gera o mapa de calor em SVG.
+
+    Parâmetros:
+    relatorio (dict): Relatório gerado por gerar_relatorio.
+    celula (int): Tamanho de cada célula, em pixels.
+
+    Retorna:
+    str: Documento SVG.
+    """
+    mapa = relatorio['mapa_calor']
+    maximo = max(max(linha) for linha in mapa) or 1
+    margem_x, margem_y = 40, 20
+    largura = margem_x + 24 * celula
+    altura = margem_y + 7 * celula
+
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{largura}" height="{altura}" '
+        f'font-family="sans-serif" font-size="10">'
+    ]
+    for hora in range(0, 24, 3):
+        partes.append(f'<text x="{margem_x + hora * celula}" y="12">{hora}h</text>')
+    for indice, linha in enumerate(mapa):
+        y = margem_y + indice * celula
+        partes.append(f'<text x="0" y="{y + celula - 5}">{DIAS_SEMANA[indice]}</text>')
+        for hora, valor in enumerate(linha):
+            opacidade = 0.08 + 0.92 * valor / maximo if valor else 0.04
+            partes.append(
+                f'<rect x="{margem_x + hora * celula}" y="{y}" width="{celula - 2}" height="{celula - 2}" '
+                f'fill="#d62728" fill-opacity="{opacidade:.2f}"><title>{DIAS_SEMANA[indice]} {hora}h: '
+                f'{valor:.0f} min</title></rect>'
+            )
+    partes.append('</svg>')
+    return "\n".join(partes)
+
+
+def gerar_html(relatorio):
+    """
+    Gera o relatório completo em HTML, com o mapa de calor em SVG embutido.
+
+    Parâmetros:
+    relatorio (dict): Relatório gerado por gerar_relatorio.
+
+    Retorna:
+    str: Documento HTML.
+    """
+    linhas_conclusao = "\n".join(
+        f"<tr><td>{html.escape(formatar_duracao(duracao))}</td><td>{completas}</td><td>{total}</td>"
+        f"<td>{completas / total:.0%}</td></tr>"
+        for duracao, (completas, total) in relatorio['conclusao_por_duracao'].items()
+    )
+    linhas_tendencia = "\n".join(
+        f"<tr><td>{dia['data']}</td><td>{dia['minutos']:.0f}</td><td>{dia['media_7']:.1f}</td>"
+        f"<td>{dia['media_30']:.1f}</td></tr>"
+        for dia in relatorio['tendencia']
+    )
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>Pomo CLI - Relatório de Foco</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 10px; text-align: right; }}
+</style>
+</head>
+<body>
+<h1>🍅 Relatório de Foco</h1>
+<p>Tempo total de foco: {html.escape(formatar_duracao(relatorio['total_minutos']))}</p>
+<h2>Foco por dia da semana e hora</h2>
+{gerar_svg_mapa_calor(relatorio)}
+<h2>Conclusão por duração</h2>
+<table>
+<tr><th>Duração</th><th>Completas</th><th>Total</th><th>Taxa</th></tr>
+{linhas_conclusao}
+</table>
+<h2>Tendência (últimos 30 dias)</h2>
+<table>
+<tr><th>Data</th><th>Minutos</th><th>Média 7d</th><th>Média 30d</th></tr>
+{linhas_tendencia}
+</table>
+</body>
+</html>
+"""
+
+
+def exportar_relatorio(caminho, relatorio=None):
+    """
+    Exporta o relatório para HTML ou SVG, conforme a extensão do arquivo.
+
+    Parâmetros:
+    caminho (str): Arquivo de destino (.html ou .svg).
+    relatorio (dict): Relatório gerado. Se None, gera a partir do histórico.
+
+    Retorna:
+    bool: True se exportou com sucesso, False caso contrário.
+    """
+    relatorio = relatorio or gerar_relatorio()
+    conteudo = gerar_svg_mapa_calor(relatorio) if caminho.lower().endswith('.svg') else gerar_html(relatorio)
+    try:
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+        return True
+    except Exception as e:
+        print(f"❌ Erro ao exportar relatório: {e}")
+        return False
@@ -0,0 +1,82 @@
+"""
+Módulo de relógio - Fontes de tempo injetáveis para o timer
+
+O timer consulta o tempo apenas pelo relógio recebido. O relógio real usa
+time.monotonic e datetime.now; o simulado avança instantaneamente quando o
+timer dorme, o que permite rodar sessões completas em milissegundos.
+"""
+
+import time
+from datetime import datetime, timedelta
+from funcoes import aguardar_ate
+
+
+class RelogioReal:
+    """Relógio do sistema."""
+
+    simulado = False
+
+    def monotonico(self):
+        """Retorna o instante monotônico atual, em segundos."""
+        return time.monotonic()
+
+    def agora(self):
+        """Retorna a data e hora atuais."""
+        return datetime.now()
+
+    def dormir(self, segundos):
+        """Dorme pelo número de segundos informado."""
+        time.sleep(segundos)
+
+    def aguardar_ate(self, prazo):
+        """Espera com alta resolução até o instante monotônico informado."""
+        aguardar_ate(prazo)
+
+
+class RelogioSimulado:
+    """
+    Relógio simulado: o tempo só avança quando o timer dorme ou espera.
+
+    Parâmetros:
+    inicio (datetime): Data e hora correspondentes ao instante zero.
+    interrupcoes (list): Instantes (em segundos desde o início) em que um
+                         KeyboardInterrupt é lançado, simulando Ctrl+C.
+    """
+
+    simulado = True
+
+    def __init__(self, inicio=None, interrupcoes=None):
+        self.inicio = inicio or datetime(2025, 1, 1, 9, 0, 0)
+        self.instante = 0.0
+        self.interrupcoes = sorted(interrupcoes or [])
+
+    def monotonico(self):
+        """Retorna o instante simulado, em segundos desde o início."""
+        return self.instante
+
+    def agora(self):
+        """Retorna a data e hora simuladas."""
+        return self.inicio + timedelta(seconds=self.instante)
+
+    def avancar(self, segundos):
+        """
+        Avança o relógio, lançando KeyboardInterrupt se passar por uma
+        interrupção agendada.
+        """
+        destino = self.instante + max(segundos, 0.0)
+        if self.interrupcoes and self.interrupcoes[0] <= destino:
+            self.instante = max(self.instante, self.interrupcoes.pop(0))
+            raise KeyboardInterrupt
+        self.instante = destino
+
+    def dormir(self, segundos):
+        """Avança o relógio pelo número de segundos informado."""
+        self.avancar(segundos)
+
+    def aguardar_ate(self, prazo):
+        """Avança o relógio até o instante informado."""
+        self.avancar(prazo - self.instante)
+
+
+# Relógio usado quando nenhum outro é informado
+RELOGIO_PADRAO = RelogioReal()
@@ -0,0 +1,236 @@
+"""
+Módulo de replay - Reproduz uma sessão registrada no log de eventos
+
+Lê a configuração, as respostas (com o tempo que o usuário levou para
+responder), as recargas de configuração e as interrupções de uma sessão Pomodoro do log de eventos,
+roda a mesma sessão com o relógio simulado e compara a sequência de
+transições (fases, respostas e fim da sessão) obtida com a registrada.
+"""
+
+import sys
+from datetime import datetime
+from config import CONFIGURACOES_PADRAO
+from eventos import EVENTOS_FILE, ler_eventos
+from relogio import RelogioSimulado
+from simulacao import simular_sessao
+
+
+# Eventos comparados entre a sessão registrada e a reproduzida. Os ticks
+# dependem da exibição e só entram no resumo de desvio; as notificações
+# ficam de fora porque uma execução real registra uma por backend tentado
+# (falha + alternativo) e as de metas, que a simulação não produz
+TRANSICOES = ('timer_inicio', 'timer_fim', 'resposta', 'sessao_fim')
+
+# Diferença máxima, em segundos, entre os intervalos de dois eventos
+# consecutivos na sessão registrada e na reproduzida
+TOLERANCIA_SEGUNDOS = 0.5
+
+
+def listar_sessoes(caminho=EVENTOS_FILE):
+    """
+    Lista as sessões presentes no log de eventos.
+
+    Parâmetros:
+    caminho (str): Arquivo do log.
+
+    Retorna:
+    list: Dicts com 'sessao', 'modo', 'ts' e 'motivo' (None se não terminou).
+    """
+    sessoes = {}
+    for evento in ler_eventos(caminho):
+        if evento.get('evento') == 'sessao_inicio':
+            sessoes[evento['sessao']] = {
+                'sessao': evento['sessao'],
+                'modo': evento.get('modo'),
+                'ts': evento.get('ts'),
+                'motivo': None
+            }
+        elif evento.get('evento') == 'sessao_fim' and evento.get('sessao') in sessoes:
+            sessoes[evento['sessao']]['motivo'] = evento.get('motivo')
+    return list(sessoes.values())
+
+
+def carregar_sessao(sessao=None, caminho=EVENTOS_FILE):
+    """
+    Carrega os eventos de uma sessão do log.
+
+    Parâmetros:
+    sessao (str): Identificador da sessão. Se None, usa a última sessão Pomodoro.
+    caminho (str): Arquivo do log.
+
+    Retorna:
+    list: Eventos da sessão, em ordem (vazia se não encontrada).
+    """
+    if sessao is None:
+        pomodoros = [s for s in listar_sessoes(caminho) if s['modo'] == 'pomodoro']
+        if not pomodoros:
+            return []
+        sessao = pomodoros[-1]['sessao']
+    return [evento for evento in ler_eventos(caminho) if evento.get('sessao') == sessao]
+
+
+def _chave(evento):
+    """Identifica uma transição para a comparação, sem os tempos medidos."""
+    nome = evento['evento']
+    if nome in ('timer_inicio', 'timer_fim'):
+        return (nome, evento.get('tipo'), evento.get('completo'))
+    if nome == 'resposta':
+        return (nome, evento.get('pergunta'), evento.get('resposta'))
+    return (nome, evento.get('motivo'))
+
+
+def _sequencia(eventos):
+    """Transições da sessão como pares (segundos desde o início, chave)."""
+    inicio = eventos[0]['t']
+    return [(evento['t'] - inicio, _chave(evento)) for evento in eventos if evento['evento'] in TRANSICOES]
+
+
+def _resumo_ticks(eventos):
+    """Quantidade, desvio médio e desvio máximo (ms) dos ticks registrados."""
+    desvios = [evento['desvio_ms'] for evento in eventos if evento['evento'] == 'tick']
+    if not desvios:
+        return {'ticks': 0, 'desvio_medio_ms': 0.0, 'desvio_maximo_ms': 0.0}
+    return {
+        'ticks': len(desvios),
+        'desvio_medio_ms': sum(desvios) / len(desvios),
+        'desvio_maximo_ms': max(desvios, key=abs)
+    }
+
+
+def reproduzir_sessao(eventos):
+    """
+    Reproduz uma sessão Pomodoro registrada com o relógio simulado.
+
+    Parâmetros:
+    eventos (list): Eventos da sessão (ver carregar_sessao).
+
+    Retorna:
+    dict: 'original' e 'reproduzida' (listas de (segundos, chave)),
+          'divergencias' (índices), 'reproduzida_ok', 'pausas' (pausas por
+          ociosidade registradas, que o relógio simulado não reproduz) e o
+          resumo dos ticks.
+    """
+    inicio = eventos[0]
+    if inicio.get('evento') != 'sessao_inicio' or inicio.get('modo') != 'pomodoro':
+        raise ValueError("o replay só reproduz sessões Pomodoro registradas desde o início")
+
+    config = dict(CONFIGURACOES_PADRAO, **inicio.get('config', {}))
+    respostas = [(evento['resposta'], evento['espera']) for evento in eventos if evento['evento'] == 'resposta']
+    interrupcoes = [
+        evento['t'] - inicio['t'] for evento in eventos
+        if evento['evento'] == 'timer_fim' and not evento.get('completo')
+    ]
+    fim = eventos[-1]
+    if fim['evento'] == 'sessao_fim' and fim.get('motivo') == 'interrompida':
+        # Ctrl+C fora de um timer (numa pergunta ou na pausa entre fases)
+        interrupcoes.append(fim['t'] - inicio['t'])
+        respostas.append((True, float('inf')))
+
+    recargas = {
+        evento['fase']: evento['alteracoes'] for evento in eventos
+        if evento['evento'] == 'config_recarregada'
+    }
+
+    relogio = RelogioSimulado(inicio=datetime.fromisoformat(inicio['ts']), interrupcoes=interrupcoes)
+    resultado = simular_sessao(
+        config, respostas=respostas, relogio=relogio, recargas=recargas,
+        ciclo_inicial=inicio.get('ciclo_inicial', 1)
+    )
+
+    original = _sequencia(eventos)
+    reproduzida = _sequencia(resultado['eventos'])
+    divergencias = []
+    for indice in range(max(len(original), len(reproduzida))):
+        if indice >= len(original) or indice >= len(reproduzida):
+            divergencias.append(indice)
+            continue
+        (tempo_o, chave_o), (tempo_r, chave_r) = original[indice], reproduzida[indice]
+        if chave_o != chave_r:
+            divergencias.append(indice)
+        elif indice and abs((tempo_o - original[indice - 1][0]) - (tempo_r - reproduzida[indice - 1][0])) > TOLERANCIA_SEGUNDOS:
+            divergencias.append(indice)
+
+    return {
+        'original': original,
+        'reproduzida': reproduzida,
+        'divergencias': divergencias,
+        'reproduzida_ok': not divergencias,
+        'pausas': sum(1 for evento in eventos if evento['evento'] == 'pausa'),
+        **_resumo_ticks(eventos)
+    }
+
+
+def _descrever(chave):
+    """Texto curto de uma transição."""
+    return " ".join(str(parte) for parte in chave if parte is not None)
+
+
+def main_replay(argumentos):
+    """
+    Ponto de entrada de `pomo replay`.
+
+    Uso:
+    replay [SESSAO]          reproduz a sessão (padrão: a última Pomodoro)
+    replay listar            lista as sessões do log
+    replay ... --arquivo F   usa outro arquivo de log
+
+    Retorna:
+    int: 0 se a sessão foi reproduzida sem divergências, 1 caso contrário.
+    """
+    argumentos = list(argumentos)
+    caminho = EVENTOS_FILE
+    if '--arquivo' in argumentos:
+        posicao = argumentos.index('--arquivo')
+        if posicao + 1 >= len(argumentos):
+            print(main_replay.__doc__)
+            return 1
+        caminho = argumentos[posicao + 1]
+        del argumentos[posicao:posicao + 2]
+
+    if argumentos[:1] == ['listar']:
+        sessoes = listar_sessoes(caminho)
+        if not sessoes:
+            print("📭 Nenhuma sessão no log de eventos.")
+        for sessao in sessoes:
+            print(f"  {sessao['sessao']}  {sessao['ts'] or '-':<26}  {sessao['modo'] or '-':<13}  {sessao['motivo'] or 'sem fim'}")
+        return 0
+
+    eventos = carregar_sessao(argumentos[0] if argumentos else None, caminho)
+    if not eventos:
+        print("📭 Sessão não encontrada no log de eventos.")
+        return 1
+    try:
+        resultado = reproduzir_sessao(eventos)
+    except ValueError as e:
+        print(f"⚠️  {e}")
+        return 1
+
+    print(f"🔁 Replay da sessão {eventos[0]['sessao']} ({eventos[0]['ts']})\n")
+    print(f"  {'#':>3}  {'original':>10}  {'replay':>10}  transição")
+    divergencias = set(resultado['divergencias'])
+    for indice in range(max(len(resultado['original']), len(resultado['reproduzida']))):
+        tempo_o, chave_o = resultado['original'][indice] if indice < len(resultado['original']) else (None, None)
+        tempo_r, chave_r = resultado['reproduzida'][indice] if indice < len(resultado['reproduzida']) else (None, None)
+        texto = _descrever(chave_o or chave_r)
+        if chave_o and chave_r and chave_o != chave_r:
+            texto = f"{_descrever(chave_o)} ≠ {_descrever(chave_r)}"
+        marca = "❌" if indice in divergencias else "✅"
+        coluna_o = f"{tempo_o:9.3f}s" if tempo_o is not None else f"{'-':>10}"
+        coluna_r = f"{tempo_r:9.3f}s" if tempo_r is not None else f"{'-':>10}"
+        print(f"  {indice + 1:>3}  {coluna_o}  {coluna_r}  {marca} {texto}")
+
+    print(
+        f"\n⏱️  {resultado['ticks']} ticks, desvio médio {resultado['desvio_medio_ms']:.1f} ms, "
+        f"máximo {resultado['desvio_maximo_ms']:.1f} ms"
+    )
+    if resultado['pausas']:
+        print(f"⏸  {resultado['pausas']} pausa(s) por ociosidade registradas não são reproduzidas pelo relógio simulado.")
+    if resultado['reproduzida_ok']:
+        print("✅ Sequência reproduzida exatamente.")
+        return 0
+    print(f"❌ {len(divergencias)} divergência(s) entre o log e o replay.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_replay(sys.argv[1:]))
@@ -0,0 +1,581 @@
+"""
+Módulo de equipe - Servidor local que agrega o histórico de vários usuários
+
+Cada instância do pomo envia suas sessões em lotes (POST /eventos). O
+servidor mantém em memória os agregados por usuário e da equipe, grava
+snapshots periódicos e responde às consultas sem reprocessar sessões:
+
+    GET  /resumo             Estatísticas da equipe e de cada usuário
+    GET  /usuarios/<nome>    Estatísticas de um usuário
+    POST /eventos            {"usuario": "ana", "sessoes": [...]}
+
+O envio é idempotente: as sessões são identificadas por (dispositivo,
+timestamp), como na sincronização entre dispositivos, e o servidor guarda
+as chaves já aceitas de cada usuário; sessões repetidas são ignoradas,
+cheguem em qualquer ordem. Um lote com alguma sessão inválida é recusado
+inteiro (400), sem alterar os agregados, e um corpo maior que
+TAMANHO_MAXIMO_CORPO é recusado (413) antes de ser lido.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+from historico import (
+    acumular_sessao,
+    desserializar_agregado,
+    iterar_historico,
+    novo_agregado,
+    resumir_agregado,
+    serializar_agregado
+)
+
+
+# Porta padrão do servidor
+PORTA_PADRAO = 8765
+
+# Arquivo de snapshot dos agregados
+SNAPSHOT_FILE = 'equipe_snapshot.json'
+
+# Intervalo entre snapshots, em segundos
+INTERVALO_SNAPSHOT = 30
+
+# Arquivo local com as sessões já enviadas a cada servidor
+ENVIO_FILE = 'equipe_envio.json'
+
+# Sessões por lote enviado pelo cliente
+TAMANHO_LOTE = 500
+
+# Tamanho máximo do corpo de um POST, em bytes (um lote de TAMANHO_LOTE
+# sessões ocupa poucas centenas de KB)
+TAMANHO_MAXIMO_CORPO = 8 * 1024 * 1024
+
+
+def chave_envio(sessao):
+    """
+    Identidade de uma sessão recebida: (dispositivo, timestamp). Sessões
+    sem dispositivo (clientes antigos) usam o dispositivo vazio.
+
+    Retorna:
+    tuple: (dispositivo, timestamp).
+    """
+    return (str(sessao.get('dispositivo') or ''), sessao['timestamp'])
+
+
+def _numero_valido(valor):
+    """Verifica se o valor é um número finito e não negativo (bool não conta)."""
+    return (isinstance(valor, (int, float)) and not isinstance(valor, bool)
+            and math.isfinite(valor) and valor >= 0)
+
+
+def validar_sessao(sessao):
+    """
+    Confere os campos usados pelos agregados numa sessão recebida.
+
+    Parâmetros:
+    sessao: Item do lote enviado pelo cliente.
+
+    Retorna:
+    dict: Cópia da sessão, com 'data' preenchida pelo timestamp se ausente.
+
+    Lança:
+    ValueError: Se a sessão não puder ser somada aos agregados.
+    """
+    if not isinstance(sessao, dict):
+        raise ValueError("sessão não é um objeto")
+    timestamp = sessao.get('timestamp')
+    if not isinstance(timestamp, str):
+        raise ValueError("timestamp ausente")
+    try:
+        datetime.fromisoformat(timestamp)
+    except ValueError:
+        raise ValueError(f"timestamp inválido: {timestamp!r}") from None
+    if not isinstance(sessao.get('tipo'), str):
+        raise ValueError("tipo ausente")
+    if not _numero_valido(sessao.get('duracao_minutos', 0)):
+        raise ValueError(f"duracao_minutos inválida: {sessao.get('duracao_minutos')!r}")
+    if sessao.get('segundos_ativos') is not None and not _numero_valido(sessao['segundos_ativos']):
+        raise ValueError(f"segundos_ativos inválido: {sessao['segundos_ativos']!r}")
+    if not isinstance(sessao.get('completa', True), bool):
+        raise ValueError(f"completa inválida: {sessao.get('completa')!r}")
+    if not isinstance(sessao.get('data', ''), str):
+        raise ValueError(f"data inválida: {sessao.get('data')!r}")
+    return dict(sessao, data=sessao.get('data') or timestamp[:10])
+
+
+class AgregadorEquipe:
+    """
+    Agregados em memória por usuário e da equipe.
+
+    Parâmetros:
+    caminho_snapshot (str): Arquivo de snapshot. Se None, não grava snapshots.
+    """
+
+    def __init__(self, caminho_snapshot=None):
+        self.caminho_snapshot = caminho_snapshot
+        self.equipe = novo_agregado()
+        self.usuarios = {}
+        # Chaves (dispositivo, timestamp) já aceitas de cada usuário
+        self.vistas = {}
+        # Snapshots antigos guardavam só o último timestamp aceito: sessões
+        # até ele já foram contadas
+        self.limite_legado = {}
+        self.versao = 0
+        self._versao_snapshot = 0
+        self._trava = threading.Lock()
+
+    def ingerir(self, usuario, sessoes):
+        """
+        Soma um lote de sessões de um usuário aos agregados. O lote todo é
+        validado antes: se alguma sessão for inválida, nada é somado.
+
+        Parâmetros:
+        usuario (str): Nome do usuário.
+        sessoes (list): Sessões, em qualquer ordem.
+
+        Retorna:
+        dict: Quantidade de sessões 'aceitas' e 'ignoradas' (já recebidas).
+
+        Lança:
+        ValueError: Se alguma sessão do lote for inválida.
+        """
+        validas = []
+        for indice, sessao in enumerate(sessoes):
+            try:
+                validas.append(validar_sessao(sessao))
+            except ValueError as e:
+                raise ValueError(f"sessão {indice}: {e}") from None
+        validas.sort(key=lambda sessao: sessao['timestamp'])
+
+        aceitas = 0
+        with self._trava:
+            agregado = self.usuarios.setdefault(usuario, novo_agregado())
+            vistas = self.vistas.setdefault(usuario, set())
+            limite = self.limite_legado.get(usuario, '')
+            for sessao in validas:
+                chave = chave_envio(sessao)
+                if chave in vistas or sessao['timestamp'] <= limite:
+                    continue
+                vistas.add(chave)
+                acumular_sessao(agregado, sessao)
+                acumular_sessao(self.equipe, dict(sessao, usuario=usuario))
+                aceitas += 1
+            if aceitas:
+                self.versao += 1
+        return {'aceitas': aceitas, 'ignoradas': len(sessoes) - aceitas}
+
+    def resumo(self, hoje=None):
+        """
+        Retorna as estatísticas da equipe e de cada usuário.
+
+        Parâmetros:
+        hoje (str): Data 'YYYY-MM-DD' das estatísticas do dia.
+
+        Retorna:
+        dict: 'equipe' e 'usuarios' com estatísticas no formato de obter_estatisticas.
+        """
+        with self._trava:
+            return {
+                'equipe': resumir_agregado(self.equipe, hoje),
+                'usuarios': {nome: resumir_agregado(agregado, hoje) for nome, agregado in self.usuarios.items()}
+            }
+
+    def usuario(self, nome, hoje=None):
+        """
+        Retorna as estatísticas de um usuário.
+
+        Retorna:
+        dict | None: Estatísticas, ou None se o usuário não existe.
+        """
+        with self._trava:
+            agregado = self.usuarios.get(nome)
+            if agregado is None:
+                return None
+            resumo = resumir_agregado(agregado, hoje)
+            resumo['recentes'] = list(agregado['recentes'])
+            return resumo
+
+    def salvar_snapshot(self):
+        """
+        Grava os agregados de forma atômica, se mudaram desde o último snapshot.
+
+        Retorna:
+        bool: True se gravou, False se não havia mudanças ou houve erro.
+        """
+        if not self.caminho_snapshot:
+            return False
+        with self._trava:
+            if self.versao == self._versao_snapshot:
+                return False
+            dados = {
+                'equipe': serializar_agregado(self.equipe),
+                'usuarios': {nome: serializar_agregado(a) for nome, a in self.usuarios.items()},
+                'vistas': {nome: sorted(chaves) for nome, chaves in self.vistas.items()},
+                'limite_legado': dict(self.limite_legado)
+            }
+            versao = self.versao
+        temporario = self.caminho_snapshot + '.tmp'
+        try:
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(dados, f, ensure_ascii=False)
+            os.replace(temporario, self.caminho_snapshot)
+        except Exception as e:
+            print(f"❌ Erro ao salvar snapshot da equipe: {e}")
+            return False
+        self._versao_snapshot = versao
+        return True
+
+    def carregar_snapshot(self):
+        """
+        Restaura os agregados do último snapshot, se existir.
+
+        Retorna:
+        bool: True se restaurou, False caso contrário.
+        """
+        if not self.caminho_snapshot or not os.path.exists(self.caminho_snapshot):
+            return False
+        try:
+            with open(self.caminho_snapshot, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except Exception as e:
+            print(f"⚠️  Erro ao carregar snapshot da equipe: {e}")
+            return False
+        with self._trava:
+            self.equipe = desserializar_agregado(dados['equipe'])
+            self.usuarios = {nome: desserializar_agregado(a) for nome, a in dados['usuarios'].items()}
+            self.vistas = {
+                nome: {tuple(chave) for chave in chaves}
+                for nome, chaves in dados.get('vistas', {}).items()
+            }
+            self.limite_legado = dados.get('limite_legado', dados.get('ultimo_timestamp', {}))
+        return True
+
+
+class _ManipuladorEquipe(BaseHTTPRequestHandler):
+    """Manipulador HTTP das rotas do servidor de equipe."""
+
+    def _responder(self, status, dados):
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        agregador = self.server.agregador
+        if self.path == '/resumo':
+            self._responder(200, agregador.resumo())
+        elif self.path.startswith('/usuarios/'):
+            resumo = agregador.usuario(unquote(self.path[len('/usuarios/'):]))
+            if resumo is None:
+                self._responder(404, {'erro': 'usuário não encontrado'})
+            else:
+                self._responder(200, resumo)
+        else:
+            self._responder(404, {'erro': 'rota não encontrada'})
+
+    def do_POST(self):
+        if self.path != '/eventos':
+            self._responder(404, {'erro': 'rota não encontrada'})
+            return
+        # O tamanho é conferido antes da leitura: um valor negativo faria
+        # rfile.read esperar o cliente fechar a conexão
+        try:
+            tamanho = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0 or tamanho > TAMANHO_MAXIMO_CORPO:
+            self.close_connection = True
+            if tamanho < 0:
+                self._responder(400, {'erro': 'Content-Length inválido'})
+            else:
+                self._responder(413, {'erro': f"lote maior que {TAMANHO_MAXIMO_CORPO} bytes"})
+            return
+        try:
+            dados = json.loads(self.rfile.read(tamanho))
+            usuario = str(dados['usuario'])
+            sessoes = dados['sessoes']
+            if not isinstance(sessoes, list):
+                raise TypeError
+        except (KeyError, TypeError, ValueError):
+            self._responder(400, {'erro': 'lote inválido'})
+            return
+        try:
+            resultado = self.server.agregador.ingerir(usuario, sessoes)
+        except ValueError as e:
+            self._responder(400, {'erro': f"lote inválido: {e}"})
+            return
+        self._responder(200, resultado)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def criar_servidor(porta=PORTA_PADRAO, host='127.0.0.1', caminho_snapshot=SNAPSHOT_FILE):
+    """
+    Cria o servidor de equipe, restaurando o último snapshot.
+
+    Parâmetros:
+    porta (int): Porta TCP (0 escolhe uma porta livre).
+    host (str): Endereço de escuta.
+    caminho_snapshot (str): Arquivo de snapshot. Se None, não grava snapshots.
+
+    Retorna:
+    ThreadingHTTPServer: Servidor com o atributo `agregador`.
+    """
+    servidor = ThreadingHTTPServer((host, porta), _ManipuladorEquipe)
+    servidor.agregador = AgregadorEquipe(caminho_snapshot)
+    servidor.agregador.carregar_snapshot()
+    return servidor
+
+
+def executar_servidor(porta=PORTA_PADRAO, host='127.0.0.1', intervalo_snapshot=INTERVALO_SNAPSHOT):
+    """
+    Executa o servidor até Ctrl+C, gravando snapshots periódicos.
+
+    Parâmetros:
+    porta (int): Porta TCP.
+    host (str): Endereço de escuta.
+    intervalo_snapshot (float): Intervalo entre snapshots, em segundos.
+    """
+    servidor = criar_servidor(porta, host)
+    parar = threading.Event()
+
+    def gravar_snapshots():
+        while not parar.wait(intervalo_snapshot):
+            servidor.agregador.salvar_snapshot()
+
+    threading.Thread(target=gravar_snapshots, name='pomo-snapshot-equipe', daemon=True).start()
+    print(f"🍅 Servidor de equipe em http://{host}:{servidor.server_address[1]}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        parar.set()
+        servidor.server_close()
+        servidor.agregador.salvar_snapshot()
+
+
+def enviar_sessoes(url, usuario, sessoes, timeout=10):
+    """
+    Envia um lote de sessões ao servidor de equipe.
+
+    Parâmetros:
+    url (str): Endereço base do servidor (ex: http://127.0.0.1:8765).
+    usuario (str): Nome do usuário.
+    sessoes (list): Sessões a enviar.
+    timeout (float): Tempo máximo da requisição, em segundos.
+
+    Retorna:
+    dict: Resposta do servidor ('aceitas' e 'ignoradas').
+    """
+    corpo = json.dumps({'usuario': usuario, 'sessoes': sessoes}, ensure_ascii=False).encode('utf-8')
+    requisicao = urllib.request.Request(
+        url.rstrip('/') + '/eventos',
+        data=corpo,
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with urllib.request.urlopen(requisicao, timeout=timeout) as resposta:
+        return json.loads(resposta.read())
+
+
+def consultar(url, caminho='/resumo', timeout=10):
+    """
+    Consulta uma rota GET do servidor de equipe.
+
+    Retorna:
+    dict: Resposta do servidor.
+    """
+    with urllib.request.urlopen(url.rstrip('/') + caminho, timeout=timeout) as resposta:
+        return json.loads(resposta.read())
+
+
+def _ler_envios():
+    """Lê o registro local de envios, por servidor."""
+    try:
+        with open(ENVIO_FILE, 'r', encoding='utf-8') as f:
+            envios = json.load(f)
+        return envios if isinstance(envios, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _salvar_envios(envios):
+    """Grava o registro local de envios de forma atômica."""
+    temporario = ENVIO_FILE + '.tmp'
+    try:
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(envios, f, ensure_ascii=False)
+        os.replace(temporario, ENVIO_FILE)
+    except OSError as e:
+        print(f"⚠️  Erro ao salvar o registro de envios: {e}")
+
+
+def sincronizar_com_equipe(url, usuario):
+    """
+    Envia ao servidor as sessões locais ainda não enviadas, em lotes. As
+    sessões enviadas são lembradas pela chave (dispositivo, timestamp), então
+    sessões importadas de outros dispositivos ou gravadas depois de limpar
+    o histórico também são enviadas.
+
+    Parâmetros:
+    url (str): Endereço base do servidor.
+    usuario (str): Nome do usuário.
+
+    Retorna:
+    int: Número de sessões aceitas pelo servidor.
+    """
+    from sincronizacao import obter_dispositivo
+
+    dispositivo = obter_dispositivo()
+    envios = _ler_envios()
+    registro = envios.get(url)
+    if isinstance(registro, str):
+        # Registro antigo: só o timestamp da última sessão enviada
+        registro = {'limite': registro, 'enviadas': []}
+    elif not isinstance(registro, dict):
+        registro = {'limite': '', 'enviadas': []}
+    limite = registro.get('limite', '')
+    enviadas = {tuple(chave) for chave in registro.get('enviadas', [])}
+
+    def enviar(lote):
+        resposta = enviar_sessoes(url, usuario, lote)
+        enviadas.update(chave_envio(sessao) for sessao in lote)
+        return resposta['aceitas']
+
+    # O histórico é percorrido em streaming; só um lote fica em memória
+    aceitas = 0
+    lote = []
+    try:
+        for sessao in iterar_historico():
+            sessao = dict(sessao, dispositivo=sessao.get('dispositivo', dispositivo))
+            timestamp = sessao.get('timestamp')
+            if not isinstance(timestamp, str) or timestamp <= limite or chave_envio(sessao) in enviadas:
+                continue
+            lote.append(sessao)
+            if len(lote) == TAMANHO_LOTE:
+                aceitas += enviar(lote)
+                lote = []
+        if lote:
+            aceitas += enviar(lote)
+    finally:
+        # Os lotes aceitos ficam registrados mesmo se um lote seguinte falhar
+        envios[url] = {'limite': limite, 'enviadas': sorted(enviadas)}
+        _salvar_envios(envios)
+    return aceitas
+
+
+def simular_clientes(url, usuarios=10, dias=30, tamanho_lote=50):
+    """
+    Simula vários usuários enviando sessões em paralelo, para testes locais.
+    As sessões são geradas pela simulação com relógio acelerado.
+
+    Parâmetros:
+    url (str): Endereço base do servidor.
+    usuarios (int): Número de usuários simulados.
+    dias (int): Dias de sessões por usuário.
+    tamanho_lote (int): Sessões por lote enviado.
+
+    Retorna:
+    dict: Total de sessões enviadas e aceitas e o tempo gasto.
+    """
+    from relogio import RelogioSimulado
+    from simulacao import simular_sessao
+
+    totais = {'enviadas': 0, 'aceitas': 0}
+    trava = threading.Lock()
+
+    def cliente(indice):
+        relogio = RelogioSimulado()
+        sessoes = []
+        for dia in range(dias):
+            relogio.instante = max(relogio.instante, dia * 86400.0)
+            sessoes.extend(simular_sessao(relogio=relogio)['sessoes'])
+        aceitas = 0
+        for inicio in range(0, len(sessoes), tamanho_lote):
+            aceitas += enviar_sessoes(url, f"usuario{indice}", sessoes[inicio:inicio + tamanho_lote])['aceitas']
+        with trava:
+            totais['enviadas'] += len(sessoes)
+            totais['aceitas'] += aceitas
+
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=cliente, args=(i,)) for i in range(usuarios)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    totais['segundos'] = time.perf_counter() - inicio
+    return totais
+
+
+def _inteiro_argumento(texto, minimo, maximo=None):
+    """
+    Converte um argumento de linha de comando num inteiro dentro dos limites.
+
+    Lança:
+    ValueError: Se o argumento não for um inteiro entre minimo e maximo.
+    """
+    valor = int(texto)
+    if valor < minimo or (maximo is not None and valor > maximo):
+        raise ValueError(f"valor fora dos limites: {texto}")
+    return valor
+
+
+def main_equipe(argumentos):
+    """
+    Ponto de entrada de `pomo equipe`.
+
+    Uso:
+    equipe servidor [PORTA]
+    equipe enviar URL USUARIO
+    equipe resumo URL
+    equipe simular URL [USUARIOS] [DIAS]
+
+    Retorna:
+    int: Código de saída.
+    """
+    comando = argumentos[0] if argumentos else ''
+    if comando == 'servidor':
+        try:
+            porta = _inteiro_argumento(argumentos[1], 0, 65535) if len(argumentos) > 1 else PORTA_PADRAO
+        except ValueError:
+            print(main_equipe.__doc__)
+            return 1
+        executar_servidor(porta)
+    elif comando == 'enviar' and len(argumentos) >= 3:
+        try:
+            print(f"✅ {sincronizar_com_equipe(argumentos[1], argumentos[2])} sessões enviadas")
+        except OSError as e:
+            print(f"❌ Erro ao enviar sessões: {e}")
+            return 1
+    elif comando == 'resumo' and len(argumentos) >= 2:
+        print(json.dumps(consultar(argumentos[1]), indent=4, ensure_ascii=False))
+    elif comando == 'simular' and len(argumentos) >= 2:
+        try:
+            usuarios = _inteiro_argumento(argumentos[2], 1) if len(argumentos) > 2 else 10
+            dias = _inteiro_argumento(argumentos[3], 1) if len(argumentos) > 3 else 30
+        except ValueError:
+            print(main_equipe.__doc__)
+            return 1
+        resultado = simular_clientes(argumentos[1], usuarios, dias)
+        print(
+            f"{resultado['aceitas']}/{resultado['enviadas']} sessões aceitas "
+            f"em {resultado['segundos']:.2f} s"
+        )
+    else:
+        print(main_equipe.__doc__)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_equipe(sys.argv[1:]))
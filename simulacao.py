@@ -0,0 +1,147 @@
+"""
+Módulo de simulação - Executa sessões Pomodoro com relógio simulado
+
+Roda o mesmo fluxo de iniciar_sessao_pomodoro, com relógio simulado e
+respostas roteirizadas, sem exibição e sem tocar no histórico nem no
+desktop: os registros e as notificações são capturados e devolvidos.
+Sessões de vários ciclos rodam em milissegundos.
+"""
+
+import itertools
+import sys
+import time
+from datetime import timedelta
+from config import CONFIGURACOES_PADRAO, validar_configuracoes
+from eventos import capturar_eventos
+from historico import capturar_sessoes
+from notificacoes import capturar_notificacoes
+from relogio import RelogioSimulado
+from timer import iniciar_sessao_pomodoro
+
+
+def _roteiro_respostas(respostas, relogio):
+    """
+    Cria a função de confirmação a partir das respostas roteirizadas.
+    Cada resposta é um bool ou um par (bool, segundos que o usuário levou
+    para responder). Quando as respostas acabam, usa o valor padrão da pergunta.
+    """
+    pendentes = list(respostas or [])
+
+    def perguntar(texto, default):
+        if not pendentes:
+            return default
+        resposta = pendentes.pop(0)
+        if isinstance(resposta, tuple):
+            resposta, espera = resposta
+            relogio.avancar(espera)
+        return resposta
+
+    return perguntar
+
+
+def _roteiro_recargas(recargas):
+    """
+    Cria a função consultada a cada troca de fase a partir das recargas
+    roteirizadas ({fase: alterações}, com as fases contadas desde 0).
+    """
+    fases = itertools.count()
+
+    def recarregar():
+        return (recargas or {}).get(next(fases))
+
+    return recarregar
+
+
+def simular_sessao(config=None, respostas=None, interrupcoes=None, relogio=None, recargas=None, ciclo_inicial=1):
+    """
+    Simula uma sessão Pomodoro completa.
+
+    Parâmetros:
+    config (dict): Configurações da sessão (completadas com os padrões).
+    respostas (list): Respostas às confirmações, em ordem: bool ou
+                      (bool, segundos de espera).
+    interrupcoes (list): Instantes, em segundos desde o início, em que o
+                         usuário pressiona Ctrl+C.
+    relogio (RelogioSimulado): Relógio a usar; se informado, `interrupcoes`
+                               é ignorado.
+    recargas (dict): Configurações alteradas no arquivo durante a sessão,
+                     por troca de fase: {fase: {chave: valor}}.
+    ciclo_inicial (int): Ciclo em que a sessão começa (conjunto de
+                         pomodoros continuado de execuções anteriores).
+
+    Retorna:
+    dict: 'sessoes' registradas, 'notificacoes' enviadas, 'eventos' do
+          log, 'interrompida' e 'duracao_segundos' simulada.
+    """
+    config, _ = validar_configuracoes(config or CONFIGURACOES_PADRAO)
+    relogio = relogio or RelogioSimulado(interrupcoes=interrupcoes)
+    inicio = relogio.monotonico()
+    interrompida = False
+
+    with capturar_sessoes() as sessoes, capturar_notificacoes() as notificacoes, \
+            capturar_eventos() as eventos:
+        try:
+            iniciar_sessao_pomodoro(
+                config=config,
+                relogio=relogio,
+                perguntar=_roteiro_respostas(respostas, relogio),
+                interativo=False,
+                recarregar=_roteiro_recargas(recargas),
+                ciclo_inicial=ciclo_inicial
+            )
+        except KeyboardInterrupt:
+            interrompida = True
+
+    return {
+        'sessoes': sessoes,
+        'notificacoes': notificacoes,
+        'eventos': eventos,
+        'interrompida': interrompida,
+        'duracao_segundos': relogio.monotonico() - inicio
+    }
+
+
+def simular_dias(dias, config=None, sessoes_por_dia=1):
+    """
+    Simula vários dias seguidos de sessões, para benchmark e regressão.
+
+    Parâmetros:
+    dias (int): Número de dias simulados.
+    config (dict): Configurações das sessões.
+    sessoes_por_dia (int): Sessões Pomodoro por dia.
+
+    Retorna:
+    dict: Totais de sessões e notificações e o tempo real gasto.
+    """
+    relogio = RelogioSimulado()
+    total_sessoes = 0
+    total_notificacoes = 0
+    inicio_real = time.perf_counter()
+
+    for dia in range(dias):
+        # Cada dia começa às 9h do dia seguinte
+        relogio.instante = max(relogio.instante, dia * 86400.0)
+        for _ in range(sessoes_por_dia):
+            resultado = simular_sessao(config, relogio=relogio)
+            total_sessoes += len(resultado['sessoes'])
+            total_notificacoes += len(resultado['notificacoes'])
+
+    segundos = time.perf_counter() - inicio_real
+    return {
+        'dias': dias,
+        'sessoes': total_sessoes,
+        'notificacoes': total_notificacoes,
+        'segundos_reais': segundos,
+        'dias_por_segundo': dias / segundos if segundos else float('inf'),
+        'ultimo_dia': (relogio.inicio + timedelta(days=dias - 1)).strftime('%Y-%m-%d') if dias else None
+    }
+
+
+if __name__ == "__main__":
+    dias = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    resultado = simular_dias(dias)
+    print(
+        f"{resultado['dias']} dias simulados em {resultado['segundos_reais'] * 1000:.1f} ms "
+        f"({resultado['dias_por_segundo']:.0f} dias/s, {resultado['sessoes']} sessões, "
+        f"{resultado['notificacoes']} notificações)"
+    )
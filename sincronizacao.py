@@ -0,0 +1,333 @@
+"""
+Módulo de sincronização - Históricos de vários dispositivos por uma pasta compartilhada
+
+Cada dispositivo publica as suas sessões novas numa pasta comum
+(Syncthing, Dropbox, pendrive...) em segmentos compactados e nomeados
+pelo hash do conteúdo, e importa apenas os segmentos que ainda não
+conhece. As sessões são identificadas por (dispositivo, timestamp): o
+histórico se comporta como um conjunto que só cresce, então sincronizar
+de novo, em qualquer ordem, nunca duplica sessões.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import platform
+import sys
+import uuid
+from historico import iterar_historico, importar_sessoes
+
+
+# Estado local: identificador do dispositivo, timestamps das sessões locais
+# já exportadas e segmentos já conhecidos. Na versão 1, 'exportadas' era a
+# posição no histórico (convertida na próxima exportação)
+SINCRONIZACAO_FILE = 'sincronizacao.json'
+VERSAO_SINCRONIZACAO = 2
+
+# Subpastas da pasta compartilhada: segmentos e registro dos dispositivos
+PASTA_SEGMENTOS = 'segmentos'
+PASTA_DISPOSITIVOS = 'dispositivos'
+
+# Sessões por segmento: segmentos pequenos são transferidos e conferidos
+# rapidamente pelas ferramentas de sincronização de arquivos
+SESSOES_POR_SEGMENTO = 500
+
+EXTENSAO_SEGMENTO = '.json.gz'
+
+
+def _ler_estado():
+    """Lê o estado local, criando um identificador de dispositivo na primeira vez."""
+    try:
+        with open(SINCRONIZACAO_FILE, 'r', encoding='utf-8') as f:
+            estado = json.load(f)
+        if estado.get('versao') in (1, VERSAO_SINCRONIZACAO) and estado.get('dispositivo'):
+            estado['conhecidos'] = set(estado.get('conhecidos', []))
+            if estado['versao'] == VERSAO_SINCRONIZACAO:
+                estado['exportadas'] = set(estado.get('exportadas', []))
+            return estado
+    except (OSError, ValueError):
+        pass
+    return {
+        'versao': VERSAO_SINCRONIZACAO,
+        'dispositivo': uuid.uuid4().hex[:12],
+        'exportadas': set(),
+        'conhecidos': set(),
+        'novo': True
+    }
+
+
+def _salvar_estado(estado):
+    """Grava o estado local de forma atômica."""
+    temporario = SINCRONIZACAO_FILE + '.tmp'
+    try:
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dict(
+                estado,
+                versao=VERSAO_SINCRONIZACAO,
+                conhecidos=sorted(estado['conhecidos']),
+                exportadas=sorted(estado['exportadas'])
+            ), f, indent=4)
+        os.replace(temporario, SINCRONIZACAO_FILE)
+    except OSError as e:
+        print(f"⚠️  Erro ao salvar estado da sincronização: {e}")
+
+
+def obter_dispositivo():
+    """
+    Retorna o identificador deste dispositivo.
+
+    Retorna:
+    str: Identificador, criado e gravado na primeira chamada.
+    """
+    estado = _ler_estado()
+    if estado.pop('novo', False):
+        _salvar_estado(estado)
+    return estado['dispositivo']
+
+
+def _origem_local():
+    """Máquina e diretório deste histórico, usados para reconhecer o dispositivo."""
+    return {'maquina': platform.node(), 'diretorio': os.path.abspath('.')}
+
+
+def _registrar_dispositivo(pasta, dispositivo):
+    """Grava o dispositivo no registro da pasta compartilhada."""
+    destino = os.path.join(pasta, PASTA_DISPOSITIVOS)
+    os.makedirs(destino, exist_ok=True)
+    caminho = os.path.join(destino, f"{dispositivo}.json")
+    if not os.path.exists(caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(dict(_origem_local(), dispositivo=dispositivo), f, indent=4)
+
+
+def _recuperar_dispositivo(pasta):
+    """
+    Procura no registro da pasta o dispositivo deste histórico, para que a
+    perda do sincronizacao.json não faça as mesmas sessões voltarem com
+    outra identidade.
+
+    Retorna:
+    str | None: Identificador registrado, ou None.
+    """
+    origem = _origem_local()
+    try:
+        nomes = os.listdir(os.path.join(pasta, PASTA_DISPOSITIVOS))
+    except FileNotFoundError:
+        return None
+    for nome in nomes:
+        try:
+            with open(os.path.join(pasta, PASTA_DISPOSITIVOS, nome), 'r', encoding='utf-8') as f:
+                registro = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if all(registro.get(campo) == valor for campo, valor in origem.items()):
+            return registro.get('dispositivo')
+    return None
+
+
+def chave_sessao(sessao, dispositivo):
+    """
+    Identidade de uma sessão entre dispositivos.
+
+    Parâmetros:
+    sessao (dict): Sessão do histórico.
+    dispositivo (str): Dispositivo local (sessões sem 'dispositivo' são locais).
+
+    Retorna:
+    tuple: (dispositivo, timestamp).
+    """
+    return (sessao.get('dispositivo', dispositivo), sessao.get('timestamp'))
+
+
+def _codificar_segmento(dispositivo, sessoes):
+    """
+    Serializa um segmento de forma canônica.
+
+    Retorna:
+    tuple: (nome do arquivo, conteúdo compactado).
+    """
+    conteudo = json.dumps(
+        {'dispositivo': dispositivo, 'sessoes': sessoes},
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    ).encode('utf-8')
+    nome = hashlib.sha256(conteudo).hexdigest()[:24] + EXTENSAO_SEGMENTO
+    return nome, gzip.compress(conteudo, mtime=0)
+
+
+def _ler_segmento(caminho):
+    """
+    Lê um segmento e confere o conteúdo com o hash do nome.
+
+    Retorna:
+    dict | None: Segmento, ou None se incompleto ou corrompido.
+    """
+    try:
+        with open(caminho, 'rb') as f:
+            conteudo = gzip.decompress(f.read())
+        nome = os.path.basename(caminho)
+        if hashlib.sha256(conteudo).hexdigest()[:24] + EXTENSAO_SEGMENTO != nome:
+            return None
+        return json.loads(conteudo)
+    except (OSError, EOFError, ValueError):
+        return None
+
+
+def _exportadas_por_posicao(posicao, dispositivo):
+    """Converte o estado da versão 1 (posição no histórico) em timestamps."""
+    exportadas = set()
+    for numero, sessao in enumerate(iterar_historico(), 1):
+        if numero > posicao:
+            break
+        if sessao.get('dispositivo', dispositivo) == dispositivo:
+            exportadas.add(sessao.get('timestamp'))
+    return exportadas
+
+
+def exportar_sessoes(pasta, estado):
+    """
+    Publica na pasta as sessões locais ainda não exportadas. As exportadas
+    são lembradas pelo timestamp (a chave da sessão neste dispositivo), então
+    limpar ou trocar o histórico não esconde as sessões gravadas depois.
+
+    Parâmetros:
+    pasta (str): Pasta compartilhada.
+    estado (dict): Estado local (atualizado).
+
+    Retorna:
+    int: Sessões exportadas.
+    """
+    dispositivo = estado['dispositivo']
+    exportadas = estado['exportadas']
+    if isinstance(exportadas, int):
+        exportadas = _exportadas_por_posicao(exportadas, dispositivo)
+
+    novas = []
+    locais = set()
+    for sessao in iterar_historico():
+        # Sessões importadas de outros dispositivos já estão na pasta
+        if sessao.get('dispositivo', dispositivo) != dispositivo:
+            continue
+        timestamp = sessao.get('timestamp')
+        locais.add(timestamp)
+        if timestamp not in exportadas:
+            novas.append(dict(sessao, dispositivo=dispositivo))
+
+    destino = os.path.join(pasta, PASTA_SEGMENTOS)
+    os.makedirs(destino, exist_ok=True)
+    for inicio in range(0, len(novas), SESSOES_POR_SEGMENTO):
+        nome, dados = _codificar_segmento(dispositivo, novas[inicio:inicio + SESSOES_POR_SEGMENTO])
+        caminho = os.path.join(destino, nome)
+        if not os.path.exists(caminho):
+            temporario = os.path.join(destino, f".{nome}.tmp")
+            with open(temporario, 'wb') as f:
+                f.write(dados)
+            os.replace(temporario, caminho)
+        estado['conhecidos'].add(nome)
+
+    # Só as sessões ainda no histórico precisam ser lembradas
+    estado['exportadas'] = locais
+    return len(novas)
+
+
+def importar_segmentos(pasta, estado):
+    """
+    Importa as sessões dos segmentos da pasta que este dispositivo ainda
+    não conhece, descartando as que o histórico já tem.
+
+    Parâmetros:
+    pasta (str): Pasta compartilhada.
+    estado (dict): Estado local (atualizado).
+
+    Retorna:
+    tuple: (segmentos lidos, sessões importadas).
+    """
+    dispositivo = estado['dispositivo']
+    origem = os.path.join(pasta, PASTA_SEGMENTOS)
+    try:
+        nomes = [nome for nome in os.listdir(origem) if nome.endswith(EXTENSAO_SEGMENTO)]
+    except FileNotFoundError:
+        return 0, 0
+
+    faltantes = sorted(set(nomes) - estado['conhecidos'])
+    recebidas = {}
+    lidos = []
+    for nome in faltantes:
+        segmento = _ler_segmento(os.path.join(origem, nome))
+        if segmento is None:
+            # Provavelmente ainda sendo copiado: fica para a próxima vez
+            print(f"⚠️  Segmento {nome} incompleto ou corrompido; ignorado por enquanto.")
+            continue
+        lidos.append(nome)
+        if segmento.get('dispositivo') == dispositivo:
+            continue
+        for sessao in segmento.get('sessoes', []):
+            recebidas.setdefault(chave_sessao(sessao, dispositivo), sessao)
+
+    if recebidas:
+        # Só as sessões locais a partir da mais antiga recebida podem repetir
+        mais_antiga = min(timestamp or '' for _, timestamp in recebidas)
+        for sessao in iterar_historico():
+            if (sessao.get('timestamp') or '') >= mais_antiga:
+                recebidas.pop(chave_sessao(sessao, dispositivo), None)
+
+    novas = sorted(recebidas.values(), key=lambda sessao: sessao.get('timestamp') or '')
+    if novas and not importar_sessoes(novas):
+        return 0, 0
+
+    estado['conhecidos'].update(lidos)
+    return len(lidos), len(novas)
+
+
+def sincronizar(pasta):
+    """
+    Exporta as sessões locais novas e importa as dos outros dispositivos.
+
+    Parâmetros:
+    pasta (str): Pasta compartilhada.
+
+    Retorna:
+    dict: 'dispositivo', 'exportadas', 'segmentos_lidos' e 'importadas'.
+    """
+    estado = _ler_estado()
+    if estado.pop('novo', False):
+        estado['dispositivo'] = _recuperar_dispositivo(pasta) or estado['dispositivo']
+    _registrar_dispositivo(pasta, estado['dispositivo'])
+    exportadas = exportar_sessoes(pasta, estado)
+    segmentos, importadas = importar_segmentos(pasta, estado)
+    _salvar_estado(estado)
+    return {
+        'dispositivo': estado['dispositivo'],
+        'exportadas': exportadas,
+        'segmentos_lidos': segmentos,
+        'importadas': importadas
+    }
+
+
+def main_sincronizar(argumentos):
+    """
+    Ponto de entrada de `pomo sincronizar`.
+
+    Uso:
+    sincronizar PASTA    troca sessões com os outros dispositivos pela pasta
+
+    Retorna:
+    int: Código de saída.
+    """
+    if len(argumentos) != 1:
+        print(main_sincronizar.__doc__)
+        return 1
+    try:
+        resultado = sincronizar(argumentos[0])
+    except OSError as e:
+        print(f"❌ Erro ao sincronizar: {e}")
+        return 1
+    print(
+        f"🔄 Dispositivo {resultado['dispositivo']}: {resultado['exportadas']} sessões exportadas, "
+        f"{resultado['importadas']} importadas de {resultado['segmentos_lidos']} segmentos novos"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_sincronizar(sys.argv[1:]))
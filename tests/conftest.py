@@ -0,0 +1,40 @@
+"""
+Configuração comum dos testes do Pomo CLI
+
+Os módulos ficam na raiz do repositório e gravam os seus arquivos no
+diretório atual: cada teste roda num diretório temporário próprio, com o
+estado em memória do histórico zerado, como num processo novo.
+"""
+
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+import estado
+import eventos
+import historico
+
+
+def reiniciar_historico():
+    """Descarta o estado em memória do histórico, como ao abrir um novo processo."""
+    historico.aguardar_gravacoes()
+    historico._agregado = None
+    historico._assinatura_arquivo = None
+    historico._indice_tarefas = None
+
+
+@pytest.fixture(autouse=True)
+def diretorio_isolado(tmp_path, monkeypatch):
+    """Roda o teste num diretório vazio, sem log de eventos nem estado publicado."""
+    monkeypatch.chdir(tmp_path)
+    # O estado do timer fica num caminho fixo por usuário
+    monkeypatch.setattr(estado, 'ESTADO_FILE', str(tmp_path / 'estado' / 'estado.json'))
+    eventos.configurar_eventos({'registrar_eventos': False})
+    reiniciar_historico()
+    yield tmp_path
+    reiniciar_historico()
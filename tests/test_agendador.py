@@ -0,0 +1,61 @@
+"""
+Testes da validação e da execução das regras de agendamento
+"""
+
+import io
+import sys
+
+import pytest
+from rich.console import Console
+
+import historico
+import timer
+from agendador import carregar_regras, executar_regra, validar_regra
+from relogio import RelogioSimulado
+
+
+@pytest.mark.parametrize('regra', [
+    5,
+    ['09:00'],
+    {'hora': '09:00', 'dias': 5},
+    {'hora': '09:00', 'dias': 'seg'},
+    {'hora': '09:00', 'dias': [True]},
+    {'hora': '09:00', 'dias': []},
+    {'hora': '09:00', 'tolerancia_minutos': '30'},
+    {'hora': '09:00', 'tolerancia_minutos': -1},
+    {'hora': '09:00', 'tolerancia_minutos': 1e30},
+    {'hora': '09:00', 'tipo': 'personalizado', 'minutos': float('nan')},
+    {'hora': '25:00'},
+])
+def test_regras_invalidas_lancam_value_error(regra):
+    with pytest.raises(ValueError):
+        validar_regra(regra)
+
+
+def test_regras_invalidas_sao_ignoradas_ao_carregar(capsys):
+    regras = carregar_regras({'agendamentos': [5, {'hora': '09:00', 'dias': 5}, {'hora': '09:00', 'dias': ['seg', 2]}]})
+    assert [regra['dias'] for regra in regras] == [{0, 2}]
+    assert capsys.readouterr().out.count('ignorado') == 2
+
+
+class EntradaFechada(io.StringIO):
+    """stdin que falha o teste se alguém tentar ler uma resposta."""
+
+    def read(self, *args):
+        raise AssertionError('o agendador leu do terminal')
+
+    readline = read
+
+
+def test_regra_pomodoro_roda_sem_ler_o_terminal(monkeypatch):
+    monkeypatch.setattr(sys, 'stdin', EntradaFechada())
+    monkeypatch.setattr(timer, 'console', Console(file=io.StringIO(), width=100))
+    regra = validar_regra({
+        'hora': '09:00', 'tipo': 'pomodoro', 'tempo_trabalho': 1, 'descanso_curto': 1, 'descanso_longo': 1,
+        'ciclos': 2, 'notificacoes_habilitadas': False, 'som_habilitado': False, 'registrar_eventos': False
+    })
+    assert regra['ajustes'].get('auto_iniciar_descanso') is None
+
+    executar_regra(regra, RelogioSimulado())
+    assert [sessao['tipo'] for sessao in historico.iterar_historico()] == \
+        ['trabalho', 'descanso_curto', 'trabalho', 'descanso_longo']
@@ -0,0 +1,55 @@
+"""
+Testes da conversão e validação das configurações pelo esquema
+"""
+
+import io
+
+import pytest
+from rich.console import Console
+
+import config
+import editor_config
+
+
+@pytest.mark.parametrize('valor', ['nan', 'inf', '-inf', float('nan'), float('inf')])
+def test_numeros_nao_finitos_sao_recusados(valor):
+    with pytest.raises(ValueError):
+        config.converter_valor('hooks_timeout_segundos', valor)
+    with pytest.raises(ValueError):
+        config.converter_valor('tempo_trabalho', valor)
+
+
+def test_nan_no_arquivo_volta_ao_padrao():
+    validada, erros = config.validar_configuracoes({'tempo_trabalho': float('nan')})
+    assert validada['tempo_trabalho'] == config.CONFIGURACOES_PADRAO['tempo_trabalho']
+    assert erros
+
+
+@pytest.mark.parametrize('limites, mensagem', [
+    ({'minimo': 1, 'maximo': 10}, 'entre 1 e 10'),
+    ({'minimo': 1}, 'maior ou igual a 1'),
+    ({'maximo': 10}, 'menor ou igual a 10'),
+])
+def test_mensagem_cita_apenas_os_limites_definidos(limites, mensagem):
+    converter = config._compilar_campo('campo', {'tipo': int, 'padrao': 5, **limites})
+    with pytest.raises(ValueError, match=mensagem) as erro:
+        converter(0 if 'minimo' in limites else 11)
+    assert 'None' not in str(erro.value)
+
+
+@pytest.mark.parametrize('chave, digitado, mensagem', [
+    ('tempo_trabalho', '1.5', 'esperado um número inteiro'),
+    ('tempo_trabalho', '0', 'entre 1 e'),
+    ('ciclos', 'abc', 'esperado um número'),
+])
+def test_editor_mostra_a_mensagem_do_esquema(monkeypatch, chave, digitado, mensagem):
+    console = Console(file=io.StringIO(), width=200)
+    monkeypatch.setattr(editor_config, 'console', console)
+    respostas = iter([digitado, ''])
+    monkeypatch.setattr(editor_config.Prompt, 'ask', lambda *args, **kwargs: next(respostas))
+
+    configuracoes = config.carregar_configuracoes()
+    editor_config._editar_campo(configuracoes, chave, config.ESQUEMA_CONFIGURACOES[chave])
+    saida = console.file.getvalue()
+    assert mensagem in saida
+    assert 'None' not in saida
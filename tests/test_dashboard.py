@@ -0,0 +1,20 @@
+"""
+Testes dos painéis do dashboard
+"""
+
+from datetime import datetime, timedelta
+
+import dashboard
+import historico
+
+
+def test_aba_hoje_mostra_todas_as_sessoes_do_dia():
+    agora = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    total = historico.TOTAL_SESSOES_RECENTES + 10
+    sessoes = [historico._criar_sessao('trabalho', 5, momento=agora + timedelta(minutes=i)) for i in range(total)]
+    # Uma sessão antiga importada depois não empurra as de hoje para fora
+    sessoes.append(historico._criar_sessao('trabalho', 25, momento=agora - timedelta(days=3), dispositivo='outro'))
+    assert historico.importar_sessoes(sessoes)
+
+    assert dashboard._painel_sessoes('hoje').renderable.row_count == total
+    assert dashboard._painel_sessoes('recentes').renderable.row_count == historico.TOTAL_SESSOES_RECENTES
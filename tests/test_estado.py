@@ -0,0 +1,27 @@
+"""
+Testes do estado publicado para `pomo status`
+"""
+
+import estado
+
+
+def test_status_encontra_o_timer_de_outro_diretorio(tmp_path, monkeypatch, capsys):
+    assert estado.publicar_estado('trabalho', 90, ciclo=2, ciclos=4)
+    outro = tmp_path / 'outro'
+    outro.mkdir()
+    monkeypatch.chdir(outro)
+
+    assert estado.main_status(['--formato', '{fase} {ciclo_texto}']) == 0
+    assert capsys.readouterr().out == 'trabalho  [2/4]\n'
+
+    estado.limpar_estado()
+    assert estado.main_status([]) == 1
+
+
+def test_formato_invalido_lista_os_campos(capsys):
+    assert estado.publicar_estado('trabalho', 90)
+    for formato in ('{foo}', '{0}', '{restante', '{fase.x}'):
+        assert estado.main_status(['--formato', formato]) == 1
+        saida = capsys.readouterr()
+        assert saida.out == ''
+        assert '{ciclo_texto}' in saida.err
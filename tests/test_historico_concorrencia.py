@@ -0,0 +1,80 @@
+"""
+Testes de carga com vários processos gravando o mesmo histórico
+
+Cada processo representa um `pomo` aberto em outro terminal: todos
+gravam sessões no mesmo diretório ao mesmo tempo. Nenhuma sessão pode se
+perder e o arquivo final precisa ser um JSON válido, com estatísticas e
+índice de tarefas coerentes.
+"""
+
+import json
+import multiprocessing
+import os
+
+import historico
+from conftest import reiniciar_historico
+
+PROCESSOS = 4
+SESSOES_POR_PROCESSO = 25
+
+
+def gravar_sessoes(diretorio, processo, quantidade, lote):
+    """Grava sessões de um processo; com lote > 1, enfileira várias antes de aguardar."""
+    os.chdir(diretorio)
+    for numero in range(quantidade):
+        historico.registrar_sessao('trabalho', 25, tarefa=f"processo {processo}", numero=numero)
+        if (numero + 1) % lote == 0:
+            historico.aguardar_gravacoes()
+    historico.aguardar_gravacoes()
+
+
+def executar_processos(diretorio, lote=1):
+    contexto = multiprocessing.get_context('spawn')
+    processos = [
+        contexto.Process(target=gravar_sessoes, args=(str(diretorio), processo, SESSOES_POR_PROCESSO, lote))
+        for processo in range(PROCESSOS)
+    ]
+    for processo in processos:
+        processo.start()
+    for processo in processos:
+        processo.join(timeout=120)
+        assert processo.exitcode == 0
+
+
+def conferir_historico():
+    with open(historico.HISTORICO_FILE, 'r', encoding='utf-8') as f:
+        sessoes = json.load(f)
+
+    assert len(sessoes) == PROCESSOS * SESSOES_POR_PROCESSO
+    for processo in range(PROCESSOS):
+        numeros = [s['numero'] for s in sessoes if s['tarefa'] == f"processo {processo}"]
+        # Cada processo grava as suas sessões em ordem
+        assert numeros == list(range(SESSOES_POR_PROCESSO))
+
+    reiniciar_historico()
+    assert historico.obter_estatisticas()['total_sessoes'] == len(sessoes)
+    mes = sessoes[0]['data'][:7]
+    for processo in range(PROCESSOS):
+        assert historico.obter_tempo_tarefa(f"processo {processo}", mes)['sessoes'] == SESSOES_POR_PROCESSO
+
+
+def test_processos_concorrentes_nao_perdem_sessoes(diretorio_isolado):
+    executar_processos(diretorio_isolado)
+    conferir_historico()
+
+
+def test_processos_concorrentes_com_lotes(diretorio_isolado):
+    executar_processos(diretorio_isolado, lote=5)
+    conferir_historico()
+
+
+def test_estatisticas_acompanham_gravacoes_de_outros_processos(diretorio_isolado):
+    assert historico.adicionar_sessao('trabalho', 25)
+    assert historico.obter_estatisticas()['total_sessoes'] == 1
+
+    executar_processos(diretorio_isolado)
+
+    # Sem reiniciar: o agregado em memória percebe a mudança no arquivo
+    assert historico.obter_estatisticas()['total_sessoes'] == 1 + PROCESSOS * SESSOES_POR_PROCESSO
+    assert historico.adicionar_sessao('trabalho', 25)
+    assert historico.obter_estatisticas()['total_sessoes'] == 2 + PROCESSOS * SESSOES_POR_PROCESSO
@@ -0,0 +1,151 @@
+"""
+Testes de injeção de falhas na gravação do histórico
+
+Simulam erros e quedas do processo no meio da gravação: o historico.json
+em disco deve continuar legível e com as sessões anteriores, e as
+estatísticas não podem contar sessões que não chegaram ao arquivo.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import historico
+from conftest import RAIZ, reiniciar_historico
+
+
+def preparar(sessoes=3):
+    """Grava algumas sessões de trabalho e devolve o conteúdo do arquivo."""
+    for _ in range(sessoes):
+        assert historico.adicionar_sessao('trabalho', 25)
+    with open(historico.HISTORICO_FILE, 'rb') as f:
+        return f.read()
+
+
+def conteudo_atual():
+    with open(historico.HISTORICO_FILE, 'rb') as f:
+        return f.read()
+
+
+def test_falha_na_troca_do_arquivo_preserva_historico(monkeypatch):
+    antes = preparar()
+
+    def falhar(origem, destino):
+        raise OSError("disco cheio")
+
+    with monkeypatch.context() as m:
+        m.setattr(historico.os, 'replace', falhar)
+        assert not historico.adicionar_sessao('trabalho', 50)
+
+    assert conteudo_atual() == antes
+    assert historico.obter_estatisticas()['total_sessoes'] == 3
+
+    # A gravação seguinte funciona e não traz a sessão perdida
+    assert historico.adicionar_sessao('descanso_curto', 5)
+    assert [s['tipo'] for s in historico.carregar_historico()] == ['trabalho'] * 3 + ['descanso_curto']
+    assert historico.obter_estatisticas()['total_sessoes'] == 4
+
+
+def test_falha_no_meio_da_escrita_preserva_historico(monkeypatch):
+    antes = preparar()
+
+    def falhar(sessoes):
+        raise OSError("erro de escrita")
+
+    with monkeypatch.context() as m:
+        m.setattr(historico, '_serializar_sessoes', falhar)
+        assert not historico.adicionar_sessao('trabalho', 50)
+
+    assert conteudo_atual() == antes
+    reiniciar_historico()
+    assert historico.obter_estatisticas()['total_sessoes'] == 3
+
+
+def test_queda_do_processo_durante_a_gravacao():
+    antes = preparar()
+
+    # Outro processo morre (sem limpeza nem atexit) logo antes de trocar o
+    # arquivo: o temporário fica para trás, completo, e o original intacto
+    codigo = (
+        "import os, sys\n"
+        f"sys.path.insert(0, {RAIZ!r})\n"
+        "import historico\n"
+        "historico.os.replace = lambda origem, destino: os._exit(9)\n"
+        "historico.registrar_sessao('trabalho', 50)\n"
+        "historico.aguardar_gravacoes()\n"
+    )
+    resultado = subprocess.run([sys.executable, '-c', codigo], timeout=60)
+    assert resultado.returncode == 9
+    assert os.path.exists(historico.HISTORICO_FILE + '.tmp')
+    assert conteudo_atual() == antes
+
+    reiniciar_historico()
+    assert historico.obter_estatisticas()['total_sessoes'] == 3
+    assert historico.adicionar_sessao('descanso_longo', 15)
+    assert len(historico.carregar_historico()) == 4
+
+
+def test_arquivo_truncado_recupera_sessoes_legiveis():
+    antes = preparar(5)
+
+    # Final do arquivo perdido (ex: gravação antiga não atômica)
+    with open(historico.HISTORICO_FILE, 'wb') as f:
+        f.write(antes[:int(len(antes) * 0.7)])
+    reiniciar_historico()
+
+    legiveis = list(historico.iterar_historico())
+    assert 0 < len(legiveis) < 5
+    assert historico.obter_estatisticas()['total_sessoes'] == len(legiveis)
+
+    # A próxima gravação regrava o arquivo com as sessões legíveis
+    assert historico.adicionar_sessao('personalizado', 10)
+    with open(historico.HISTORICO_FILE, 'r', encoding='utf-8') as f:
+        assert len(json.load(f)) == len(legiveis) + 1
+    assert historico.obter_estatisticas()['total_sessoes'] == len(legiveis) + 1
+
+
+def test_rollups_corrompidos_ou_antigos_sao_ignorados():
+    preparar(4)
+
+    with open(historico.ROLLUPS_FILE, 'w', encoding='utf-8') as f:
+        f.write('{"versao": 2, "assinatura": [1')
+    reiniciar_historico()
+    assert historico.obter_estatisticas()['total_sessoes'] == 4
+
+    # Histórico alterado por fora depois dos rollups: a assinatura não bate
+    sessoes = historico.carregar_historico()[:2]
+    historico.salvar_historico(sessoes)
+    reiniciar_historico()
+    assert historico.obter_estatisticas()['total_sessoes'] == 2
+
+
+def test_indice_de_tarefas_corrompido_e_reconstruido():
+    for tarefa in ('relatorio', 'relatorio', 'estudo'):
+        historico.registrar_sessao('trabalho', 25, tarefa=tarefa)
+    assert historico.aguardar_gravacoes()
+
+    with open(historico.TAREFAS_FILE, 'w', encoding='utf-8') as f:
+        f.write('lixo')
+    reiniciar_historico()
+    assert historico.obter_tempo_tarefa('relatorio', historico.carregar_historico()[0]['data'][:7])['sessoes'] == 2
+    assert len(historico.obter_sessoes_tarefa('estudo')) == 1
+
+
+def test_falha_nao_e_apagada_por_gravacao_seguinte(monkeypatch):
+    original = historico._anexar_ao_historico
+    chamadas = []
+
+    def falhar_primeira(sessoes):
+        chamadas.append(len(sessoes))
+        return False if len(chamadas) == 1 else original(sessoes)
+
+    monkeypatch.setattr(historico, '_anexar_ao_historico', falhar_primeira)
+    historico.registrar_sessao('trabalho', 25)
+    historico._fila_gravacao.join()
+    historico.registrar_sessao('trabalho', 25)
+
+    # A segunda gravação deu certo, mas a primeira sessão se perdeu
+    assert not historico.aguardar_gravacoes()
+    assert historico.aguardar_gravacoes()
+    assert len(historico.carregar_historico()) == 1
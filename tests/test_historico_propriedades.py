@@ -0,0 +1,169 @@
+"""
+Testes de propriedade do histórico
+
+Sequências aleatórias (com sementes fixas, reproduzíveis) de
+adicionar_sessao, limpar_historico e consultas são comparadas com um
+modelo simples em memória: as estatísticas nunca podem divergir do
+modelo, nem depois de reabrir o processo com ou sem os rollups.
+"""
+
+import os
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import historico
+from conftest import reiniciar_historico
+
+SEMENTES = range(20)
+OPERACOES_POR_SEMENTE = 40
+TIPOS = ('trabalho', 'descanso_curto', 'descanso_longo', 'personalizado', 'pomodoro_completo')
+
+
+def estatisticas_esperadas(sessoes):
+    """Estatísticas calculadas diretamente da lista de sessões (modelo)."""
+    hoje = datetime.now().strftime('%Y-%m-%d')
+    completas = [s for s in sessoes if s['completa']]
+    return {
+        'total_sessoes': len(sessoes),
+        'sessoes_completas': len(completas),
+        'sessoes_canceladas': len(sessoes) - len(completas),
+        'tempo_total_minutos': sum(s['duracao_minutos'] for s in completas),
+        'tempo_trabalho_minutos': sum(s['duracao_minutos'] for s in completas if s['tipo'] in historico.TIPOS_FOCO),
+        'pomodoros_completos': sum(1 for s in completas if s['tipo'] == 'pomodoro_completo'),
+        'sessoes_hoje': sum(1 for s in sessoes if s['data'] == hoje),
+        'tempo_hoje_minutos': sum(s['duracao_minutos'] for s in completas if s['data'] == hoje)
+    }
+
+
+def conferir(sessoes):
+    """Compara as estatísticas do módulo com o modelo."""
+    obtidas = historico.obter_estatisticas()
+    esperadas = estatisticas_esperadas(sessoes)
+    for chave, valor in esperadas.items():
+        assert obtidas[chave] == pytest.approx(valor), chave
+    assert obtidas['tempo_foco_minutos'] == pytest.approx(esperadas['tempo_trabalho_minutos'])
+
+
+@pytest.mark.parametrize('semente', SEMENTES)
+def test_sequencias_aleatorias_mantem_estatisticas(semente):
+    aleatorio = random.Random(semente)
+    modelo = []
+
+    for _ in range(OPERACOES_POR_SEMENTE):
+        operacao = aleatorio.choices(['adicionar', 'limpar', 'consultar', 'reabrir'], weights=[12, 1, 3, 1])[0]
+        if operacao == 'adicionar':
+            tipo = aleatorio.choice(TIPOS)
+            duracao = aleatorio.choice([1, 5, 15, 25, 50, 0.5, 2.5])
+            completa = aleatorio.random() < 0.8
+            assert historico.adicionar_sessao(tipo, duracao, completa)
+            modelo.append({'tipo': tipo, 'duracao_minutos': duracao, 'completa': completa,
+                           'data': datetime.now().strftime('%Y-%m-%d')})
+        elif operacao == 'limpar':
+            assert historico.limpar_historico()
+            modelo.clear()
+        elif operacao == 'consultar':
+            conferir(modelo)
+        else:
+            reiniciar_historico()
+
+    conferir(modelo)
+
+    # Outro processo parte dos rollups; sem eles, percorre o arquivo
+    reiniciar_historico()
+    conferir(modelo)
+    if os.path.exists(historico.ROLLUPS_FILE):
+        os.remove(historico.ROLLUPS_FILE)
+    reiniciar_historico()
+    conferir(modelo)
+
+    gravadas = historico.carregar_historico()
+    assert [(s['tipo'], s['duracao_minutos'], s['completa']) for s in gravadas] == \
+        [(s['tipo'], s['duracao_minutos'], s['completa']) for s in modelo]
+
+
+@pytest.mark.parametrize('semente', SEMENTES)
+def test_mesclar_agregados_equivale_ao_sequencial(semente):
+    aleatorio = random.Random(semente)
+    momento = datetime(2025, 3, 1, 8, 0)
+    sessoes = []
+    for _ in range(aleatorio.randint(0, 120)):
+        momento += timedelta(minutes=aleatorio.randint(1, 400))
+        # Parte das sessões de trabalho grava o ciclo, como as atuais
+        extras = {'ciclo': aleatorio.randint(1, 4)} if aleatorio.random() < 0.5 else {}
+        instante = momento
+        if aleatorio.random() < 0.2:
+            # Sessão importada de outro dispositivo, mais antiga que as locais
+            extras['dispositivo'] = 'outro'
+            instante = momento - timedelta(minutes=aleatorio.randint(1, 4000))
+        sessoes.append(historico._criar_sessao(
+            aleatorio.choice(TIPOS), aleatorio.choice([5, 15, 25, 50]),
+            completa=aleatorio.random() < 0.8, momento=instante, **extras
+        ))
+
+    sequencial = historico.novo_agregado()
+    for sessao in sessoes:
+        historico.acumular_sessao(sequencial, sessao)
+
+    # Trechos agregados em separado, como em analise_paralela, e combinados
+    # dois a dois em ordem aleatória (a operação deve ser associativa)
+    cortes = sorted(aleatorio.randint(0, len(sessoes)) for _ in range(aleatorio.randint(0, 6)))
+    trechos = []
+    for inicio, fim in zip([0] + cortes, cortes + [len(sessoes)]):
+        agregado = historico.novo_agregado()
+        agregado['ultimo_descanso'] = historico.DESCANSO_PENDENTE
+        agregado['ciclo_pendente'] = True
+        for sessao in sessoes[inicio:fim]:
+            historico.acumular_sessao(agregado, sessao)
+        trechos.append(agregado)
+
+    while len(trechos) > 1:
+        posicao = aleatorio.randrange(len(trechos) - 1)
+        trechos[posicao:posicao + 2] = [historico.mesclar_agregados(trechos[posicao], trechos[posicao + 1])]
+
+    combinado = trechos[0]
+    combinado['conclusao_apos_descanso'].pop(historico.DESCANSO_PENDENTE, None)
+    if combinado['ultimo_descanso'] == historico.DESCANSO_PENDENTE:
+        combinado['ultimo_descanso'] = None
+    combinado['ciclo_pendente'] = False
+    assert historico.serializar_agregado(combinado) == historico.serializar_agregado(sequencial)
+
+
+@pytest.mark.parametrize('semente', SEMENTES)
+def test_proximo_ciclo_continua_entre_execucoes(semente):
+    aleatorio = random.Random(semente)
+    ciclos = aleatorio.randint(2, 6)
+    ultimo = 0
+
+    for _ in range(30):
+        operacao = aleatorio.choices(['trabalho', 'cancelado', 'curto', 'longo', 'reabrir'], weights=[6, 1, 3, 1, 1])[0]
+        proximo = historico.obter_proximo_ciclo(ciclos)
+        assert proximo == (ultimo + 1 if ultimo < ciclos else 1)
+        if operacao == 'trabalho':
+            historico.registrar_sessao('trabalho', 25, ciclo=proximo)
+            ultimo = proximo
+        elif operacao == 'cancelado':
+            historico.registrar_sessao('trabalho', 25, completa=False)
+        elif operacao == 'curto':
+            historico.registrar_sessao('descanso_curto', 5)
+        elif operacao == 'longo':
+            historico.registrar_sessao('descanso_longo', 15, completa=aleatorio.random() < 0.5)
+            ultimo = 0
+        else:
+            reiniciar_historico()
+
+    # Sem os rollups, o mesmo ciclo sai de percorrer o arquivo
+    historico.aguardar_gravacoes()
+    if os.path.exists(historico.ROLLUPS_FILE):
+        os.remove(historico.ROLLUPS_FILE)
+    reiniciar_historico()
+    assert historico.obter_agregado()['ciclo_atual'] == ultimo
+
+
+def test_sessoes_antigas_sem_ciclo_contam_a_partir_do_anterior():
+    for _ in range(2):
+        assert historico.adicionar_sessao('trabalho', 25)
+    assert historico.obter_proximo_ciclo(4) == 3
+    assert historico.adicionar_sessao('descanso_longo', 15)
+    assert historico.obter_proximo_ciclo(4) == 1
@@ -0,0 +1,90 @@
+"""
+Testes do pool de hooks
+
+Uma função Python travada não pode ocupar o pool para sempre, e os eventos
+que encerram o timer chegam aos hooks mesmo com uma execução anterior
+ainda em andamento.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+import hooks
+
+
+@pytest.fixture(autouse=True)
+def hooks_limpos():
+    hooks.remover_hooks()
+    hooks._latencias.clear()
+    yield
+    hooks.remover_hooks()
+
+
+def esperar(condicao, limite=5.0):
+    prazo = time.monotonic() + limite
+    while not condicao():
+        assert time.monotonic() < prazo
+        time.sleep(0.01)
+
+
+def test_funcao_travada_e_abandonada_no_timeout():
+    liberar = threading.Event()
+    chamadas = []
+    hooks.registrar_hook('on_start', lambda evento, dados: liberar.wait(), timeout=0.1, nome='travado')
+    hooks.registrar_hook('on_tick', lambda evento, dados: chamadas.append(dados['n']), nome='rapido')
+
+    # Mais eventos travados que trabalhadores no pool
+    for _ in range(hooks.TOTAL_TRABALHADORES + 1):
+        hooks.disparar_evento('on_start')
+    for n in range(3):
+        hooks.disparar_evento('on_tick', n=n)
+        esperar(lambda: len(chamadas) == n + 1)
+
+    esperar(lambda: hooks.obter_latencias().get('travado', {}).get('timeouts') == 1)
+    metricas = hooks.obter_latencias()['travado']
+    # O hook ainda roda: os demais on_start são ignorados, não empilhados
+    assert metricas['ignorados'] == hooks.TOTAL_TRABALHADORES
+    assert metricas['max_ms'] < 1000
+    liberar.set()
+
+
+def test_eventos_finais_nunca_sao_ignorados():
+    liberar = threading.Event()
+    recebidos = []
+
+    def lento(evento, dados):
+        recebidos.append(dados['n'])
+        liberar.wait()
+
+    hooks.registrar_hook('on_complete', lento, nome='lento')
+    # Timers seguidos: o hook do anterior ainda está rodando
+    hooks.disparar_evento('on_complete', n=1)
+    esperar(lambda: recebidos == [1])
+    hooks.disparar_evento('on_complete', n=2)
+    liberar.set()
+    esperar(lambda: recebidos == [1, 2])
+    esperar(lambda: hooks.obter_latencias()['lento']['execucoes'] == 2)
+    assert hooks.obter_latencias()['lento']['ignorados'] == 0
+
+
+def processo_vivo(pid):
+    """True se o processo existe e não é um zumbi à espera de ser coletado."""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            return f.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc'), reason='precisa do /proc')
+def test_timeout_de_script_encerra_os_processos_filhos(tmp_path):
+    arquivo_pid = tmp_path / 'filho.pid'
+    hooks.registrar_hook('on_start', f"sleep 30 & echo $! > {arquivo_pid}; wait", timeout=0.5, nome='script')
+    hooks.disparar_evento('on_start')
+
+    esperar(lambda: hooks.obter_latencias().get('script', {}).get('timeouts') == 1)
+    pid = int(arquivo_pid.read_text())
+    esperar(lambda: not processo_vivo(pid))
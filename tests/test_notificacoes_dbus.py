@@ -0,0 +1,108 @@
+"""
+Testes do backend D-Bus das notificações
+
+Um dbus-daemon privado, apontado por DBUS_SESSION_BUS_ADDRESS, recebe as
+chamadas de um serviço org.freedesktop.Notifications mínimo numa thread.
+Precisam do jeepney (dependência opcional) e do binário dbus-daemon.
+"""
+
+import shutil
+import subprocess
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+jeepney = pytest.importorskip('jeepney')
+
+from jeepney import HeaderFields, MessageType, new_method_return
+from jeepney.bus_messages import message_bus
+from jeepney.io.blocking import open_dbus_connection
+
+import notificacoes
+
+
+class ServicoNotificacoes:
+    """Serviço org.freedesktop.Notifications que só registra as chamadas."""
+
+    def __init__(self, endereco):
+        self.chamadas = []
+        self._conexao = open_dbus_connection(bus=endereco)
+        self._conexao.send_and_get_reply(message_bus.RequestName('org.freedesktop.Notifications'))
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+
+    def _executar(self):
+        while not self._parar.is_set():
+            try:
+                mensagem = self._conexao.receive(timeout=0.1)
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+            if (mensagem.header.message_type == MessageType.method_call
+                    and mensagem.header.fields.get(HeaderFields.member) == 'Notify'):
+                self.chamadas.append(mensagem.body)
+                self._conexao.send(new_method_return(mensagem, 'u', (len(self.chamadas) + 100,)))
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+        self._conexao.close()
+
+
+@pytest.fixture
+def servico(monkeypatch):
+    if shutil.which('dbus-daemon') is None:
+        pytest.skip('dbus-daemon indisponível')
+    daemon = subprocess.Popen(
+        ['dbus-daemon', '--session', '--print-address', '--nofork'],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    endereco = daemon.stdout.readline().strip()
+    monkeypatch.setenv('DBUS_SESSION_BUS_ADDRESS', endereco)
+    notificacoes.fechar_conexao_dbus()
+    servico = ServicoNotificacoes(endereco)
+    yield servico
+    notificacoes.fechar_conexao_dbus()
+    servico.parar()
+    daemon.terminate()
+    daemon.wait(timeout=10)
+
+
+def test_notificacao_chega_ao_barramento_de_sessao(servico):
+    assert notificacoes.enviar_notificacao_dbus('Título', 'Mensagem', timeout=5)
+    app, substitui, _, titulo, mensagem, _, _, expira = servico.chamadas[0]
+    assert (app, substitui, titulo, mensagem, expira) == ('Pomo CLI', 0, 'Título', 'Mensagem', 5000)
+
+
+def test_notificacoes_com_chave_substituem_a_anterior(servico):
+    assert notificacoes.enviar_notificacao_dbus('Início', 'a', chave='timer')
+    assert notificacoes.enviar_notificacao_dbus('Fim', 'b', chave='timer')
+    assert notificacoes.enviar_notificacao_dbus('Outra', 'c')
+    assert [chamada[1] for chamada in servico.chamadas] == [0, 101, 0]
+
+
+def test_conexao_caida_e_reaberta(servico):
+    assert notificacoes.enviar_notificacao_dbus('Primeira', 'a')
+    notificacoes._conexao_dbus.close()
+    assert notificacoes.enviar_notificacao_dbus('Segunda', 'b')
+    assert [chamada[3] for chamada in servico.chamadas] == ['Primeira', 'Segunda']
+
+
+def test_resposta_de_erro_nao_conta_como_enviada(monkeypatch, capsys):
+    class ConexaoFalsa:
+        def send_and_get_reply(self, mensagem, timeout=None):
+            return SimpleNamespace(
+                header=SimpleNamespace(message_type=MessageType.error),
+                body=('org.freedesktop.DBus.Error.ServiceUnknown',)
+            )
+
+        def close(self):
+            pass
+
+    notificacoes.fechar_conexao_dbus()
+    monkeypatch.setattr(notificacoes, '_abrir_conexao_dbus', lambda: ConexaoFalsa())
+    assert not notificacoes.enviar_notificacao_dbus('Título', 'Mensagem')
+    assert 'ServiceUnknown' in capsys.readouterr().out
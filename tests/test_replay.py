@@ -0,0 +1,32 @@
+"""
+Testes do replay de sessões do log de eventos
+"""
+
+from replay import reproduzir_sessao
+from simulacao import simular_sessao
+
+CONFIG = {'tempo_trabalho': 25, 'descanso_curto': 5, 'ciclos': 2, 'auto_iniciar_descanso': True,
+          'notificacoes_habilitadas': True}
+
+
+def test_sessao_simulada_e_reproduzida_exatamente():
+    eventos = simular_sessao(CONFIG)['eventos']
+    resultado = reproduzir_sessao(eventos)
+    assert resultado['reproduzida_ok']
+    assert resultado['original'] == resultado['reproduzida']
+
+
+def test_notificacoes_extras_da_execucao_real_nao_divergem():
+    registrados = []
+    for evento in simular_sessao(CONFIG)['eventos']:
+        if evento['evento'] == 'notificacao':
+            # Backend que falhou antes do alternativo
+            registrados.append(dict(evento, backend='dbus', enviada=False))
+        registrados.append(evento)
+        if evento['evento'] == 'timer_fim' and evento['tipo'] == 'trabalho':
+            # Meta do dia atingida (metas.py), que a simulação não produz
+            registrados.append({
+                't': evento['t'], 'evento': 'notificacao', 'sessao': evento['sessao'],
+                'titulo': '🎯 Meta diária atingida!', 'backend': 'dbus', 'enviada': True, 'ms': 1.0
+            })
+    assert reproduzir_sessao(registrados)['reproduzida_ok']
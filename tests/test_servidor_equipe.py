@@ -0,0 +1,123 @@
+"""
+Testes do servidor de equipe: lotes inválidos e sessões fora de ordem
+"""
+
+import http.client
+import json
+import threading
+import urllib.error
+from datetime import datetime, timedelta
+
+import pytest
+
+import historico
+import servidor_equipe
+
+
+def sessoes_de_trabalho(quantidade, inicio=datetime(2025, 3, 3, 9, 0), **extras):
+    return [
+        historico._criar_sessao('trabalho', 25, momento=inicio + timedelta(hours=i), **extras)
+        for i in range(quantidade)
+    ]
+
+
+@pytest.fixture
+def servidor():
+    servidor = servidor_equipe.criar_servidor(porta=0, caminho_snapshot=None)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_lote_com_sessao_invalida_nao_altera_os_agregados():
+    agregador = servidor_equipe.AgregadorEquipe()
+    sessoes = sessoes_de_trabalho(3)
+    for invalida in (dict(sessoes[2], duracao_minutos='25'), 'sessao', dict(sessoes[2], duracao_minutos=float('nan'))):
+        with pytest.raises(ValueError, match='sessão 2'):
+            agregador.ingerir('ana', sessoes[:2] + [invalida])
+        assert agregador.resumo()['equipe']['total_sessoes'] == 0
+
+    # O reenvio corrigido conta cada sessão uma vez só
+    assert agregador.ingerir('ana', sessoes) == {'aceitas': 3, 'ignoradas': 0}
+    resumo = agregador.resumo()
+    assert resumo['equipe']['total_sessoes'] == resumo['usuarios']['ana']['total_sessoes'] == 3
+
+
+def test_sessoes_fora_de_ordem_e_de_outros_dispositivos_sao_aceitas():
+    agregador = servidor_equipe.AgregadorEquipe()
+    recentes = sessoes_de_trabalho(2, inicio=datetime(2025, 3, 10, 9, 0))
+    antigas = sessoes_de_trabalho(2, dispositivo='outro')
+    assert agregador.ingerir('ana', recentes)['aceitas'] == 2
+    # Sessões antigas importadas de outro dispositivo chegam depois
+    assert agregador.ingerir('ana', antigas)['aceitas'] == 2
+    # Mesmo instante, dispositivos diferentes: sessões diferentes
+    assert agregador.ingerir('ana', sessoes_de_trabalho(1, dispositivo='terceiro'))['aceitas'] == 1
+    assert agregador.ingerir('ana', recentes + antigas) == {'aceitas': 0, 'ignoradas': 4}
+    assert agregador.resumo()['usuarios']['ana']['total_sessoes'] == 5
+
+
+def test_snapshot_guarda_as_sessoes_vistas(tmp_path):
+    caminho = str(tmp_path / 'snapshot.json')
+    agregador = servidor_equipe.AgregadorEquipe(caminho)
+    sessoes = sessoes_de_trabalho(3)
+    agregador.ingerir('ana', sessoes)
+    assert agregador.salvar_snapshot()
+
+    restaurado = servidor_equipe.AgregadorEquipe(caminho)
+    assert restaurado.carregar_snapshot()
+    assert restaurado.ingerir('ana', sessoes)['aceitas'] == 0
+    assert restaurado.resumo()['equipe']['total_sessoes'] == 3
+
+
+def test_servidor_responde_400_para_lote_invalido(servidor):
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    lote = sessoes_de_trabalho(2)
+    lote[1]['duracao_minutos'] = '25'
+    with pytest.raises(urllib.error.HTTPError) as erro:
+        servidor_equipe.enviar_sessoes(url, 'ana', lote)
+    assert erro.value.code == 400
+    assert 'sessão 1' in json.loads(erro.value.read())['erro']
+    assert servidor.agregador.resumo()['equipe']['total_sessoes'] == 0
+
+
+def test_cliente_envia_sessoes_importadas_e_apos_limpar(servidor):
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    for _ in range(2):
+        assert historico.adicionar_sessao('trabalho', 25)
+    assert servidor_equipe.sincronizar_com_equipe(url, 'ana') == 2
+
+    # Sessões antigas de outro dispositivo e um histórico limpo
+    assert historico.importar_sessoes(sessoes_de_trabalho(2, dispositivo='outro'))
+    assert servidor_equipe.sincronizar_com_equipe(url, 'ana') == 2
+    assert historico.limpar_historico()
+    assert historico.adicionar_sessao('trabalho', 50)
+    assert servidor_equipe.sincronizar_com_equipe(url, 'ana') == 1
+    assert servidor_equipe.sincronizar_com_equipe(url, 'ana') == 0
+    assert servidor.agregador.resumo()['usuarios']['ana']['total_sessoes'] == 5
+
+
+@pytest.mark.parametrize('tamanho, status', [
+    ('-1', 400),
+    ('abc', 400),
+    (str(servidor_equipe.TAMANHO_MAXIMO_CORPO + 1), 413),
+])
+def test_content_length_invalido_e_recusado_antes_da_leitura(servidor, tamanho, status):
+    conexao = http.client.HTTPConnection('127.0.0.1', servidor.server_address[1], timeout=5)
+    conexao.putrequest('POST', '/eventos')
+    conexao.putheader('Content-Length', tamanho)
+    conexao.endheaders()
+    # Nenhum corpo é enviado: a resposta não pode depender dele
+    assert conexao.getresponse().status == status
+    conexao.close()
+
+
+@pytest.mark.parametrize('argumentos', [
+    ['servidor', 'abc'],
+    ['servidor', '70000'],
+    ['simular', 'http://127.0.0.1:1', 'dez'],
+    ['simular', 'http://127.0.0.1:1', '2', '0'],
+])
+def test_argumentos_numericos_invalidos_mostram_o_uso(argumentos, capsys):
+    assert servidor_equipe.main_equipe(argumentos) == 1
+    assert 'Uso:' in capsys.readouterr().out
@@ -0,0 +1,108 @@
+"""
+Testes da sincronização por pasta compartilhada
+
+Cada dispositivo é um diretório próprio (com o seu histórico e o seu
+sincronizacao.json); a pasta compartilhada é comum aos dois.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import historico
+import sincronizacao
+from conftest import reiniciar_historico
+
+
+@pytest.fixture
+def dispositivos(tmp_path, monkeypatch):
+    """Troca o diretório atual entre os dispositivos 'a' e 'b'."""
+    pasta = tmp_path / 'compartilhada'
+    for nome in ('a', 'b'):
+        (tmp_path / nome).mkdir()
+
+    def usar(nome):
+        reiniciar_historico()
+        monkeypatch.chdir(tmp_path / nome)
+        reiniciar_historico()
+        return str(pasta)
+
+    return usar
+
+
+def sessoes_antigas(tipos, inicio=datetime(2025, 3, 3, 9, 0)):
+    return [
+        historico._criar_sessao(tipo, 25 if tipo == 'trabalho' else 5, momento=inicio + timedelta(minutes=30 * i))
+        for i, tipo in enumerate(tipos)
+    ]
+
+
+def test_sessoes_gravadas_apos_limpar_sao_exportadas(dispositivos):
+    pasta = dispositivos('a')
+    for _ in range(3):
+        assert historico.adicionar_sessao('trabalho', 25)
+    assert sincronizacao.sincronizar(pasta)['exportadas'] == 3
+
+    assert historico.limpar_historico()
+    assert historico.adicionar_sessao('trabalho', 50)
+    assert sincronizacao.sincronizar(pasta)['exportadas'] == 1
+    assert sincronizacao.sincronizar(pasta)['exportadas'] == 0
+
+    pasta = dispositivos('b')
+    assert sincronizacao.sincronizar(pasta)['importadas'] == 4
+
+
+def test_estado_da_versao_1_e_convertido(dispositivos):
+    pasta = dispositivos('a')
+    for _ in range(2):
+        assert historico.adicionar_sessao('trabalho', 25)
+    # Formato antigo: 'exportadas' é a posição no histórico
+    with open(sincronizacao.SINCRONIZACAO_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'versao': 1, 'dispositivo': 'antigo', 'exportadas': 1, 'conhecidos': []}, f)
+
+    assert sincronizacao.sincronizar(pasta) == {
+        'dispositivo': 'antigo', 'exportadas': 1, 'segmentos_lidos': 0, 'importadas': 0
+    }
+    estado = sincronizacao._ler_estado()
+    assert estado['versao'] == sincronizacao.VERSAO_SINCRONIZACAO
+    assert len(estado['exportadas']) == 2
+
+
+def test_sessoes_importadas_nao_baguncam_a_sequencia_local(dispositivos):
+    pasta = dispositivos('b')
+    assert historico.importar_sessoes(sessoes_antigas(['descanso_curto', 'trabalho', 'descanso_curto']))
+    assert sincronizacao.sincronizar(pasta)['exportadas'] == 3
+
+    pasta = dispositivos('a')
+    assert historico.adicionar_sessao('trabalho', 25)
+    assert historico.adicionar_sessao('descanso_curto', 5, completa=False)
+    assert sincronizacao.sincronizar(pasta)['importadas'] == 3
+
+    for agregado in (historico.obter_agregado(), (reiniciar_historico(), historico.obter_agregado())[1]):
+        momentos = [sessao['timestamp'] for sessao in agregado['recentes']]
+        assert momentos == sorted(momentos)
+        # O último descanso local foi cancelado; o importado, completo e
+        # mais antigo, não conta
+        assert agregado['ultimo_descanso'] is None
+        assert agregado['conclusao_apos_descanso'] == {}
+
+    recentes = historico.obter_sessoes_recentes(2)
+    assert [sessao.get('dispositivo') for sessao in recentes] == [None, None]
+    assert len(historico.obter_sessoes_recentes(500)) == 5
+
+
+def test_ciclos_importados_nao_avancam_o_conjunto_local(dispositivos):
+    pasta = dispositivos('b')
+    for ciclo in (1, 2, 3):
+        historico.registrar_sessao('trabalho', 25, ciclo=ciclo)
+    assert historico.aguardar_gravacoes()
+    assert sincronizacao.sincronizar(pasta)['exportadas'] == 3
+
+    pasta = dispositivos('a')
+    historico.registrar_sessao('trabalho', 25, ciclo=1)
+    assert historico.aguardar_gravacoes()
+    assert sincronizacao.sincronizar(pasta)['importadas'] == 3
+    assert historico.obter_proximo_ciclo(4) == 2
+    reiniciar_historico()
+    assert historico.obter_proximo_ciclo(4) == 2
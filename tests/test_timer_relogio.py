@@ -0,0 +1,184 @@
+"""
+Testes de tempo de contar_tempo e executar_timer com relógio injetado
+
+Com o RelogioSimulado as durações e os instantes das atualizações são
+exatos e os testes rodam em milissegundos; um teste curto com o relógio
+real confere que o prazo nunca termina antes da hora.
+"""
+
+import io
+import time
+
+import pytest
+from rich.console import Console
+
+import timer
+from eventos import capturar_eventos
+from funcoes import contar_tempo, converter_duracao
+from notificacoes import capturar_notificacoes
+from relogio import RelogioSimulado
+from simulacao import simular_sessao
+
+CONFIG_SILENCIOSA = {'notificacoes_habilitadas': False, 'som_habilitado': False, 'hooks': {}, 'registrar_eventos': False}
+
+
+class RelogioAtrasado(RelogioSimulado):
+    """Relógio simulado que acorda sempre `atraso` segundos depois do pedido."""
+
+    def __init__(self, atraso, **kwargs):
+        super().__init__(**kwargs)
+        self.atraso = atraso
+
+    def aguardar_ate(self, prazo):
+        self.avancar(prazo - self.instante + self.atraso)
+
+
+def contar(minutos, intervalo=1.0, relogio=None, **kwargs):
+    """Roda contar_tempo até o fim e devolve (instante, restante) de cada atualização."""
+    relogio = relogio or RelogioSimulado()
+    return [(relogio.monotonico(), restante) for restante in contar_tempo(minutos, intervalo, relogio, **kwargs)]
+
+
+def test_contagem_termina_exatamente_no_prazo():
+    atualizacoes = contar(0.5)
+    assert [restante for _, restante in atualizacoes] == [float(s) for s in range(30, -1, -1)]
+    assert atualizacoes[-1][0] == 30.0
+
+
+@pytest.mark.parametrize('minutos, intervalo', [(1, 0.25), (0.1, 2.5), (2.5, 7), (0.02, 1)])
+def test_atualizacoes_alinhadas_ao_intervalo(minutos, intervalo):
+    atualizacoes = contar(minutos, intervalo)
+    total = minutos * 60
+    assert atualizacoes[0] == (0.0, total)
+    assert atualizacoes[-1] == (pytest.approx(total), 0.0)
+    # Depois da primeira, cada atualização cai num múltiplo do intervalo
+    for _, restante in atualizacoes[1:]:
+        assert restante / intervalo == pytest.approx(round(restante / intervalo))
+    assert len(atualizacoes) == -(-round(total * 1000) // round(intervalo * 1000)) + 1
+
+
+@pytest.mark.parametrize('texto', ['90s', '1m30s', '1,5', '0.0125', '2.7s', '1h'])
+def test_erro_de_conclusao_em_ms_com_duracoes_fracionarias(texto):
+    minutos = converter_duracao(texto)
+    atualizacoes = contar(minutos, intervalo=1.0)
+    erro_ms = (atualizacoes[-1][0] - minutos * 60) * 1000
+    assert atualizacoes[-1][1] == 0.0
+    assert abs(erro_ms) < 1e-6
+
+
+def test_erro_de_conclusao_em_ms_com_atraso_do_relogio():
+    # Cada espera acorda 3 ms depois do pedido: o erro na conclusão é de
+    # uma espera só, não da soma de todas
+    relogio = RelogioAtrasado(0.003)
+    atualizacoes = contar(converter_duracao('1m30s'), intervalo=0.25, relogio=relogio)
+    erro_ms = (atualizacoes[-1][0] - 90) * 1000
+    assert 0 <= erro_ms <= 3 + 1e-6
+
+
+@pytest.mark.parametrize('texto', ['nan', 'inf', '-inf', 'infinity', '1e400', '1e308', 'abc', ''])
+def test_duracoes_invalidas_sao_rejeitadas(texto):
+    with pytest.raises(ValueError):
+        converter_duracao(texto)
+
+
+def test_atrasos_da_exibicao_nao_acumulam():
+    relogio = RelogioAtrasado(0.3)
+    atualizacoes = contar(1, relogio=relogio)
+    # O prazo é fixo: o fim atrasa no máximo um atraso, nunca 60 deles
+    assert 60.0 <= atualizacoes[-1][0] <= 60.3 + 1e-9
+    assert all(restante >= 0 for _, restante in atualizacoes)
+    assert len(atualizacoes) <= 62
+
+
+def test_ociosidade_adia_o_prazo():
+    relogio = RelogioSimulado()
+    # Ocioso de 20 a 50 segundos (a ociosidade é percebida com atraso)
+    ocioso = lambda: relogio.instante - 20 if 50 > relogio.instante >= 25 else 0
+    medicao = {}
+    atualizacoes = contar(1, relogio=relogio, ocioso=ocioso, medicao=medicao)
+    assert medicao['segundos_pausados'] == pytest.approx(30)
+    assert atualizacoes[-1][0] == pytest.approx(90)
+
+
+def test_interrupcao_durante_a_contagem():
+    relogio = RelogioSimulado(interrupcoes=[42.5])
+    with pytest.raises(KeyboardInterrupt):
+        contar(1, relogio=relogio)
+    assert relogio.monotonico() == 42.5
+
+
+def test_contagem_com_relogio_real_nao_termina_antes():
+    inicio = time.monotonic()
+    restantes = list(contar_tempo(0.01, 0.2))
+    decorrido = time.monotonic() - inicio
+    assert restantes[-1] == 0.0
+    # Só o limite inferior: numa máquina carregada o término pode atrasar
+    assert decorrido >= 0.6
+
+
+def test_executar_timer_completo_mede_o_tempo_ativo():
+    relogio = RelogioSimulado()
+    detalhes = {}
+    with capturar_notificacoes() as notificacoes, capturar_eventos():
+        completo = timer.executar_timer(
+            25, "Trabalho", tipo_sessao='trabalho', config={'notificacoes_habilitadas': True},
+            relogio=relogio, interativo=False, detalhes=detalhes
+        )
+    assert completo
+    assert relogio.monotonico() == 1500
+    assert detalhes['segundos_ativos'] == 1500
+    assert detalhes['inicio'] == '2025-01-01T09:00:00'
+    assert detalhes['fim'] == '2025-01-01T09:25:00'
+    assert len(notificacoes) == 2
+
+
+def test_executar_timer_interrompido():
+    relogio = RelogioSimulado(interrupcoes=[600])
+    detalhes = {}
+    with capturar_notificacoes() as notificacoes, capturar_eventos() as eventos:
+        completo = timer.executar_timer(
+            25, "Trabalho", tipo_sessao='trabalho', config=CONFIG_SILENCIOSA,
+            relogio=relogio, interativo=False, detalhes=detalhes
+        )
+    assert not completo
+    assert detalhes['segundos_ativos'] == 600
+    assert notificacoes == []
+    assert eventos[-1]['evento'] == 'timer_fim' and eventos[-1]['completo'] is False
+
+
+def test_executar_timer_interativo_atualiza_uma_vez_por_segundo(monkeypatch):
+    monkeypatch.setattr(timer, 'console', Console(file=io.StringIO(), width=100))
+    relogio = RelogioSimulado()
+    with capturar_notificacoes(), capturar_eventos() as eventos:
+        assert timer.executar_timer(2, "Trabalho", tipo_sessao='trabalho', config=CONFIG_SILENCIOSA, relogio=relogio)
+    ticks = [evento for evento in eventos if evento['evento'] == 'tick']
+    assert len(ticks) == 121
+    assert all(evento['desvio_ms'] == 0 for evento in ticks)
+    assert [evento['restante'] for evento in ticks] == [float(s) for s in range(120, -1, -1)]
+
+
+def test_sessao_pomodoro_completa_dura_o_previsto():
+    config = {'tempo_trabalho': 25, 'descanso_curto': 5, 'descanso_longo': 15, 'ciclos': 4,
+              'auto_iniciar_descanso': True, 'notificacoes_habilitadas': False}
+    resultado = simular_sessao(config)
+    # 4 trabalhos, 3 descansos curtos e um longo, mais 2 s após cada
+    # descanso curto e 3 s ao final
+    assert resultado['duracao_segundos'] == (4 * 25 + 3 * 5 + 15) * 60 + 3 * 2 + 3
+    assert [s['tipo'] for s in resultado['sessoes']] == ['trabalho', 'descanso_curto'] * 3 + ['trabalho', 'descanso_longo']
+    assert all(s['segundos_ativos'] == s['duracao_minutos'] * 60 for s in resultado['sessoes'])
+
+
+def test_sessao_pomodoro_aplica_recarga_na_troca_de_fase():
+    config = {'tempo_trabalho': 25, 'descanso_curto': 5, 'ciclos': 2, 'auto_iniciar_descanso': True,
+              'notificacoes_habilitadas': False}
+    resultado = simular_sessao(config, recargas={1: {'descanso_curto': 10}, 2: {'tempo_trabalho': 50}})
+    assert [(s['tipo'], s['duracao_minutos']) for s in resultado['sessoes']] == \
+        [('trabalho', 25), ('descanso_curto', 10), ('trabalho', 50), ('descanso_longo', 15)]
+
+
+def test_sessao_pomodoro_continua_o_conjunto_anterior():
+    config = {'tempo_trabalho': 25, 'ciclos': 4, 'auto_iniciar_descanso': True, 'notificacoes_habilitadas': False}
+    resultado = simular_sessao(config, ciclo_inicial=3)
+    # Só faltam os ciclos 3 e 4 até o descanso longo
+    assert [(s['tipo'], s.get('ciclo')) for s in resultado['sessoes']] == \
+        [('trabalho', 3), ('descanso_curto', None), ('trabalho', 4), ('descanso_longo', None)]
@@ -7,10 +7,19 @@ from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeEl
 from rich.panel import Panel
 from rich.prompt import Confirm
 from rich import box
-import time
-from funcoes import contar_tempo, tocar_som
-from config import carregar_configuracoes
-from historico import adicionar_sessao
+from contextlib import nullcontext
+from datetime import timedelta
+from funcoes import contar_tempo, formatar_restante, tocar_som, modo_tecla
+from config import carregar_configuracoes, ESQUEMA_CONFIGURACOES, formatar_valor
+from historico import registrar_sessao, obter_proximo_ciclo, TIPOS_FOCO
+from hooks import configurar_hooks, disparar_evento
+from eventos import configurar_eventos, registrar_evento, contexto_sessao, nova_sessao_id
+from estado import publicar_estado, limpar_estado
+from relogio import RELOGIO_PADRAO
+from atividade import MonitorAtividade
+from recomendador import recomendar, aplicar_recomendacao
+from metas import configurar_metas, metas_ativas, obter_progresso, formatar_progresso
+from vigia_config import VigiaConfiguracoes
 from notificacoes import (
     notificar_trabalho_iniciado,
     notificar_trabalho_concluido,
@@ -22,58 +31,192 @@ from notificacoes import (
 console = Console()
 
 
-def executar_timer(minutos, descricao, cor="cyan", tipo_sessao=None):
+def _mostrar(interativo, *objetos):
+    """Imprime no console apenas em execuções interativas."""
+    if interativo:
+        console.print(*objetos)
+
+
+def _criar_progresso(cor):
+    """Cria a barra de progresso exibida durante o timer."""
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[bold]{task.description}"),
+        BarColumn(complete_style=cor, finished_style="green"),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        TimeElapsedColumn(),
+        TextColumn("⏱️"),
+        console=console,
+        transient=False
+    )
+
+
+def _criar_monitor(config, tipo_sessao, interativo):
+    """
+    Cria o monitor de ociosidade para fases de trabalho, se habilitado.
+    
+    Returns:
+        MonitorAtividade | None: Monitor pronto para iniciar, ou None
+    """
+    limite_minutos = config.get('pausa_ociosidade_minutos', 0)
+    if not interativo or tipo_sessao != 'trabalho' or not limite_minutos:
+        return None
+    monitor = MonitorAtividade(limite_minutos * 60)
+    if not monitor.disponivel():
+        console.print("[yellow]⚠️  Pausa por ociosidade indisponível: nenhum sinal de atividade neste sistema[/yellow]")
+        return None
+    if monitor.somente_terminal():
+        console.print("[yellow]⚠️  Ociosidade detectada só pelas teclas neste terminal; "
+                      "o uso de outras janelas não é percebido[/yellow]")
+    return monitor
+
+
+def executar_timer(minutos, descricao, cor="cyan", tipo_sessao=None, ciclo=None, ciclos=None,
+                   config=None, relogio=None, interativo=True, detalhes=None, tarefa=None):
     """
     Executa um timer com barra de progresso.
     
     Args:
-        minutos: Duração do timer em minutos
+        minutos: Duração do timer em minutos (aceita frações, ex: 0.5 = 30s)
         descricao: Descrição da sessão
         cor: Cor da barra de progresso
         tipo_sessao: Tipo da sessão ('trabalho', 'descanso_curto', 'descanso_longo', 'personalizado')
+        ciclo: Ciclo atual, publicado no estado para barras de status
+        ciclos: Total de ciclos da sessão Pomodoro
+        config: Configurações a usar. Se None, carrega do arquivo
+        relogio: Relógio usado para medir e esperar (ver relogio.py)
+        interativo: Se False, não exibe a barra, não publica o estado, não
+            dispara hooks nem toca som (usado na simulação)
+        detalhes: Dicionário preenchido com dados medidos da execução, para
+            serem gravados junto da sessão: 'inicio', 'fim' e
+            'segundos_ativos' (medidos no relógio monotônico, sem as pausas)
+            e, se houver, 'pausas_ociosidade'
+        tarefa: Tarefa ou projeto da sessão, repassada aos hooks
     
     Returns:
         bool: True se o timer foi completado, False se foi cancelado
     """
-    config = carregar_configuracoes()
+    if config is None:
+        config = carregar_configuracoes()
+    relogio = relogio or RELOGIO_PADRAO
     completo = False
     
+    if interativo:
+        configurar_hooks(config)
+        configurar_eventos(config)
+        configurar_metas(config)
+        disparar_evento('on_start', tipo=tipo_sessao, descricao=descricao, duracao_minutos=minutos, tarefa=tarefa)
+    
     # Notificação de início
     if config.get('notificacoes_habilitadas', True) and tipo_sessao == 'trabalho':
         notificar_trabalho_iniciado(minutos)
     
     total_segundos = minutos * 60
+    if interativo:
+        publicar_estado(tipo_sessao, total_segundos, ciclo, ciclos, descricao=descricao)
+    
+    # Sem exibição, não há o que atualizar: espera direto até o prazo
+    intervalo = 1.0 if interativo else max(total_segundos, 1.0)
+    
+    monitor = _criar_monitor(config, tipo_sessao, interativo)
+    # Progresso das metas na linha do timer: os contadores são semeados
+    # aqui, antes do primeiro tick, e depois só lidos
+    mostrar_metas = interativo and metas_ativas(config)
+    if mostrar_metas:
+        obter_progresso(relogio.agora())
+    conta_foco = tipo_sessao in TIPOS_FOCO
+    ocioso = monitor.segundos_ocioso if monitor else None
+    pausado = False
+    medicao = {}
+    registrar_evento('timer_inicio', tipo=tipo_sessao, minutos=minutos, ciclo=ciclo, descricao=descricao)
+    inicio = relogio.agora()
+    inicio_monotonico = relogio.monotonico()
+    fim_monotonico = inicio_monotonico
     
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[bold]{task.description}"),
-            BarColumn(complete_style=cor, finished_style="green"),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            TimeElapsedColumn(),
-            TextColumn("⏱️"),
-            console=console,
-            transient=False
-        ) as progress:
-            
-            task = progress.add_task(descricao, total=total_segundos)
+        with _criar_progresso(cor) if interativo else nullcontext() as progress, \
+                modo_tecla() if monitor else nullcontext():
+            if interativo:
+                task = progress.add_task(descricao, total=total_segundos)
+            if monitor:
+                monitor.iniciar()
             
-            for minutos_restantes, segundos_restantes in contar_tempo(minutos):
+            # O prazo de conclusão é controlado por contar_tempo; a barra
+            # apenas acompanha as atualizações
+            for restante in contar_tempo(minutos, intervalo, relogio, ocioso, medicao):
+                if not interativo:
+                    continue
+                
+                if monitor and bool(ocioso()) != pausado:
+                    pausado = not pausado
+                    registrar_evento('pausa' if pausado else 'retomada', tipo=tipo_sessao, restante=round(restante, 3))
+                    publicar_estado(tipo_sessao, restante, ciclo, ciclos, pausado=pausado, descricao=descricao)
+                
+                if not pausado:
+                    # Desvio do tick: quanto a atualização chegou depois da
+                    # marca de `intervalo` segundos restantes
+                    marca = round(restante / intervalo) * intervalo
+                    registrar_evento('tick', restante=round(restante, 3), desvio_ms=round((marca - restante) * 1000, 3))
+                
+                situacao = "⏸  Pausado (ocioso)" if pausado else formatar_restante(restante)
+                if mostrar_metas:
+                    em_andamento = total_segundos - restante if conta_foco else 0.0
+                    situacao += "  " + formatar_progresso(obter_progresso(relogio.agora(), em_andamento))
                 progress.update(
                     task,
-                    completed=total_segundos - (minutos_restantes * 60 + segundos_restantes),
-                    description=f"{descricao} - {minutos_restantes:02d}:{segundos_restantes:02d}"
+                    completed=total_segundos - restante,
+                    description=f"{descricao} - {situacao}"
+                )
+                disparar_evento(
+                    'on_tick',
+                    tipo=tipo_sessao,
+                    descricao=descricao,
+                    duracao_minutos=minutos,
+                    restante_segundos=round(restante, 3),
+                    tarefa=tarefa
                 )
-                time.sleep(1)
             
             completo = True
             
     except KeyboardInterrupt:
-        console.print("\n[yellow]⚠️  Timer interrompido![/yellow]")
+        _mostrar(interativo, "\n[yellow]⚠️  Timer interrompido![/yellow]")
         completo = False
+    finally:
+        fim_monotonico = relogio.monotonico()
+        if monitor:
+            monitor.parar()
+            registrar_evento('monitor_atividade', **monitor.sobrecarga())
+        if interativo:
+            limpar_estado()
+    
+    registrar_evento(
+        'timer_fim',
+        tipo=tipo_sessao,
+        completo=completo,
+        segundos_ativos=round(max(fim_monotonico - inicio_monotonico - medicao.get('segundos_pausados', 0.0), 0.0), 3)
+    )
+    
+    if detalhes is not None:
+        # Duração real pelo relógio monotônico; o fim é derivado do início
+        # para não depender de ajustes no relógio de parede
+        decorrido = fim_monotonico - inicio_monotonico
+        detalhes['inicio'] = inicio.isoformat()
+        detalhes['fim'] = (inicio + timedelta(seconds=decorrido)).isoformat()
+        detalhes['segundos_ativos'] = round(max(decorrido - medicao.get('segundos_pausados', 0.0), 0.0), 3)
+        if monitor and monitor.lacunas:
+            detalhes['pausas_ociosidade'] = monitor.lacunas
+    
+    if interativo:
+        disparar_evento(
+            'on_complete' if completo else 'on_cancel',
+            tipo=tipo_sessao,
+            descricao=descricao,
+            duracao_minutos=minutos,
+            tarefa=tarefa
+        )
     
     # Tocar som de conclusão
-    if completo and config.get('som_habilitado', True):
+    if completo and interativo and config.get('som_habilitado', True):
         tocar_som()
     
     # Notificação de conclusão
@@ -88,89 +231,254 @@ def executar_timer(minutos, descricao, cor="cyan", tipo_sessao=None):
     return completo
 
 
-def iniciar_sessao_pomodoro():
-    """Inicia uma sessão completa de Pomodoro com múltiplos ciclos."""
-    config = carregar_configuracoes()
+def executar_timer_personalizado(minutos, descricao="⏱️ Timer Personalizado", tarefa=None,
+                                 config=None, relogio=None):
+    """
+    Executa um timer personalizado e registra a sessão no histórico.
+    
+    Args:
+        minutos: Duração do timer em minutos (aceita frações)
+        descricao: Descrição exibida na barra de progresso
+        tarefa: Tarefa ou projeto ao qual o tempo é atribuído
+        config: Configurações a usar. Se None, carrega do arquivo
+        relogio: Relógio usado pelo timer e pelo registro
+    
+    Returns:
+        bool: True se o timer foi completado, False se foi cancelado
+    """
+    relogio = relogio or RELOGIO_PADRAO
+    detalhes = {}
+    with contexto_sessao(nova_sessao_id(), relogio):
+        registrar_evento('sessao_inicio', modo='personalizado', ts=relogio.agora().isoformat(), minutos=minutos, tarefa=tarefa)
+        completo = executar_timer(
+            minutos,
+            descricao,
+            "yellow",
+            tipo_sessao='personalizado',
+            config=config,
+            relogio=relogio,
+            detalhes=detalhes,
+            tarefa=tarefa
+        )
+        registrar_sessao('personalizado', minutos, completa=completo, momento=relogio.agora(), tarefa=tarefa, **detalhes)
+        registrar_evento('sessao_fim', motivo='concluida' if completo else 'cancelada')
+    return completo
+
+
+# Configurações gravadas no início de cada sessão Pomodoro no log de
+# eventos: bastam para reproduzi-la com `pomo replay`
+CHAVES_REPRODUCAO = ('tempo_trabalho', 'descanso_curto', 'descanso_longo', 'ciclos',
+                     'auto_iniciar_descanso', 'notificacoes_habilitadas')
+
+
+def iniciar_sessao_pomodoro(config=None, relogio=None, perguntar=None, interativo=True, tarefa=None,
+                            recarregar=None, ciclo_inicial=None):
+    """
+    Inicia uma sessão completa de Pomodoro com múltiplos ciclos.
+    
+    Args:
+        config: Configurações a usar. Se None, carrega do arquivo
+        relogio: Relógio usado pelos timers e pelos registros (ver relogio.py)
+        perguntar: Função (texto, default) -> bool usada nas confirmações.
+            Se None, usa Confirm.ask
+        interativo: Se False, roda sem exibição (usado na simulação)
+        tarefa: Tarefa ou projeto ao qual as fases de trabalho são atribuídas
+        recarregar: Função sem argumentos consultada a cada troca de fase,
+            que retorna as configurações alteradas ({chave: valor}) ou None.
+            Se None, em execuções interativas observa o config.json
+            (ver vigia_config.py)
+        ciclo_inicial: Ciclo em que a sessão começa. Se None, em execuções
+            interativas continua o conjunto de pomodoros de execuções
+            anteriores (até um descanso longo); na simulação, começa do 1
+    """
+    if config is None:
+        config = carregar_configuracoes()
+    relogio = relogio or RELOGIO_PADRAO
+    perguntar = perguntar or (lambda texto, default: Confirm.ask(texto, default=default))
+    
+    # Recomendação pelo histórico (a simulação não consulta o histórico)
+    sugestao = ""
+    if interativo:
+        recomendacao = recomendar(config, relogio.agora())
+        if config.get('recomendacao_automatica', False):
+            config = aplicar_recomendacao(config, recomendacao)
+            sugestao = f"[magenta]💡 Tempos ajustados pelo histórico: {recomendacao['motivo']}[/]\n"
+        elif (recomendacao['tempo_trabalho'], recomendacao['descanso_curto']) != (config['tempo_trabalho'], config['descanso_curto']):
+            sugestao = (
+                f"[magenta]💡 Sugestão: {recomendacao['tempo_trabalho']} min de trabalho e "
+                f"{recomendacao['descanso_curto']} min de descanso ({recomendacao['motivo']})[/]\n"
+            )
+    
+    if interativo:
+        configurar_eventos(config)
+    
+    if ciclo_inicial is None:
+        ciclo_inicial = obter_proximo_ciclo(config['ciclos']) if interativo else 1
+    ciclo_inicial = min(max(ciclo_inicial, 1), config['ciclos'])
+    
+    def perguntar_registrado(texto, default):
+        antes = relogio.monotonico()
+        resposta = perguntar(texto, default)
+        registrar_evento('resposta', pergunta=texto, resposta=resposta, espera=round(relogio.monotonico() - antes, 3))
+        return resposta
+    
+    with contexto_sessao(nova_sessao_id(), relogio):
+        registrar_evento(
+            'sessao_inicio',
+            modo='pomodoro',
+            ts=relogio.agora().isoformat(),
+            config={chave: config.get(chave) for chave in CHAVES_REPRODUCAO},
+            tarefa=tarefa,
+            ciclo_inicial=ciclo_inicial
+        )
+        vigia = None
+        if recarregar is None and interativo:
+            vigia = VigiaConfiguracoes(config)
+            vigia.iniciar()
+            recarregar = vigia.obter_alteracoes
+        motivo = 'interrompida'
+        try:
+            motivo = _executar_ciclos(
+                config, relogio, perguntar_registrado, interativo, tarefa, sugestao, recarregar, ciclo_inicial
+            )
+        finally:
+            if vigia is not None:
+                vigia.parar()
+            registrar_evento('sessao_fim', motivo=motivo)
+
+
+def _executar_ciclos(config, relogio, perguntar, interativo, tarefa, sugestao, recarregar=None, ciclo_inicial=1):
+    """
+    Executa os ciclos de uma sessão Pomodoro já configurada, a partir de
+    `ciclo_inicial`: o descanso longo vem depois do ciclo `ciclos`.
+    
+    Returns:
+        str: 'concluida', ou 'cancelada' se uma fase de trabalho foi interrompida
+    """
+    # Cópia própria: as recargas alteram as configurações só desta sessão
+    config = dict(config)
+    opcoes_timer = {'config': config, 'relogio': relogio, 'interativo': interativo, 'tarefa': tarefa}
+    fase = 0
+    
+    def aplicar_recarga():
+        """Aplica, na troca de fase, as configurações alteradas no arquivo."""
+        nonlocal fase
+        alteracoes = recarregar() if recarregar else None
+        if alteracoes:
+            alteracoes = {chave: valor for chave, valor in alteracoes.items() if config.get(chave) != valor}
+        if alteracoes:
+            registrar_evento('config_recarregada', fase=fase, alteracoes=alteracoes)
+            descricoes = ", ".join(
+                f"{ESQUEMA_CONFIGURACOES[chave]['rotulo']}: {formatar_valor(chave, valor)}"
+                for chave, valor in alteracoes.items()
+            )
+            _mostrar(interativo, f"[magenta]🔄 Configurações recarregadas ({descricoes})[/]")
+            config.update(alteracoes)
+        fase += 1
     
-    tempo_trabalho = config['tempo_trabalho']
-    descanso_curto = config['descanso_curto']
-    descanso_longo = config['descanso_longo']
     ciclos = config['ciclos']
-    auto_iniciar = config.get('auto_iniciar_descanso', False)
     
-    console.print()
+    _mostrar(interativo)
     panel = Panel(
         f"[bold]🍅 Sessão Pomodoro[/bold]\n\n"
         f"[cyan]• {ciclos} ciclos de trabalho[/]\n"
-        f"[cyan]• {tempo_trabalho} minutos de trabalho[/]\n"
-        f"[cyan]• {descanso_curto} minutos de descanso curto[/]\n"
-        f"[cyan]• {descanso_longo} minutos de descanso longo[/]\n"
-        f"[dim]• Pressione Ctrl+C para interromper[/]",
+        f"[cyan]• {config['tempo_trabalho']} minutos de trabalho[/]\n"
+        f"[cyan]• {config['descanso_curto']} minutos de descanso curto[/]\n"
+        f"[cyan]• {config['descanso_longo']} minutos de descanso longo[/]\n"
+        + (f"[cyan]• Tarefa: {tarefa}[/]\n" if tarefa else "")
+        + (f"[cyan]• Continuando do ciclo {ciclo_inicial}/{ciclos}[/]\n" if ciclo_inicial > 1 else "")
+        + sugestao
+        + f"[dim]• Pressione Ctrl+C para interromper[/]",
         border_style="red",
         box=box.ROUNDED,
         padding=(1, 2)
     )
-    console.print(panel)
-    console.print()
+    _mostrar(interativo, panel)
+    _mostrar(interativo)
     
-    for ciclo in range(1, ciclos + 1):
-        console.print(f"\n[bold red]═══ Ciclo {ciclo}/{ciclos} ═══[/bold red]\n")
+    for ciclo in range(ciclo_inicial, ciclos + 1):
+        _mostrar(interativo, f"\n[bold red]═══ Ciclo {ciclo}/{ciclos} ═══[/bold red]\n")
         
         # Fase de trabalho
+        aplicar_recarga()
+        tempo_trabalho = config['tempo_trabalho']
+        detalhes = {}
         completo = executar_timer(
             tempo_trabalho,
             f"🎯 Trabalho (Ciclo {ciclo}/{ciclos})",
             "red",
-            tipo_sessao='trabalho'
+            tipo_sessao='trabalho',
+            ciclo=ciclo,
+            ciclos=ciclos,
+            detalhes=detalhes,
+            **opcoes_timer
         )
         
         if not completo:
-            adicionar_sessao('trabalho', tempo_trabalho, completa=False)
-            return
+            registrar_sessao('trabalho', tempo_trabalho, completa=False, momento=relogio.agora(), tarefa=tarefa, **detalhes)
+            return 'cancelada'
         
-        adicionar_sessao('trabalho', tempo_trabalho, completa=True)
+        # O ciclo gravado permite continuar o conjunto na próxima execução
+        registrar_sessao(
+            'trabalho', tempo_trabalho, completa=True, momento=relogio.agora(), tarefa=tarefa, ciclo=ciclo, **detalhes
+        )
         
         # Descanso
         if ciclo < ciclos:
             # Descanso curto
-            console.print(f"\n[cyan]✅ Trabalho concluído! Hora do descanso curto.[/cyan]\n")
+            _mostrar(interativo, f"\n[cyan]✅ Trabalho concluído! Hora do descanso curto.[/cyan]\n")
             
-            if not auto_iniciar:
-                if not Confirm.ask("Iniciar descanso curto?", default=True):
+            aplicar_recarga()
+            if not config.get('auto_iniciar_descanso', False):
+                if not perguntar("Iniciar descanso curto?", True):
                     continue
             
+            descanso_curto = config['descanso_curto']
+            detalhes = {}
             completo_descanso = executar_timer(
                 descanso_curto,
                 f"☕ Descanso Curto (Ciclo {ciclo}/{ciclos})",
                 "cyan",
-                tipo_sessao='descanso_curto'
+                tipo_sessao='descanso_curto',
+                ciclo=ciclo,
+                ciclos=ciclos,
+                detalhes=detalhes,
+                **opcoes_timer
             )
             
-            adicionar_sessao('descanso_curto', descanso_curto, completa=completo_descanso)
+            registrar_sessao('descanso_curto', descanso_curto, completa=completo_descanso, momento=relogio.agora(), **detalhes)
             
             if completo_descanso:
-                console.print(f"\n[green]✅ Descanso concluído! Prepare-se para o próximo ciclo.[/green]\n")
-                time.sleep(2)
+                _mostrar(interativo, f"\n[green]✅ Descanso concluído! Prepare-se para o próximo ciclo.[/green]\n")
+                relogio.dormir(2)
         else:
             # Descanso longo
-            console.print(f"\n[green]🎉 Todos os ciclos concluídos! Hora do descanso longo.[/green]\n")
+            _mostrar(interativo, f"\n[green]🎉 Todos os ciclos concluídos! Hora do descanso longo.[/green]\n")
             
-            if not auto_iniciar:
-                if not Confirm.ask("Iniciar descanso longo?", default=True):
+            aplicar_recarga()
+            if not config.get('auto_iniciar_descanso', False):
+                if not perguntar("Iniciar descanso longo?", True):
                     break
             
+            descanso_longo = config['descanso_longo']
+            detalhes = {}
             completo_descanso = executar_timer(
                 descanso_longo,
                 "🌟 Descanso Longo",
                 "green",
-                tipo_sessao='descanso_longo'
+                tipo_sessao='descanso_longo',
+                ciclo=ciclo,
+                ciclos=ciclos,
+                detalhes=detalhes,
+                **opcoes_timer
             )
             
-            adicionar_sessao('descanso_longo', descanso_longo, completa=completo_descanso)
+            registrar_sessao('descanso_longo', descanso_longo, completa=completo_descanso, momento=relogio.agora(), **detalhes)
     
     # Notificação de Pomodoro completo
     if config.get('notificacoes_habilitadas', True):
         notificar_pomodoro_completo(ciclos)
     
-    console.print("\n[bold green]🎊 Sessão Pomodoro finalizada com sucesso![/bold green]\n")
-    time.sleep(3)
+    _mostrar(interativo, "\n[bold green]🎊 Sessão Pomodoro finalizada com sucesso![/bold green]\n")
+    relogio.dormir(3)
+    return 'concluida'
@@ -0,0 +1,190 @@
+"""
+Módulo de vigia das configurações - Recarga do config.json durante a sessão
+
+Uma thread em segundo plano espera o arquivo de configuração mudar (inotify
+no Linux; fora dele, ou se o inotify não estiver disponível, compara a data
+de modificação e o tamanho do arquivo a cada intervalo) e só então relê o
+JSON. O timer apenas consulta as alterações acumuladas nas trocas de fase,
+sem tocar no disco a cada tick.
+"""
+
+import json
+import os
+import select
+import struct
+import sys
+import threading
+from config import CONFIG_FILE, converter_valor
+
+
+# Configurações aplicadas na próxima troca de fase. O número de ciclos não
+# muda com a sessão em andamento.
+CHAVES_RECARREGAVEIS = (
+    'tempo_trabalho', 'descanso_curto', 'descanso_longo', 'auto_iniciar_descanso',
+    'notificacoes_habilitadas', 'som_habilitado', 'pausa_ociosidade_minutos'
+)
+
+# Intervalo do modo de comparação, e tempo máximo de espera do inotify
+# antes de conferir se a vigia foi parada (segundos)
+INTERVALO_VERIFICACAO = 1.0
+
+# Constantes do inotify (<sys/inotify.h>)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_FORMATO_EVENTO = 'iIII'
+_TAMANHO_EVENTO = struct.calcsize(_FORMATO_EVENTO)
+
+
+def _abrir_inotify(diretorio):
+    """
+    Cria uma instância do inotify observando o diretório do arquivo.
+
+    Retorna:
+    int | None: Descritor do inotify, ou None se indisponível.
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        descritor = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if descritor < 0:
+            return None
+        mascara = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(descritor, os.fsencode(diretorio), mascara) < 0:
+            os.close(descritor)
+            return None
+        return descritor
+    except (OSError, AttributeError):
+        return None
+
+
+def _nomes_alterados(dados):
+    """Nomes dos arquivos de uma leitura de eventos do inotify."""
+    nomes = set()
+    posicao = 0
+    while posicao + _TAMANHO_EVENTO <= len(dados):
+        _, _, _, tamanho = struct.unpack_from(_FORMATO_EVENTO, dados, posicao)
+        inicio = posicao + _TAMANHO_EVENTO
+        nomes.add(os.fsdecode(dados[inicio:inicio + tamanho].rstrip(b'\0')))
+        posicao = inicio + tamanho
+    return nomes
+
+
+class VigiaConfiguracoes:
+    """
+    Observa o arquivo de configuração e acumula as alterações das chaves
+    recarregáveis até serem consultadas.
+
+    Parâmetros:
+    config (dict): Configurações em uso, base para detectar alterações.
+    caminho (str): Arquivo observado.
+    intervalo (float): Intervalo do modo de comparação, em segundos.
+    """
+
+    def __init__(self, config, caminho=CONFIG_FILE, intervalo=INTERVALO_VERIFICACAO):
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.modo = None
+        self._vistas = self._ler_chaves() or {chave: config.get(chave) for chave in CHAVES_RECARREGAVEIS}
+        self._pendentes = {}
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        """Inicia a thread da vigia."""
+        diretorio = os.path.dirname(os.path.abspath(self.caminho))
+        descritor = _abrir_inotify(diretorio)
+        self.modo = 'inotify' if descritor is not None else 'comparacao'
+        self._thread = threading.Thread(target=self._executar, args=(descritor,), name='pomo-vigia-config', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        """Encerra a thread da vigia."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def obter_alteracoes(self):
+        """
+        Retorna as alterações acumuladas desde a última consulta.
+
+        Retorna:
+        dict | None: {chave: novo valor}, ou None se nada mudou.
+        """
+        with self._trava:
+            pendentes, self._pendentes = self._pendentes, {}
+        return pendentes or None
+
+    def _ler_chaves(self):
+        """
+        Lê as chaves recarregáveis do arquivo, ignorando as inválidas.
+
+        Retorna:
+        dict | None: Valores lidos, ou None se o arquivo está ilegível (por
+                     exemplo, no meio de uma gravação).
+        """
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                bruto = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(bruto, dict):
+            return None
+        lidas = {}
+        for chave in CHAVES_RECARREGAVEIS:
+            if chave in bruto:
+                try:
+                    lidas[chave] = converter_valor(chave, bruto[chave])
+                except ValueError:
+                    pass
+        return lidas
+
+    def _verificar(self):
+        """Relê o arquivo e acumula as chaves que mudaram."""
+        lidas = self._ler_chaves()
+        if lidas is None:
+            return
+        with self._trava:
+            for chave, valor in lidas.items():
+                if self._vistas.get(chave) != valor:
+                    self._vistas[chave] = valor
+                    self._pendentes[chave] = valor
+
+    def _executar(self, descritor):
+        """Laço da thread: espera o inotify ou compara o arquivo a cada intervalo."""
+        if descritor is not None:
+            nome = os.path.basename(self.caminho)
+            try:
+                while not self._parar.is_set():
+                    prontos, _, _ = select.select([descritor], [], [], self.intervalo)
+                    if prontos and nome in _nomes_alterados(os.read(descritor, 4096)):
+                        self._verificar()
+            except OSError:
+                pass
+            finally:
+                os.close(descritor)
+            if self._parar.is_set():
+                return
+            self.modo = 'comparacao'
+
+        assinatura = self._assinatura()
+        while not self._parar.wait(self.intervalo):
+            nova = self._assinatura()
+            if nova != assinatura:
+                assinatura = nova
+                self._verificar()
+
+    def _assinatura(self):
+        """Data de modificação e tamanho do arquivo."""
+        try:
+            info = os.stat(self.caminho)
+            return (info.st_mtime_ns, info.st_size)
+        except OSError:
+            return None